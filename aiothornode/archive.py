@@ -0,0 +1,168 @@
+import mmap
+import os
+import struct
+from typing import Dict, Tuple, Optional, List
+
+import ujson
+
+
+class ThorPoolArchive:
+    """
+    Local append-only store of historical pool states, indexed by (height, asset).
+    Asset names are case-insensitive, like in THORChain: "btc.btc" and "BTC.BTC" are the same pool.
+
+    The file is a sequence of records: header (height, payload length, asset length, flags),
+    asset name and the pool JSON. A snapshot of all pools at a height is written as a run of records
+    with the last one flagged SNAPSHOT_END; it becomes visible only after that, so a crash in the middle
+    of a write never yields an incomplete pool list. Reads go through a memory map of the file.
+    """
+
+    HEADER = struct.Struct('<qIHB')
+
+    FLAG_SNAPSHOT_PART = 0
+    FLAG_SNAPSHOT_END = 1
+    FLAG_SINGLE = 2
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self._file = open(file_name, 'a+b')
+        self._mm: Optional[mmap.mmap] = None
+        self._pools: Dict[int, Dict[str, Tuple[int, int]]] = {}  # height -> asset -> (offset, length)
+        self._snapshots: Dict[int, List[str]] = {}  # height -> assets of the complete snapshot
+        self._scan()
+
+    # ---- reading ----
+
+    def get_pools(self, height: int) -> Optional[list]:
+        """
+        Returns raw pool JSON list of the complete snapshot at the height or None if there is no such snapshot.
+        """
+        assets = self._snapshots.get(height)
+        if assets is None:
+            return None
+        records = self._pools[height]
+        return [self._read(*records[asset]) for asset in assets]
+
+    @staticmethod
+    def normalize_asset(asset: str) -> str:
+        return (asset or '').upper()
+
+    def get_pool(self, asset: str, height: int) -> Optional[dict]:
+        record = self._pools.get(height, {}).get(self.normalize_asset(asset))
+        return self._read(*record) if record else None
+
+    def has_snapshot(self, height: int):
+        return height in self._snapshots
+
+    @property
+    def heights(self) -> List[int]:
+        return sorted(self._snapshots)
+
+    # ---- writing ----
+
+    def put_pools(self, height: int, pools: list):
+        if not pools:
+            return
+        position = self._file_size()
+        chunks, records = [], []
+        last = len(pools) - 1
+        for i, pool in enumerate(pools):
+            asset = self.normalize_asset(pool.get('asset', ''))
+            flags = self.FLAG_SNAPSHOT_END if i == last else self.FLAG_SNAPSHOT_PART
+            chunk, payload_len = self._encode(height, asset, pool, flags)
+            position += len(chunk)
+            chunks.append(chunk)
+            records.append((asset, (position - payload_len, payload_len)))
+
+        self._append(b''.join(chunks))
+
+        self._pools.setdefault(height, {}).update(records)
+        self._snapshots[height] = [asset for asset, _ in records]
+
+    def put_pool(self, height: int, pool: dict, asset: Optional[str] = None):
+        """
+        asset: the name the pool was requested by, defaults to the one in the JSON.
+        """
+        asset = self.normalize_asset(asset or pool.get('asset', ''))
+        chunk, payload_len = self._encode(height, asset, pool, self.FLAG_SINGLE)
+        end = self._file_size() + len(chunk)
+        self._append(chunk)
+        self._pools.setdefault(height, {})[asset] = (end - payload_len, payload_len)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    # ---- internal ----
+
+    def _encode(self, height, asset: str, pool: dict, flags):
+        asset_bytes = asset.encode('utf-8')
+        payload = ujson.dumps(pool).encode('utf-8')
+        chunk = self.HEADER.pack(height, len(payload), len(asset_bytes), flags) + asset_bytes + payload
+        return chunk, len(payload)
+
+    def _file_size(self):
+        return os.fstat(self._file.fileno()).st_size
+
+    def _append(self, data: bytes):
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(data)
+        self._file.flush()
+
+    def _map(self, end):
+        if self._mm is None or len(self._mm) < end:
+            if self._mm is not None:
+                self._mm.close()
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm
+
+    def _read(self, offset, length):
+        mm = self._map(offset + length)
+        return ujson.loads(mm[offset:offset + length])
+
+    def _scan(self):
+        size = self._file_size()
+        if not size:
+            return
+
+        mm = self._map(size)
+        header_size = self.HEADER.size
+        pending: Dict[int, Dict[str, Tuple[int, int]]] = {}
+        pending_order: Dict[int, List[str]] = {}
+        pending_start: Dict[int, int] = {}
+        offset = 0
+        while offset + header_size <= size:
+            height, payload_len, asset_len, flags = self.HEADER.unpack_from(mm, offset)
+            end = offset + header_size + asset_len + payload_len
+            if end > size:
+                break  # torn write at the tail
+            asset = mm[offset + header_size:offset + header_size + asset_len].decode('utf-8')
+            record = (offset + header_size + asset_len, payload_len)
+
+            if flags == self.FLAG_SINGLE:
+                self._pools.setdefault(height, {})[asset] = record
+            else:
+                pending_start.setdefault(height, offset)
+                pending.setdefault(height, {})[asset] = record
+                pending_order.setdefault(height, []).append(asset)
+                if flags == self.FLAG_SNAPSHOT_END:
+                    self._pools.setdefault(height, {}).update(pending.pop(height))
+                    self._snapshots[height] = pending_order.pop(height)
+                    del pending_start[height]
+            offset = end
+
+        # unfinished snapshot is dropped as well
+        offset = min([offset, *pending_start.values()])
+        if offset < size:
+            # cut off the broken tail, so that new records are appended right after the last good one
+            self._mm.close()
+            self._mm = None
+            self._file.truncate(offset)
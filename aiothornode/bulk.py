@@ -0,0 +1,85 @@
+import asyncio
+from collections import deque
+from typing import Iterable, Callable, Awaitable, AsyncIterator, Tuple, Any, Optional
+
+from .ratelimit import ThorRateLimiter
+
+
+async def _cancel_all(tasks: Iterable[asyncio.Future]):
+    """
+    Cancels the tasks and waits for them, so that the errors of those that failed anyway
+    (before or while being cancelled) are retrieved and asyncio does not log "Task exception was never retrieved".
+    """
+    tasks = list(tasks)
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def bounded_as_completed(items: Iterable, fetch: Callable[[Any], Awaitable],
+                               concurrency=10,
+                               limiter: Optional[ThorRateLimiter] = None) -> AsyncIterator[Tuple[Any, Any]]:
+    """
+    Runs fetch(item) for every item with at most "concurrency" calls in flight
+    and yields (item, result) pairs as they complete.
+    New items are taken from the iterable only when there is a free slot, so it may be lazy and endless.
+    If the consumer stops iterating, the calls still in flight are cancelled.
+    """
+    assert concurrency >= 1
+
+    async def run(item):
+        if limiter:
+            await limiter.acquire()
+        return item, await fetch(item)
+
+    items = iter(items)
+    exhausted = False
+    pending, done = set(), set()
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    exhausted = True
+                else:
+                    pending.add(asyncio.ensure_future(run(item)))
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            while done:
+                yield done.pop().result()
+    finally:
+        await _cancel_all(pending | done)
+
+
+async def ordered_prefetch(items: Iterable, fetch: Callable[[Any], Awaitable],
+                           window=10) -> AsyncIterator[Tuple[Any, Any]]:
+    """
+    Like bounded_as_completed, but yields (item, result) strictly in the order of items.
+    Up to "window" items ahead of the consumer are being fetched concurrently;
+    nothing more is started until the consumer takes the head result (backpressure).
+    """
+    assert window >= 1
+
+    items = iter(items)
+    queue = deque()
+    try:
+        while True:
+            while len(queue) < window:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    break
+                queue.append((item, asyncio.ensure_future(fetch(item))))
+
+            if not queue:
+                break
+
+            item, task = queue.popleft()
+            yield item, await task
+    finally:
+        await _cancel_all(task for _, task in queue)
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import re
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import ujson
+
+HEIGHT_PINNED_RE = re.compile(r'[?&]height=(\d+)')
+
+
+def pinned_height(path: str) -> int:
+    """
+    Returns the block height the path is pinned to, or 0 if it asks for the latest state.
+    "?height=0" is treated by THORNode as "latest", so it is not pinned either.
+    """
+    m = HEIGHT_PINNED_RE.search(path)
+    return int(m.group(1)) if m else 0
+
+
+class ThorCache:
+    """
+    Response cache interface for ThorConnector.
+    Values are parsed JSON responses, ttl=None means "keep forever".
+    """
+
+    def get(self, key: str):
+        raise NotImplementedError
+
+    def set(self, key: str, value, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class ThorMemoryCache(ThorCache):
+    """
+    In-memory LRU cache bounded by the approximate size of the serialized responses.
+    Responses are kept serialized and decoded on every get(), so a caller that changes its result
+    does not change what the next caller gets.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        assert max_bytes > 0
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._items = OrderedDict()  # key -> (expires_at, size, serialized value)
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key: str):
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, size, value = item
+        if expires_at is not None and expires_at < time.monotonic():
+            self._remove(key)
+            return None
+        self._items.move_to_end(key)
+        return ujson.loads(value)
+
+    def set(self, key: str, value, ttl: Optional[float] = None):
+        value = ujson.dumps(value)
+        size = len(value)
+        if size > self.max_bytes:
+            return  # would evict everything else and still not fit
+
+        if key in self._items:
+            self._remove(key)
+
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._items[key] = (expires_at, size, value)
+        self.total_bytes += size
+
+        while self.total_bytes > self.max_bytes:
+            oldest_key = next(iter(self._items))
+            self._remove(oldest_key)
+
+    def clear(self):
+        self._items.clear()
+        self.total_bytes = 0
+
+    def _remove(self, key):
+        _, size, _ = self._items.pop(key)
+        self.total_bytes -= size
+
+
+class ThorDiskCache(ThorCache):
+    """
+    On-disk cache: one JSON file per response. Survives restarts, so backfill jobs
+    may re-read finalized heights without touching the network.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _file_name(self, key: str):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{digest}.json')
+
+    def get(self, key: str):
+        try:
+            with open(self._file_name(key), 'rb') as f:
+                item = ujson.loads(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+        expires_at = item.get('expires_at')
+        if expires_at is not None and expires_at < time.time():
+            self._unlink(key)
+            return None
+        return item.get('data')
+
+    def set(self, key: str, value, ttl: Optional[float] = None):
+        item = {
+            'key': key,
+            'expires_at': time.time() + ttl if ttl is not None else None,
+            'data': value,
+        }
+        # write to a temp file first, so readers never see a half-written response
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            f.write(ujson.dumps(item))
+        os.replace(tmp_name, self._file_name(key))
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                os.unlink(os.path.join(self.directory, name))
+
+    def _unlink(self, key):
+        try:
+            os.unlink(self._file_name(key))
+        except FileNotFoundError:
+            pass
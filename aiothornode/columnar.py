@@ -0,0 +1,160 @@
+"""
+Columnar (NumPy) snapshots of pools and node accounts. Requires numpy: pip install aiothornode[numpy]
+"""
+
+from typing import List, Tuple, Callable, Dict
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .types import ThorPool, ThorNodeAccount, POOL_CONVERTERS, NODE_ACCOUNT_CONVERTERS
+
+
+def _columns(converters: Dict[str, Callable[[dict], object]], dtypes: List[Tuple[str, str]]):
+    """
+    (name, dtype) => (name, dtype, converter): the values are converted exactly as the NamedTuple models do.
+    """
+    return [(name, dtype, converters[name]) for name, dtype in dtypes]
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError('numpy is required for columnar tables: pip install aiothornode[numpy]')
+
+
+class ThorTable:
+    """
+    Base class: every column is a NumPy array of the same length, one row per item.
+    COLUMNS: (name, dtype, converter of the item JSON to the column value)
+    """
+
+    COLUMNS: List[Tuple[str, str, Callable[[dict], object]]] = []
+
+    def __init__(self, **columns):
+        for name, *_ in self.COLUMNS:
+            setattr(self, name, columns[name])
+
+    @classmethod
+    def from_json(cls, j: list):
+        _require_numpy()
+        j = j or []
+        n = len(j)
+        columns = {}
+        for name, dtype, converter in cls.COLUMNS:
+            if dtype == 'object':
+                column = np.empty(n, dtype=object)
+                column[:] = [converter(item) for item in j]
+            else:
+                column = np.fromiter((converter(item) for item in j), dtype=dtype, count=n)
+            columns[name] = column
+        return cls(**columns)
+
+    def __len__(self):
+        return len(getattr(self, self.COLUMNS[0][0]))
+
+    def select(self, mask):
+        """
+        Returns a new table with the rows where mask is True (or with the given row indices).
+        """
+        return self.__class__(**{name: getattr(self, name)[mask] for name, *_ in self.COLUMNS})
+
+    def _status_mask(self, *statuses):
+        statuses = [s.lower() for s in statuses]
+        return np.isin(np.char.lower(self.status.astype(str)), statuses)
+
+    def filter_by_status(self, *statuses):
+        """
+        Case-insensitive.
+        """
+        return self.select(self._status_mask(*statuses))
+
+
+class PoolTable(ThorTable):
+    COLUMNS = _columns(POOL_CONVERTERS, [
+        ('asset', 'object'),
+        ('status', 'object'),
+        ('balance_asset', 'int64'),
+        ('balance_rune', 'int64'),
+        ('lp_units', 'int64'),
+        ('pool_units', 'int64'),
+        ('synth_units', 'int64'),
+        ('synth_supply', 'int64'),
+        ('savers_depth', 'int64'),
+        ('savers_units', 'int64'),
+        ('pending_inbound_rune', 'int64'),
+        ('pending_inbound_asset', 'int64'),
+        ('decimals', 'int64'),
+        ('synth_mint_paused', 'bool'),
+        ('error', 'object'),
+    ])
+
+    def _ratio(self, a, b):
+        # empty pools give nan instead of ZeroDivisionError
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(b != 0, a / np.where(b != 0, b, 1), np.nan)
+
+    @property
+    def runes_per_asset(self):
+        return self._ratio(self.balance_rune, self.balance_asset)
+
+    @property
+    def assets_per_rune(self):
+        return self._ratio(self.balance_asset, self.balance_rune)
+
+    def index_of(self, asset: str) -> int:
+        indices = np.flatnonzero(self.asset == asset)
+        if not len(indices):
+            raise KeyError(asset)
+        return int(indices[0])
+
+    def to_pools(self) -> List[ThorPool]:
+        return [
+            ThorPool(
+                balance_asset=int(self.balance_asset[i]),
+                balance_rune=int(self.balance_rune[i]),
+                asset=self.asset[i],
+                lp_units=int(self.lp_units[i]),
+                pool_units=int(self.pool_units[i]),
+                status=self.status[i],
+                synth_units=int(self.synth_units[i]),
+                decimals=int(self.decimals[i]),
+                pending_inbound_rune=int(self.pending_inbound_rune[i]),
+                pending_inbound_asset=int(self.pending_inbound_asset[i]),
+                savers_depth=int(self.savers_depth[i]),
+                savers_units=int(self.savers_units[i]),
+                synth_supply=int(self.synth_supply[i]),
+                synth_mint_paused=bool(self.synth_mint_paused[i]),
+                error=self.error[i],
+            ) for i in range(len(self))
+        ]
+
+
+class NodeTable(ThorTable):
+    COLUMNS = _columns(NODE_ACCOUNT_CONVERTERS, [
+        ('node_address', 'object'),
+        ('status', 'object'),
+        ('bond', 'int64'),
+        ('bond_address', 'object'),
+        ('active_block_height', 'int64'),
+        ('status_since', 'int64'),
+        ('slash_points', 'int64'),
+        ('current_award', 'int64'),
+        ('leave_height', 'int64'),
+        ('requested_to_leave', 'bool'),
+        ('forced_to_leave', 'bool'),
+        ('ip_address', 'object'),
+        ('version', 'object'),
+    ])
+
+    def total_bond(self, *statuses) -> int:
+        """
+        Sum of bonds of the nodes with the given statuses (all nodes if no statuses given).
+        """
+        bonds = self.bond[self._status_mask(*statuses)] if statuses else self.bond
+        return int(bonds.sum())
+
+    @property
+    def active(self):
+        return self.filter_by_status(ThorNodeAccount.STATUS_ACTIVE)
@@ -1,12 +1,24 @@
 import asyncio
 import logging
-from typing import Dict
+from typing import Dict, Optional, List, Iterable, Union
+from urllib.parse import quote
 
 from aiohttp import ClientSession, ClientError, ServerDisconnectedError
 
+from .archive import ThorPoolArchive
+from .bulk import bounded_as_completed, ordered_prefetch
+from .cache import ThorCache, pinned_height
+from .columnar import PoolTable, NodeTable
 from .env import ThorEnvironment
+from .events import ThorBlockResults
+from .lazy import LazyThorNodeAccount, LazyThorVault
+from .metrics import ThorObserver
 from .nodeclient import ThorNodeClient
+from .poolset import PoolSet
+from .ratelimit import ThorRateLimiter, PRIORITY_BACKGROUND, priority
+from .transport import ThorTransport
 from .types import *
+from .websocket import ThorWebSocketClient
 
 
 class ThorConnector:
@@ -19,28 +31,53 @@ class ThorConnector:
     async def query_raw(self, path, is_rpc=False):
         return await self._request(path, is_rpc=is_rpc)
 
-    async def query_node_accounts(self) -> List[ThorNodeAccount]:
+    async def query_node_accounts(self, lazy=False) -> List[ThorNodeAccount]:
+        """
+        lazy=True returns LazyThorNodeAccount objects, which convert their fields on first access.
+        """
         data = await self._request(self.env.path_nodes)
-        return [ThorNodeAccount.from_json(j) for j in data] if data else []
+        model = LazyThorNodeAccount if lazy else ThorNodeAccount
+        return [model.from_json(j) for j in data] if data else []
+
+    async def query_node_table(self) -> NodeTable:
+        """
+        Columnar (NumPy) variant of query_node_accounts. Requires numpy.
+        """
+        data = await self._request(self.env.path_nodes)
+        return NodeTable.from_json(data)
 
     async def query_queue(self) -> ThorQueue:
         data = await self._request(self.env.path_queue)
         return ThorQueue.from_json(data)
 
-    async def query_pools(self, height=None) -> List[ThorPool]:
+    async def query_pools(self, height=None, as_pool_set=False,
+                          stable_coins=PoolSet.DEFAULT_STABLE_COINS) -> Union[List[ThorPool], PoolSet]:
+        """
+        as_pool_set=True returns a PoolSet: pools indexed by asset and chain with prices (USD via stable_coins).
+        """
         if height:
             path = self.env.path_pools_height.format(height=height)
         else:
             path = self.env.path_pools
-        data = await self._request(path, treat_empty_as_ok=False)
+        data = await self._request_pools_archived(path, height)
+        if as_pool_set:
+            return PoolSet.from_json(data, stable_coins, height)
         return [ThorPool.from_json(j) for j in data]
 
+    async def query_pool_table(self, height=None) -> PoolTable:
+        """
+        Columnar (NumPy) variant of query_pools. Requires numpy.
+        """
+        path = self.env.path_pools_height.format(height=height) if height else self.env.path_pools
+        data = await self._request_pools_archived(path, height)
+        return PoolTable.from_json(data)
+
     async def query_pool(self, pool: str, height=None) -> ThorPool:
         if height:
             path = self.env.path_pool_height.format(pool=pool, height=height)
         else:
             path = self.env.path_pool.format(pool=pool)
-        data = await self._request(path)
+        data = await self._request_pools_archived(path, height, pool)
         return ThorPool.from_json(data)
 
     async def query_last_blocks(self) -> List[ThorLastBlock]:
@@ -74,10 +111,11 @@ class ThorConnector:
             info_list = [ThorChainInfo.from_json(j) for j in current]
         return {info.chain: info for info in info_list}
 
-    async def query_vault(self, vault_type=ThorVault.TYPE_ASGARD) -> List[ThorVault]:
+    async def query_vault(self, vault_type=ThorVault.TYPE_ASGARD, lazy=False) -> List[ThorVault]:
         path = self.env.path_vault_asgard if vault_type == ThorVault.TYPE_ASGARD else self.env.path_vault_yggdrasil
         data = await self._request(path)
-        return [ThorVault.from_json(v) for v in data]
+        model = LazyThorVault if lazy else ThorVault
+        return [model.from_json(v) for v in data]
 
     async def query_balance(self, address: str) -> ThorBalances:
         path = self.env.path_balance.format(address=address)
@@ -89,11 +127,11 @@ class ThorConnector:
         data = await self._request(path, is_rpc=True)
         return data
 
-    async def query_block(self, height) -> ThorBalances:
+    async def query_block(self, height, with_hashes=True) -> ThorBlock:
         data = await self.query_tendermint_block_raw(height)
-        return ThorBlock.from_json(data)
+        return ThorBlock.from_json(data, with_hashes=with_hashes)
 
-    async def query_native_tx(self, tx_hash: str, before_hard_fork=False):
+    async def query_native_tx(self, tx_hash: str, before_hard_fork=False, event_types=None):
         tx_hash = str(tx_hash)
         if not tx_hash.startswith('0x') and not tx_hash.startswith('0X'):
             tx_hash = f'0x{tx_hash}'
@@ -101,7 +139,44 @@ class ThorConnector:
         path_pattern = self.env.path_tx_by_hash_old if before_hard_fork else self.env.path_tx_by_hash
         path = path_pattern.format(hash=tx_hash)
         data = await self._request(path, is_rpc=True)
-        return ThorNativeTX.from_json(data)
+        return ThorNativeTX.from_json(data, event_types=event_types)
+
+    async def query_tx_search_raw(self, query: str, page=1, per_page=100, order_by='asc', prove=False):
+        """
+        query is a Tendermint event query, e.g. "message.sender='thor1...'"
+        """
+        path = self.env.path_tx_search.format(
+            query=quote(f'"{query}"', safe=''),
+            prove='true' if prove else 'false',
+            page=page,
+            per_page=per_page,
+            order_by=quote(f'"{order_by}"', safe=''),
+        )
+        return await self._request(path, is_rpc=True)
+
+    async def search_txs(self, query: str, per_page=100, order_by='asc', concurrency=5, event_types=None):
+        """
+        Yields ThorNativeTX matching the query in order. The first page tells the total count,
+        then the rest of the pages are fetched concurrently, at most "concurrency" at a time.
+        Raises ConnectionError if a page could not be loaded.
+        """
+
+        async def fetch(page):
+            data = await self.query_tx_search_raw(query, page, per_page, order_by)
+            if not data or 'result' not in data:
+                raise ConnectionError(f'Failed to load page #{page} of tx search "{query}"')
+            return data['result']
+
+        first_page = await fetch(1)
+        total_count = int(first_page.get('total_count', 0))
+        pages = (total_count + per_page - 1) // per_page
+
+        for tx in first_page.get('txs') or []:
+            yield ThorNativeTX.from_json(tx, event_types=event_types)
+
+        async for _, result in ordered_prefetch(range(2, pages + 1), fetch, window=concurrency):
+            for tx in result.get('txs') or []:
+                yield ThorNativeTX.from_json(tx, event_types=event_types)
 
     async def query_genesis(self):
         data = await self._request(self.env.path_genesis, is_rpc=True)
@@ -110,13 +185,27 @@ class ThorConnector:
     async def query_native_status_raw(self):
         return await self._request(self.env.path_status, is_rpc=True)
 
+    async def query_latest_block_height(self) -> int:
+        status = await self.query_native_status_raw()
+        return int(status['result']['sync_info']['latest_block_height']) if status else 0
+
     async def query_native_block_results_raw(self, height):
         url = self.env.path_block_results.format(height=height)
         return await self._request(url, is_rpc=True)
 
-    async def query_liquidity_providers(self, asset, height=0):
+    async def query_block_results(self, height, event_types=None) -> Optional[ThorBlockResults]:
+        """
+        Typed events of the block (txs and end_block). event_types limits parsing to the given types.
+        """
+        data = await self.query_native_block_results_raw(height)
+        return ThorBlockResults.from_json(data, event_types) if data else None
+
+    async def query_liquidity_providers_raw(self, asset, height=0):
         url = self.env.path_liq_providers.format(asset=asset, height=height)
-        data = await self._request(url)
+        return await self._request(url)
+
+    async def query_liquidity_providers(self, asset, height=0):
+        data = await self.query_liquidity_providers_raw(asset, height)
         if data:
             return [ThorLiquidityProvider.from_json(p) for p in data]
 
@@ -150,14 +239,131 @@ class ThorConnector:
         if data:
             return ThorNetwork.from_json(data)
 
+    def websocket(self, queries=(ThorWebSocketClient.QUERY_NEW_BLOCK, ThorWebSocketClient.QUERY_TX),
+                  **kwargs) -> ThorWebSocketClient:
+        """
+        Websocket subscription to new blocks and txs using the RPC urls of all the environments (failover).
+        """
+        return ThorWebSocketClient([client.env for client in self._clients], self.session,
+                                   logger=self.logger, queries=queries, **kwargs)
+
+    # ---- Bulk ----
+
+    def _make_limiter(self, rate_limit):
+        return ThorRateLimiter(rate_limit) if rate_limit else None
+
+    async def query_pools_at_heights(self, heights: Iterable[int], concurrency=10, rate_limit=0.0,
+                                     request_priority=PRIORITY_BACKGROUND):
+        """
+        Yields (height, List[ThorPool]) as they arrive. rate_limit is max requests per second, 0 = no limit.
+        request_priority: bulk fetches yield to interactive calls in the clients' rate limiters by default.
+        """
+
+        async def fetch(height):
+            with priority(request_priority):
+                return await self.query_pools(height)
+
+        async for height, pools in bounded_as_completed(heights, fetch, concurrency,
+                                                        self._make_limiter(rate_limit)):
+            yield height, pools
+
+    async def query_pool_many(self, pools: Iterable[str], heights: Iterable[int] = (None,),
+                              concurrency=10, rate_limit=0.0, request_priority=PRIORITY_BACKGROUND):
+        """
+        Yields ((pool, height), ThorPool) for every combination of pools and heights as they arrive.
+        """
+        heights = list(heights)
+        keys = ((pool, height) for pool in pools for height in heights)
+
+        async def fetch(key):
+            with priority(request_priority):
+                return await self.query_pool(*key)
+
+        async for key, pool in bounded_as_completed(keys, fetch, concurrency, self._make_limiter(rate_limit)):
+            yield key, pool
+
+    async def query_liquidity_provider_many(self, asset, addresses: Iterable[str], height=0,
+                                            concurrency=10, rate_limit=0.0, request_priority=PRIORITY_BACKGROUND):
+        """
+        Yields (address, ThorLiquidityProvider) as they arrive. The provider is None if it was not found.
+        """
+
+        async def fetch(address):
+            with priority(request_priority):
+                return await self.query_liquidity_provider(asset, address, height)
+
+        async for address, lp in bounded_as_completed(addresses, fetch, concurrency,
+                                                      self._make_limiter(rate_limit)):
+            yield address, lp
+
+    async def iter_blocks(self, start: int, end: Optional[int] = None, window=10, with_results=False,
+                          follow=False, poll_interval=5.0, with_hashes=True):
+        """
+        Yields ThorBlock (or (ThorBlock, raw block results) if with_results) for heights start..end inclusive,
+        in order, while prefetching up to "window" heights concurrently.
+        If end is None, it goes up to the current chain tip; with follow=True it keeps polling
+        the tip every poll_interval sec and never stops.
+        Raises ConnectionError if a block could not be loaded from any node.
+        """
+
+        async def fetch(height):
+            if with_results:
+                block, results = await asyncio.gather(self.query_tendermint_block_raw(height),
+                                                      self.query_native_block_results_raw(height))
+            else:
+                block, results = await self.query_tendermint_block_raw(height), None
+            if not block or (with_results and not results):
+                raise ConnectionError(f'Failed to load block #{height}')
+            block = ThorBlock.from_json(block, with_hashes=with_hashes)
+            return (block, results) if with_results else block
+
+        height = start
+        while True:
+            tip = end if end is not None else await self.query_latest_block_height()
+            if height <= tip:
+                async for _, item in ordered_prefetch(range(height, tip + 1), fetch, window):
+                    yield item
+                height = tip + 1
+
+            if end is not None or not follow:
+                break
+            await asyncio.sleep(poll_interval)
+
     # ---- Internal ----
 
     def __init__(self, env: ThorEnvironment, session: ClientSession, logger=None, extra_headers=None,
-                 additional_envs=None, silent=True):
+                 additional_envs=None, silent=True,
+                 cache: Optional[ThorCache] = None, cache_latest_ttl=0.0,
+                 coalesce_requests=True,
+                 hedge_percentile: Optional[float] = None, hedge_delay=1.0,
+                 smart_routing=False, json_loads=None,
+                 pool_archive: Optional[ThorPoolArchive] = None,
+                 transport: Optional[ThorTransport] = None):
         self.session = session
         self.env = env
         self.silent = silent
+
+        # responses for height-pinned paths are cached forever, "latest" ones only for cache_latest_ttl sec
+        self.cache = cache
+        self.cache_latest_ttl = cache_latest_ttl
+
+        # concurrent identical requests share one HTTP call: (client, path, is_rpc) -> Task
+        self.coalesce_requests = coalesce_requests
+        self._in_flight = {}
+
+        # if set, a slow client is raced against the next one after its hedge_percentile latency;
+        # hedge_delay is used until enough latency samples are collected
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+
+        # if set, clients with an open circuit are skipped and the rest are ordered by latency
+        self.smart_routing = smart_routing
+
         self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.json_loads = json_loads
+        self.pool_archive = pool_archive
+        self.transport = transport  # None = aiohttp with the session; see transport.py for record/replay
+        self.observers: List[ThorObserver] = []
         self._clients = [
             self._make_client(env, extra_headers)
         ]
@@ -171,41 +377,239 @@ class ThorConnector:
 
     def _make_client(self, env: ThorEnvironment, extra_headers):
         return ThorNodeClient(self.session, logger=self.logger, env=env,
-                              extra_headers=extra_headers)
+                              extra_headers=extra_headers, json_loads=self.json_loads, transport=self.transport)
 
     def set_client_id_for_all(self, client_id):
         for client in self._clients:
             client.set_client_id_header(client_id)
 
-    async def _request(self, path, is_rpc=False, treat_empty_as_ok=True):
+    def add_observer(self, observer: ThorObserver):
+        self.observers.append(observer)
         for client in self._clients:
-            for attempt in range(1, client.env.retries + 1):
-                if attempt > 1:
-                    self.logger.debug(f'Retry #{attempt} for path "{path}"')
-                try:
-                    data = await client.request(path, is_rpc=is_rpc)
-
-                    if treat_empty_as_ok:
-                        if data is not None:
-                            return data
+            client.observers.append(observer)
+        return self
+
+    def remove_observer(self, observer: ThorObserver):
+        for holder in [self, *self._clients]:
+            if observer in holder.observers:
+                holder.observers.remove(observer)
+
+    def _notify(self, hook, *args):
+        for observer in self.observers:
+            try:
+                getattr(observer, hook)(*args)
+            except Exception:
+                self.logger.exception(f'Observer {observer} failed')
+
+    def client_stats(self) -> Dict[str, dict]:
+        """
+        Health and latency stats, keyed by the base URL (THORNode and RPC separately).
+        """
+        return {
+            client.base_url(is_rpc): client.stats_of(is_rpc).as_dict()
+            for client in self._clients
+            for is_rpc in (False, True)
+        }
+
+    def rate_limiter_stats(self) -> Dict[str, dict]:
+        """
+        Queue wait times of the client-side rate limiters, keyed by the base URL.
+        """
+        return {
+            client.base_url(is_rpc): limiter.as_dict()
+            for client in self._clients
+            for is_rpc in (False, True)
+            if (limiter := client.limiter_of(is_rpc))
+        }
+
+    def _ordered_clients(self, is_rpc=False) -> List[ThorNodeClient]:
+        if not self.smart_routing:
+            return self._clients
+
+        healthy = [c for c in self._clients if c.stats_of(is_rpc).is_available]
+        if not healthy:
+            # everything is broken, so try all of them anyway
+            return self._clients
+
+        # clients without samples go first to get measured; sort is stable, so ties keep the constructor order
+        return sorted(healthy, key=lambda c: c.stats_of(is_rpc).ewma_latency or 0.0)
+
+    async def _request_pools_archived(self, path, height, pool=None):
+        """
+        Historical pool states are read from the local pool archive first and stored there on miss.
+        """
+        archive = self.pool_archive if height else None
+        if archive:
+            data = archive.get_pool(pool, height) if pool else archive.get_pools(height)
+            if data is not None:
+                return data
+
+        if pool:
+            data = await self._request(path)
+        else:
+            data = await self._request(path, treat_empty_as_ok=False)
+
+        # error bodies and other unexpected shapes are never archived
+        if archive:
+            if pool and isinstance(data, dict) and data:
+                archive.put_pool(height, data, pool)
+            elif not pool and isinstance(data, list) and data:
+                archive.put_pools(height, data)
+        return data
+
+    def _cache_policy(self, path):
+        """
+        Returns (cacheable, ttl) for the path. Data at a finalized height never changes.
+        """
+        if self.cache is None:
+            return False, None
+        if pinned_height(path):
+            return True, None
+        if self.cache_latest_ttl > 0:
+            return True, self.cache_latest_ttl
+        return False, None
+
+    async def _request(self, path, is_rpc=False, treat_empty_as_ok=True):
+        cacheable, ttl = self._cache_policy(path)
+        if cacheable:
+            # keyed by the primary node URL: connectors to different networks may share one cache
+            cache_key = f'{self.env.rpc_url if is_rpc else self.env.thornode_url}{path}'
+            data = self.cache.get(cache_key)
+            if self.observers:
+                self._notify('on_cache', path, data is not None)
+            if data is not None:
+                return data
+
+        data = await self._request_clients(path, is_rpc, treat_empty_as_ok)
+
+        if cacheable and data is not None:
+            self.cache.set(cache_key, data, ttl)
+        return data
+
+    async def _client_request(self, client: ThorNodeClient, path, is_rpc):
+        if not self.coalesce_requests:
+            return await client.request(path, is_rpc=is_rpc)
+
+        key = (client, path, is_rpc)
+        entry = self._in_flight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(client.request(path, is_rpc=is_rpc))
+            entry = self._in_flight[key] = [task, 0]  # [task, number of waiters]
+            task.add_done_callback(lambda t: self._on_in_flight_done(key, t))
+
+        task = entry[0]
+        entry[1] += 1
+        try:
+            # shield: one cancelled caller must not cancel the request for everybody else
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if not entry[1] and not task.done():
+                # nobody needs it anymore
+                task.cancel()
+                if self._in_flight.get(key) is entry:
+                    del self._in_flight[key]
+
+    def _on_in_flight_done(self, key, task: asyncio.Task):
+        entry = self._in_flight.get(key)
+        if entry and entry[0] is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # mark as retrieved, even if all the callers are gone
+
+    async def _request_clients(self, path, is_rpc, treat_empty_as_ok):
+        clients = self._ordered_clients(is_rpc)
+        if self.hedge_percentile is not None and len(clients) > 1:
+            return await self._request_hedged(clients, path, is_rpc, treat_empty_as_ok)
+
+        for i, client in enumerate(clients):
+            if i > 0 and self.observers:
+                self._notify('on_failover', clients[i - 1].base_url(is_rpc), client.base_url(is_rpc), path)
+            data = await self._request_one_client(client, path, is_rpc, treat_empty_as_ok)
+            if data is not None:
+                return data
+
+    def _hedge_delay(self, client: ThorNodeClient, is_rpc=False):
+        delay = client.stats_of(is_rpc).latency_percentile(self.hedge_percentile)
+        return self.hedge_delay if delay is None else delay
+
+    async def _request_hedged(self, clients, path, is_rpc, treat_empty_as_ok):
+        """
+        Starts with the primary client. If it has not answered within its percentile latency,
+        the same path is sent to the next client as well. The first valid answer wins.
+        """
+        waiting_clients = list(clients)
+        pending = set()
+        previous_client = None
+        try:
+            while waiting_clients or pending:
+                timeout = None
+                if waiting_clients:
+                    client = waiting_clients.pop(0)
+                    if previous_client and self.observers:
+                        self._notify('on_failover', previous_client.base_url(is_rpc), client.base_url(is_rpc), path)
+                    previous_client = client
+                    pending.add(asyncio.ensure_future(
+                        self._request_one_client(client, path, is_rpc, treat_empty_as_ok)
+                    ))
+                    if waiting_clients:
+                        timeout = self._hedge_delay(client, is_rpc)
+
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done and waiting_clients:
+                    self.logger.debug(f'Hedging "{path}" to {waiting_clients[0]} after {timeout:.3f} sec')
+
+                for task in done:
+                    data = task.result()  # raises if silent=False
+                    if data is not None:
+                        return data
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _request_one_client(self, client: ThorNodeClient, path, is_rpc, treat_empty_as_ok):
+        """
+        Queries one client with retries. Returns None if the next client should be tried.
+        """
+        policy = client.env.get_retry_policy()
+        policy.on_first_attempt()
+        attempt = 0
+        while True:
+            attempt += 1
+            if attempt > 1:
+                self.logger.debug(f'Retry #{attempt} for path "{path}"')
+                if self.observers:
+                    self._notify('on_retry', client.base_url(is_rpc), path, attempt)
+            error = None
+            try:
+                data = await self._client_request(client, path, is_rpc)
+
+                if treat_empty_as_ok:
+                    if data is not None:
+                        return data
+                else:
+                    if data:
+                        # only non-empty data is considered as valid
+                        return data
                     else:
-                        if data:
-                            # only non-empty data is considered as valid
-                            return data
-                        else:
-                            # if data is empty and treat_empty_as_ok==False, try next client
-                            break  # breaks the retry loop
-                except NotImplementedError:
-                    # Do no retries, no backups. Something is wrong with your code
+                        # if data is empty and treat_empty_as_ok==False, try next client
+                        return
+            except NotImplementedError:
+                # Do no retries, no backups. Something is wrong with your code
+                raise
+            except (FileNotFoundError, AttributeError,
+                    ConnectionError, asyncio.TimeoutError,
+                    ClientError, ServerDisconnectedError) as e:
+                if not self.silent:
                     raise
-                except (FileNotFoundError, AttributeError,
-                        ConnectionError, asyncio.TimeoutError,
-                        ClientError, ServerDisconnectedError) as e:
-                    if not self.silent:
-                        raise
-                    else:
-                        err_type = type(e).__name__
-                        self.logger.warning(f'#{attempt}. Failed to query {client} for "{path}" (err: {err_type}).')
-                if d := client.env.retry_delay:
-                    self.logger.debug(f'#{attempt}. Delay before retry: {d} sec...')
-                    await asyncio.sleep(d)
+                else:
+                    error = e
+                    err_type = type(e).__name__
+                    self.logger.warning(f'#{attempt}. Failed to query {client} for "{path}" (err: {err_type}).')
+
+            if not policy.should_retry(attempt, error):
+                # no sleep here: the next client is tried right away
+                return
+            if d := policy.delay(attempt, error):
+                self.logger.debug(f'#{attempt}. Delay before retry: {d:.2f} sec...')
+                await asyncio.sleep(d)
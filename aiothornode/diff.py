@@ -0,0 +1,124 @@
+"""
+Diffs of snapshots: mimir, constants, node accounts and pools. All of them are O(n) over the keyed items.
+"""
+
+import hashlib
+from typing import NamedTuple, Dict, Any, List, Callable, Iterable, Optional
+
+import ujson
+
+from .lazy import LazyThorModel
+from .types import ThorMimir, ThorConstants, ThorNodeAccount, ThorPool
+
+
+class ThorFieldChange(NamedTuple):
+    field: str
+    old: Any
+    new: Any
+
+
+class ThorSnapshotDiff(NamedTuple):
+    added: Dict[Any, Any]  # key -> new item
+    removed: Dict[Any, Any]  # key -> old item
+    changed: Dict[Any, List[ThorFieldChange]]  # key -> changed fields (for plain dicts: one change with field=key)
+
+    @property
+    def is_empty(self):
+        return not (self.added or self.removed or self.changed)
+
+    def __bool__(self):
+        return not self.is_empty
+
+
+def fingerprint(snapshot) -> str:
+    """
+    Stable hash of a snapshot to store or compare it later without keeping it in memory.
+    Takes the raw response bytes (the cheapest) or parsed objects: NamedTuples, lazy models, lists, dicts, ThorMimir...
+    """
+    if isinstance(snapshot, (ThorMimir, ThorConstants)):
+        snapshot = snapshot.constants
+    elif isinstance(snapshot, (list, tuple)) and not hasattr(snapshot, '_fields'):
+        snapshot = [item.raw if isinstance(item, LazyThorModel) else item for item in snapshot]
+    if not isinstance(snapshot, bytes):
+        snapshot = ujson.dumps(snapshot, sort_keys=True).encode('utf-8')
+    return hashlib.blake2b(snapshot, digest_size=16).hexdigest()
+
+
+def _item_fields(item) -> dict:
+    return item._asdict() if hasattr(item, '_asdict') else dict(item)
+
+
+def diff_fields(old, new) -> List[ThorFieldChange]:
+    old_fields, new_fields = _item_fields(old), _item_fields(new)
+    changes = []
+    for field in old_fields.keys() | new_fields.keys():
+        old_value, new_value = old_fields.get(field), new_fields.get(field)
+        if old_value != new_value:
+            changes.append(ThorFieldChange(field, old_value, new_value))
+    changes.sort(key=lambda c: c.field)
+    return changes
+
+
+def diff_dicts(old: dict, new: dict) -> ThorSnapshotDiff:
+    old, new = old or {}, new or {}
+    added = {k: v for k, v in new.items() if k not in old}
+    removed = {k: v for k, v in old.items() if k not in new}
+    changed = {
+        k: [ThorFieldChange(k, old_value, new[k])]
+        for k, old_value in old.items() if k in new and new[k] != old_value
+    }
+    return ThorSnapshotDiff(added, removed, changed)
+
+
+def diff_items(old: Iterable, new: Iterable, key: Callable[[Any], Any]) -> ThorSnapshotDiff:
+    """
+    Diff of two lists of items (NamedTuples or dicts) matched by key(item).
+    """
+    old_by_key = {key(item): item for item in old or []}
+    new_by_key = {key(item): item for item in new or []}
+    added = {k: v for k, v in new_by_key.items() if k not in old_by_key}
+    removed = {k: v for k, v in old_by_key.items() if k not in new_by_key}
+    changed = {}
+    for k, old_item in old_by_key.items():
+        new_item = new_by_key.get(k)
+        if new_item is not None and new_item != old_item:
+            changed[k] = diff_fields(old_item, new_item)
+    return ThorSnapshotDiff(added, removed, changed)
+
+
+def diff_mimir(old: ThorMimir, new: ThorMimir) -> ThorSnapshotDiff:
+    return diff_dicts(old.constants if old else {}, new.constants if new else {})
+
+
+def diff_constants(old: ThorConstants, new: ThorConstants) -> ThorSnapshotDiff:
+    return diff_dicts(old.constants if old else {}, new.constants if new else {})
+
+
+def diff_nodes(old: List[ThorNodeAccount], new: List[ThorNodeAccount]) -> ThorSnapshotDiff:
+    return diff_items(old, new, key=lambda n: n.node_address)
+
+
+def diff_pools(old: List[ThorPool], new: List[ThorPool]) -> ThorSnapshotDiff:
+    return diff_items(old, new, key=lambda p: p.asset)
+
+
+class ThorSnapshotDiffer:
+    """
+    Remembers the last snapshot.
+    update() returns None right away if the new snapshot equals the last one, otherwise the diff against it.
+
+        differ = ThorSnapshotDiffer(diff_nodes)
+        if d := differ.update(await connector.query_node_accounts()):
+            ...
+    """
+
+    def __init__(self, differ: Callable[[Any, Any], ThorSnapshotDiff]):
+        self.differ = differ
+        self.last = None
+
+    def update(self, snapshot) -> Optional[ThorSnapshotDiff]:
+        if self.last is not None and snapshot == self.last:
+            return None
+        old, self.last = self.last, snapshot
+        result = self.differ(old, snapshot)
+        return result if result else None
@@ -1,5 +1,8 @@
 from copy import copy
 from dataclasses import dataclass
+from typing import Optional
+
+from .retry import ThorRetryPolicy
 
 
 @dataclass
@@ -13,6 +16,13 @@ class ThorEnvironment:
 
     retries: int = 1
     retry_delay: float = 0.0
+    retry_policy: Optional[ThorRetryPolicy] = None  # if set, overrides retries and retry_delay
+
+    # client-side token bucket per node client, requests per second (0 = no limit); burst 0 = max(1, rate)
+    rate_limit: float = 0.0
+    rate_burst: int = 0
+    rpc_rate_limit: float = 0.0
+    rpc_rate_burst: int = 0
 
     path_queue: str = '/thorchain/queue'
     path_nodes: str = '/thorchain/nodes'
@@ -62,8 +72,26 @@ class ThorEnvironment:
         assert retries >= 1
         self.retries = retries
         self.retry_delay = delay
+        self.retry_policy = None
+        return self
+
+    def set_retry_policy(self, policy: ThorRetryPolicy):
+        self.retry_policy = policy
         return self
 
+    def set_rate_limit(self, rate=0.0, burst=0, rpc_rate=None, rpc_burst=None):
+        """
+        rpc_rate and rpc_burst default to the THORNode ones.
+        """
+        self.rate_limit = rate
+        self.rate_burst = burst
+        self.rpc_rate_limit = rate if rpc_rate is None else rpc_rate
+        self.rpc_rate_burst = burst if rpc_burst is None else rpc_burst
+        return self
+
+    def get_retry_policy(self) -> ThorRetryPolicy:
+        return self.retry_policy or ThorRetryPolicy.fixed(self.retries, self.retry_delay)
+
 
 class ThorURL:
     class THORNode:
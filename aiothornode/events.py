@@ -0,0 +1,256 @@
+"""
+Typed THORChain events from Tendermint block_results.
+"""
+
+from typing import NamedTuple, Iterable, Iterator, Optional, List, Dict, Type
+
+from .types import ThorCoin, decode_b64_str
+
+END_BLOCK = -1  # tx_index of the events emitted in end_block
+BEGIN_BLOCK = -2  # tx_index of the events emitted in begin_block
+
+
+def parse_coin(s: str) -> Optional[ThorCoin]:
+    """
+    "1000000 BTC.BTC" => ThorCoin('BTC.BTC', 1000000, 8)
+    """
+    if not s:
+        return None
+    amount, _, asset = s.partition(' ')
+    return ThorCoin(asset=asset, amount=int(amount), decimals=8)
+
+
+def parse_coins(s: str) -> List[ThorCoin]:
+    return [parse_coin(c.strip()) for c in s.split(',') if c.strip()] if s else []
+
+
+def _int(s):
+    return int(s) if s else 0
+
+
+class ThorEventGeneric(NamedTuple):
+    type: str
+    height: int
+    tx_index: int
+    attributes: dict
+
+    @classmethod
+    def from_attributes(cls, event_type, height, tx_index, a: dict):
+        return cls(event_type, height, tx_index, a)
+
+
+class ThorEventSwap(NamedTuple):
+    height: int
+    tx_index: int
+    pool: str
+    tx_id: str
+    chain: str
+    from_address: str
+    to_address: str
+    coin: ThorCoin
+    emit_asset: ThorCoin
+    swap_target: int
+    swap_slip: int
+    liquidity_fee: int
+    liquidity_fee_in_rune: int
+    memo: str
+
+    type = 'swap'
+
+    @classmethod
+    def from_attributes(cls, event_type, height, tx_index, a: dict):
+        return cls(
+            height=height,
+            tx_index=tx_index,
+            pool=a.get('pool', ''),
+            tx_id=a.get('id', ''),
+            chain=a.get('chain', ''),
+            from_address=a.get('from', ''),
+            to_address=a.get('to', ''),
+            coin=parse_coin(a.get('coin')),
+            emit_asset=parse_coin(a.get('emit_asset')),
+            swap_target=_int(a.get('swap_target')),
+            swap_slip=_int(a.get('swap_slip')),
+            liquidity_fee=_int(a.get('liquidity_fee')),
+            liquidity_fee_in_rune=_int(a.get('liquidity_fee_in_rune')),
+            memo=a.get('memo', ''),
+        )
+
+
+class ThorEventOutbound(NamedTuple):
+    height: int
+    tx_index: int
+    in_tx_id: str
+    tx_id: str
+    chain: str
+    from_address: str
+    to_address: str
+    coin: ThorCoin
+    memo: str
+
+    type = 'outbound'
+
+    @classmethod
+    def from_attributes(cls, event_type, height, tx_index, a: dict):
+        return cls(
+            height=height,
+            tx_index=tx_index,
+            in_tx_id=a.get('in_tx_id', ''),
+            tx_id=a.get('id', ''),
+            chain=a.get('chain', ''),
+            from_address=a.get('from', ''),
+            to_address=a.get('to', ''),
+            coin=parse_coin(a.get('coin')),
+            memo=a.get('memo', ''),
+        )
+
+
+class ThorEventAddLiquidity(NamedTuple):
+    height: int
+    tx_index: int
+    pool: str
+    liquidity_provider_units: int
+    rune_address: str
+    rune_amount: int
+    asset_amount: int
+    asset_address: str
+    rune_tx_id: str
+    asset_tx_id: str
+
+    type = 'add_liquidity'
+
+    @classmethod
+    def from_attributes(cls, event_type, height, tx_index, a: dict):
+        # tx ids come as "<CHAIN>_txid", e.g. "THOR_txid" and "BTC_txid"
+        rune_tx_id = a.get('THOR_txid', '')
+        asset_tx_id = next((v for k, v in a.items() if k.endswith('_txid') and k != 'THOR_txid'), '')
+        return cls(
+            height=height,
+            tx_index=tx_index,
+            pool=a.get('pool', ''),
+            liquidity_provider_units=_int(a.get('liquidity_provider_units')),
+            rune_address=a.get('rune_address', ''),
+            rune_amount=_int(a.get('rune_amount')),
+            asset_amount=_int(a.get('asset_amount')),
+            asset_address=a.get('asset_address', ''),
+            rune_tx_id=rune_tx_id,
+            asset_tx_id=asset_tx_id,
+        )
+
+
+class ThorEventWithdraw(NamedTuple):
+    height: int
+    tx_index: int
+    pool: str
+    tx_id: str
+    from_address: str
+    liquidity_provider_units: int
+    basis_points: int
+    asymmetry: str
+    emit_rune: int
+    emit_asset: int
+    imp_loss_protection: int
+    memo: str
+
+    type = 'withdraw'
+
+    @classmethod
+    def from_attributes(cls, event_type, height, tx_index, a: dict):
+        return cls(
+            height=height,
+            tx_index=tx_index,
+            pool=a.get('pool', ''),
+            tx_id=a.get('id', ''),
+            from_address=a.get('from', ''),
+            liquidity_provider_units=_int(a.get('liquidity_provider_units')),
+            basis_points=_int(a.get('basis_points')),
+            asymmetry=a.get('asymmetry', ''),
+            emit_rune=_int(a.get('emit_rune')),
+            emit_asset=_int(a.get('emit_asset')),
+            imp_loss_protection=_int(a.get('imp_loss_protection')),
+            memo=a.get('memo', ''),
+        )
+
+
+class ThorEventFee(NamedTuple):
+    height: int
+    tx_index: int
+    tx_id: str
+    coins: List[ThorCoin]
+    pool_deduct: int
+
+    type = 'fee'
+
+    @classmethod
+    def from_attributes(cls, event_type, height, tx_index, a: dict):
+        return cls(
+            height=height,
+            tx_index=tx_index,
+            tx_id=a.get('tx_id', ''),
+            coins=parse_coins(a.get('coins')),
+            pool_deduct=_int(a.get('pool_deduct')),
+        )
+
+
+EVENT_CLASSES: Dict[str, Type] = {
+    cls.type: cls for cls in (ThorEventSwap, ThorEventOutbound, ThorEventAddLiquidity, ThorEventWithdraw,
+                              ThorEventFee)
+}
+
+
+def _decode_attributes(raw_attributes):
+    return {decode_b64_str(a.get('key')): decode_b64_str(a.get('value')) for a in raw_attributes}
+
+
+def iter_block_events(j, event_types: Optional[Iterable[str]] = None,
+                      with_tx=True, with_begin_block=False, with_end_block=True) -> Iterator:
+    """
+    Walks a raw block_results response and yields typed events one by one in block order:
+    (begin_block), txs, end_block. Events whose type is not in event_types are skipped
+    before their attributes are even decoded. Unknown types become ThorEventGeneric.
+    """
+    result = j.get('result', j)
+    height = int(result['height'])
+    event_types = set(event_types) if event_types is not None else None
+
+    def convert(raw_events, tx_index):
+        for e in raw_events or ():
+            event_type = e['type']
+            if event_types is not None and event_type not in event_types:
+                continue
+            cls = EVENT_CLASSES.get(event_type, ThorEventGeneric)
+            yield cls.from_attributes(event_type, height, tx_index, _decode_attributes(e.get('attributes') or ()))
+
+    if with_begin_block:
+        yield from convert(result.get('begin_block_events'), BEGIN_BLOCK)
+
+    if with_tx:
+        for tx_index, tx_result in enumerate(result.get('txs_results') or ()):
+            yield from convert(tx_result.get('events'), tx_index)
+
+    if with_end_block:
+        yield from convert(result.get('end_block_events'), END_BLOCK)
+
+
+class ThorBlockResults(NamedTuple):
+    height: int
+    events: list
+
+    @classmethod
+    def from_json(cls, j, event_types: Optional[Iterable[str]] = None, with_begin_block=False):
+        result = j.get('result', j)
+        return cls(
+            height=int(result['height']),
+            events=list(iter_block_events(j, event_types, with_begin_block=with_begin_block)),
+        )
+
+    def of_type(self, event_type: str) -> list:
+        return [e for e in self.events if e.type == event_type]
+
+    @property
+    def swaps(self) -> List[ThorEventSwap]:
+        return self.of_type(ThorEventSwap.type)
+
+    @property
+    def outbounds(self) -> List[ThorEventOutbound]:
+        return self.of_type(ThorEventOutbound.type)
@@ -0,0 +1,117 @@
+import time
+from collections import deque
+from typing import Optional
+
+
+class ThorClientStats:
+    """
+    Rolling statistics and circuit breaker of a single ThorNodeClient.
+
+    The circuit opens after failure_threshold consecutive failures or when the error rate over the window
+    exceeds max_error_rate. While it is open the client is skipped; after cooldown sec it becomes "half-open"
+    and the next request is a probe: success closes the circuit, failure opens it again for a doubled cooldown.
+    """
+
+    MIN_SAMPLES = 10
+
+    STATE_CLOSED = 'closed'
+    STATE_OPEN = 'open'
+    STATE_HALF_OPEN = 'half-open'
+
+    def __init__(self, window=100, failure_threshold=3, max_error_rate=0.5, cooldown=10.0, max_cooldown=300.0,
+                 ewma_alpha=0.2):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)  # True = success
+        self.total_requests = 0
+        self.total_errors = 0
+        self.consecutive_failures = 0
+        self.last_failure_time = 0.0
+        self.last_error = ''
+        self.ewma_latency: Optional[float] = None
+        self.ewma_alpha = ewma_alpha
+
+        self.failure_threshold = failure_threshold
+        self.max_error_rate = max_error_rate
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.opened_at: Optional[float] = None
+
+    def record_success(self, latency: float):
+        self.total_requests += 1
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency += self.ewma_alpha * (latency - self.ewma_latency)
+
+        if self.opened_at is not None:
+            # the probe succeeded
+            self.opened_at = None
+            self.cooldown = self.base_cooldown
+
+    def record_failure(self, error: Exception = None):
+        now = time.monotonic()
+        self.total_requests += 1
+        self.total_errors += 1
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+        self.last_failure_time = now
+        self.last_error = type(error).__name__ if error else ''
+
+        if self.opened_at is not None:
+            if now - self.opened_at >= self.cooldown:
+                # the probe failed
+                self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                self.opened_at = now
+        elif self._should_open():
+            self.opened_at = now
+
+    def _should_open(self):
+        if self.consecutive_failures >= self.failure_threshold:
+            return True
+        return len(self.outcomes) >= self.MIN_SAMPLES and self.error_rate > self.max_error_rate
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return self.STATE_CLOSED
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return self.STATE_HALF_OPEN
+        return self.STATE_OPEN
+
+    @property
+    def is_available(self):
+        return self.state != self.STATE_OPEN
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """
+        Returns the latency percentile (0..100) over the window, or None if there are too few samples yet.
+        """
+        if len(self.latencies) < self.MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        index = round(percentile / 100.0 * (len(ordered) - 1))
+        return ordered[min(max(index, 0), len(ordered) - 1)]
+
+    def as_dict(self):
+        return {
+            'state': self.state,
+            'total_requests': self.total_requests,
+            'total_errors': self.total_errors,
+            'error_rate': self.error_rate,
+            'consecutive_failures': self.consecutive_failures,
+            'last_failure_time': self.last_failure_time,
+            'last_error': self.last_error,
+            'latency_ewma': self.ewma_latency,
+            'latency_p50': self.latency_percentile(50),
+            'latency_p95': self.latency_percentile(95),
+        }
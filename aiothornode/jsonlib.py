@@ -0,0 +1,24 @@
+"""
+JSON decoding of raw response bodies. orjson is used when installed (pip install aiothornode[orjson]),
+otherwise ujson. Both decode UTF-8 bytes directly, without an intermediate str copy.
+"""
+
+import ujson
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def ujson_loads(raw: bytes):
+    return ujson.loads(raw)
+
+
+def orjson_loads(raw: bytes):
+    if orjson is None:
+        raise ImportError('orjson is not installed')
+    return orjson.loads(raw)
+
+
+json_loads = orjson_loads if orjson is not None else ujson_loads
@@ -0,0 +1,80 @@
+from typing import Callable, Dict
+
+from .types import ThorNodeAccount, ThorVault, NODE_ACCOUNT_CONVERTERS, VAULT_CONVERTERS
+
+
+class LazyThorModel:
+    """
+    Wraps a raw JSON dict and converts a field only when it is accessed for the first time.
+    The converted value is then stored on the instance, so later access is a plain attribute lookup.
+    Has the same fields and properties as MODEL; materialize() returns the real MODEL object.
+    """
+
+    MODEL = None
+    CONVERTERS: Dict[str, Callable[[dict], object]] = {}
+
+    def __init__(self, j: dict):
+        self.raw = j
+
+    def __getattr__(self, name):
+        # only called if the attribute is not found the usual way, i.e. not converted yet
+        converter = self.CONVERTERS.get(name)
+        if converter is None:
+            raise AttributeError(f'{self.__class__.__name__!r} object has no attribute {name!r}')
+        value = converter(self.raw)
+        setattr(self, name, value)
+        return value
+
+    @classmethod
+    def from_json(cls, j):
+        return cls(j)
+
+    @classmethod
+    def from_json_array(cls, j):
+        return [cls(item) for item in j] if j else []
+
+    def materialize(self):
+        return self.MODEL.from_json(self.raw)
+
+    def _asdict(self):
+        return {name: getattr(self, name) for name in self.MODEL._fields}
+
+    def __eq__(self, other):
+        if isinstance(other, LazyThorModel):
+            if self.raw == other.raw:
+                return True
+            other = other.materialize()
+        return self.materialize() == other
+
+    def __repr__(self):
+        return f'Lazy{self.materialize()!r}'
+
+
+class LazyThorNodeAccount(LazyThorModel):
+    MODEL = ThorNodeAccount
+    CONVERTERS = NODE_ACCOUNT_CONVERTERS  # the same as ThorNodeAccount.from_json uses
+
+    STATUS_STANDBY = ThorNodeAccount.STATUS_STANDBY
+    STATUS_ACTIVE = ThorNodeAccount.STATUS_ACTIVE
+    STATUS_READY = ThorNodeAccount.STATUS_READY
+    STATUS_WHITELISTED = ThorNodeAccount.STATUS_WHITELISTED
+    STATUS_UNKNOWN = ThorNodeAccount.STATUS_UNKNOWN
+    STATUS_DISABLED = ThorNodeAccount.STATUS_DISABLED
+
+    preflight_status_reason_and_code = ThorNodeAccount.preflight_status_reason_and_code
+    is_good = ThorNodeAccount.is_good
+
+
+class LazyThorVault(LazyThorModel):
+    MODEL = ThorVault
+    CONVERTERS = VAULT_CONVERTERS
+
+    TYPE_YGGDRASIL = ThorVault.TYPE_YGGDRASIL
+    TYPE_ASGARD = ThorVault.TYPE_ASGARD
+
+    STATUS_ACTIVE = ThorVault.STATUS_ACTIVE
+    STATUS_ACTIVE_VAULT = ThorVault.STATUS_ACTIVE_VAULT
+    STATUS_STANDBY = ThorVault.STATUS_STANDBY
+    STATUS_RETIRING = ThorVault.STATUS_RETIRING
+
+    is_active = ThorVault.is_active
@@ -0,0 +1,206 @@
+"""
+Local index of liquidity providers by asset and address, refreshed incrementally.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import NamedTuple, Dict, List, Tuple, Optional, Iterable, Set
+
+from .connector import ThorConnector
+from .types import ThorLiquidityProvider, ThorPool
+
+
+def lp_key(j) -> str:
+    """
+    THORNode identifies an LP by its RUNE address, or by the asset address for asymmetric asset-only positions.
+    """
+    if isinstance(j, dict):
+        return j.get('rune_address') or j.get('asset_address') or ''
+    return j.rune_address or j.asset_address or ''
+
+
+def _raw_version(j: dict) -> tuple:
+    # raw strings, compared without parsing; units are also here, because they are just as cheap to check
+    return j.get('last_add_height'), j.get('last_withdraw_height'), j.get('units')
+
+
+class ThorLPDelta(NamedTuple):
+    asset: str
+    added: List[ThorLiquidityProvider]
+    updated: List[Tuple[ThorLiquidityProvider, ThorLiquidityProvider]]  # (old, new)
+    removed: List[ThorLiquidityProvider]
+
+    def __bool__(self):
+        return bool(self.added or self.updated or self.removed)
+
+
+class ThorLPAssetTotals:
+    def __init__(self):
+        self.providers = 0
+        self.units = 0
+        self.rune_deposit_value = 0
+        self.asset_deposit_value = 0
+
+    def apply(self, lp: ThorLiquidityProvider, sign: int):
+        self.providers += sign
+        self.units += sign * lp.units
+        self.rune_deposit_value += sign * lp.rune_deposit_value
+        self.asset_deposit_value += sign * lp.asset_deposit_value
+
+
+class ThorLPIndex:
+    """
+    The first refresh() of an asset loads all its LPs. The next ones still download the list (THORNode has no filter),
+    but parse only the entries whose last_add_height, last_withdraw_height or units have changed,
+    and return what has changed as ThorLPDelta. A failed fetch leaves the index as it was.
+
+        index = ThorLPIndex(connector, ['BTC.BTC', 'ETH.ETH'])
+        await index.refresh_all()
+        index.positions('thor1...')  # [ThorLiquidityProvider]
+    """
+
+    def __init__(self, connector: ThorConnector, assets: Iterable[str] = ()):
+        self.connector = connector
+        self.assets = list(assets)
+        self.providers: Dict[str, Dict[str, ThorLiquidityProvider]] = {}  # asset -> LP key -> LP
+        self.totals: Dict[str, ThorLPAssetTotals] = defaultdict(ThorLPAssetTotals)
+        self._versions: Dict[str, Dict[str, tuple]] = {}  # asset -> LP key -> raw version
+        # an address can be in several LPs of one asset (e.g. asset-only and symmetric with the same asset_address)
+        self._by_address: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)  # address -> {(asset, LP key)}
+
+    # ---- Updates ----
+
+    def _add(self, asset: str, key: str, lp: ThorLiquidityProvider):
+        self.providers[asset][key] = lp
+        for address in {lp.rune_address, lp.asset_address}:
+            if address:
+                self._by_address[address].add((asset, key))
+        self.totals[asset].apply(lp, +1)
+
+    def _remove(self, asset: str, key: str):
+        lp = self.providers[asset].pop(key)
+        for address in {lp.rune_address, lp.asset_address}:
+            refs = self._by_address.get(address)
+            if refs is not None:
+                refs.discard((asset, key))
+                if not refs:
+                    del self._by_address[address]
+        self.totals[asset].apply(lp, -1)
+
+    def update(self, asset: str, data: list) -> ThorLPDelta:
+        """
+        Applies a full list of raw LP JSON entries of the asset.
+        """
+        providers = self.providers.setdefault(asset, {})
+        versions = self._versions.setdefault(asset, {})
+        added, updated = [], []
+        seen = set()
+
+        for j in data:
+            key = lp_key(j)
+            seen.add(key)
+            version = _raw_version(j)
+            if versions.get(key) == version:
+                continue
+            versions[key] = version
+
+            new_lp = ThorLiquidityProvider.from_json(j)
+            old_lp = providers.get(key)
+            if old_lp == new_lp:
+                continue  # no known raw version (e.g. after refresh_address), but the same position
+            if old_lp is None:
+                added.append(new_lp)
+            else:
+                self._remove(asset, key)
+                updated.append((old_lp, new_lp))
+            self._add(asset, key, new_lp)
+
+        removed = []
+        for key in [key for key in providers if key not in seen]:
+            removed.append(providers[key])
+            self._remove(asset, key)
+            del versions[key]
+
+        return ThorLPDelta(asset, added, updated, removed)
+
+    async def refresh(self, asset: str, height=0) -> Optional[ThorLPDelta]:
+        """
+        Returns None if the list could not be loaded.
+        """
+        if asset not in self.assets:
+            self.assets.append(asset)
+        data = await self.connector.query_liquidity_providers_raw(asset, height)
+        if data is None:
+            return None
+        return self.update(asset, data)
+
+    async def refresh_all(self, height=0) -> List[Optional[ThorLPDelta]]:
+        return list(await asyncio.gather(*[self.refresh(asset, height) for asset in self.assets]))
+
+    async def refresh_address(self, asset: str, address: str, height=0) -> Optional[ThorLPDelta]:
+        """
+        Reloads one position with query_liquidity_provider. Returns None if it could not be loaded;
+        positions that are gone are removed by the next full refresh().
+        """
+        lp = await self.connector.query_liquidity_provider(asset, address, height)
+        if lp is None:
+            return None
+
+        providers = self.providers.setdefault(asset, {})
+        key = lp_key(lp)
+        old_lp = providers.get(key)
+        if old_lp == lp:
+            return ThorLPDelta(asset, [], [], [])
+        if old_lp is not None:
+            self._remove(asset, key)
+        self._add(asset, key, lp)
+        # unknown raw version: the next full refresh() re-parses this entry once
+        self._versions.setdefault(asset, {}).pop(key, None)
+        return ThorLPDelta(asset, [] if old_lp else [lp], [(old_lp, lp)] if old_lp else [], [])
+
+    # ---- Lookups ----
+
+    def get(self, asset: str, address: str) -> Optional[ThorLiquidityProvider]:
+        """
+        The LP keyed by the address if there is one, otherwise the LP that has it as the asset address.
+        """
+        refs = self._by_address.get(address)
+        if not refs:
+            return None
+        providers = self.providers.get(asset, {})
+        if (asset, address) in refs:
+            return providers[address]
+        keys = sorted(key for lp_asset, key in refs if lp_asset == asset)
+        return providers[keys[0]] if keys else None
+
+    def positions(self, address: str) -> List[ThorLiquidityProvider]:
+        """
+        All LP positions of the address (RUNE or asset address), sorted by asset.
+        """
+        return [self.providers[asset][key] for asset, key in sorted(self._by_address.get(address, ()))]
+
+    def __len__(self):
+        return sum(len(providers) for providers in self.providers.values())
+
+    def total_units(self, asset: str) -> int:
+        return self.totals[asset].units if asset in self.totals else 0
+
+    def deposit_values(self, address: str) -> Tuple[int, Dict[str, int]]:
+        """
+        (total RUNE deposit value, asset => asset deposit value) of the address.
+        """
+        rune_total, asset_values = 0, {}
+        for lp in self.positions(address):
+            rune_total += lp.rune_deposit_value
+            asset_values[lp.asset] = asset_values.get(lp.asset, 0) + lp.asset_deposit_value
+        return rune_total, asset_values
+
+    @staticmethod
+    def redeemable(lp: ThorLiquidityProvider, pool: ThorPool) -> Tuple[int, int]:
+        """
+        (RUNE, asset) the position is worth now: its share of the pool units times the pool depths.
+        """
+        if not pool.pool_units:
+            return 0, 0
+        return (lp.units * pool.balance_rune // pool.pool_units,
+                lp.units * pool.balance_asset // pool.pool_units)
@@ -0,0 +1,168 @@
+"""
+Request instrumentation: observer hooks and a built-in aggregator with latency histograms per endpoint.
+"""
+
+import bisect
+import re
+from collections import Counter, defaultdict
+from typing import NamedTuple, List, Tuple, Dict
+
+from .env import ThorEnvironment
+
+
+class ThorRequestRecord(NamedTuple):
+    client: str  # base url of the client
+    path: str
+    template: str  # e.g. "/thorchain/pool/{pool}?height={height}"
+    is_rpc: bool
+    status: int  # 0 if there was no response
+    latency: float  # sec, whole request
+    bytes: int
+    parse_time: float  # sec, JSON decoding
+    error: str  # exception type name or ''
+    queue_wait: float = 0.0  # sec, spent in the client-side rate limiter (not included in latency)
+
+
+class ThorObserver:
+    """
+    Base class for request observers. Override the hooks you need.
+    Register with ThorConnector.add_observer(observer).
+    """
+
+    def on_request(self, record: ThorRequestRecord):
+        pass
+
+    def on_retry(self, client: str, path: str, attempt: int):
+        pass
+
+    def on_failover(self, from_client: str, to_client: str, path: str):
+        pass
+
+    def on_cache(self, path: str, hit: bool):
+        pass
+
+
+class ThorPathTemplates:
+    """
+    Maps concrete paths back to the path templates of the environment,
+    so that metrics are grouped by endpoint, not by every distinct height or address.
+    """
+
+    def __init__(self, env: ThorEnvironment):
+        self.patterns: List[Tuple[re.Pattern, str]] = []
+        for name in dir(env):
+            template = getattr(env, name)
+            if name.startswith('path_') and isinstance(template, str):
+                regex = re.sub(r'\\{\w+\\}', '[^/?&]*', re.escape(template))
+                self.patterns.append((re.compile(regex), template))
+
+    def template_of(self, path: str) -> str:
+        for regex, template in self.patterns:
+            if regex.fullmatch(path):
+                return template
+        return path.split('?', 1)[0]
+
+
+class ThorHistogram:
+    BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last one is +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket containing the q-quantile (inf if it is above the last bucket).
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        acc = 0
+        for bound, n in zip(self.buckets + (float('inf'),), self.counts):
+            acc += n
+            if acc >= rank:
+                return bound
+        return float('inf')
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.counts)),
+        }
+
+
+class ThorEndpointMetrics:
+    def __init__(self):
+        self.latency = ThorHistogram()
+        self.parse_time = ThorHistogram()
+        self.queue_wait = ThorHistogram()
+        self.bytes = 0
+        self.errors = Counter()
+        self.statuses = Counter()
+        self.retries = 0
+        self.failovers = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def as_dict(self):
+        return {
+            'requests': self.latency.count,
+            'latency': self.latency.as_dict(),
+            'latency_p50': self.latency.quantile(0.5),
+            'latency_p99': self.latency.quantile(0.99),
+            'parse_time': self.parse_time.as_dict(),
+            'queue_wait': self.queue_wait.as_dict(),
+            'bytes': self.bytes,
+            'errors': dict(self.errors),
+            'statuses': dict(self.statuses),
+            'retries': self.retries,
+            'failovers': self.failovers,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
+
+
+class ThorMetricsAggregator(ThorObserver):
+    """
+    Collects everything per endpoint path template.
+    """
+
+    def __init__(self, env: ThorEnvironment = None):
+        self.templates = ThorPathTemplates(env or ThorEnvironment())
+        self.endpoints: Dict[str, ThorEndpointMetrics] = defaultdict(ThorEndpointMetrics)
+
+    def on_request(self, record: ThorRequestRecord):
+        m = self.endpoints[record.template]
+        m.latency.observe(record.latency)
+        m.queue_wait.observe(record.queue_wait)
+        if record.status and not record.error:
+            m.parse_time.observe(record.parse_time)
+        m.bytes += record.bytes
+        if record.status:
+            m.statuses[record.status] += 1
+        if record.error:
+            m.errors[record.error] += 1
+
+    def on_retry(self, client: str, path: str, attempt: int):
+        self.endpoints[self.templates.template_of(path)].retries += 1
+
+    def on_failover(self, from_client: str, to_client: str, path: str):
+        self.endpoints[self.templates.template_of(path)].failovers += 1
+
+    def on_cache(self, path: str, hit: bool):
+        m = self.endpoints[self.templates.template_of(path)]
+        if hit:
+            m.cache_hits += 1
+        else:
+            m.cache_misses += 1
+
+    def summary(self) -> Dict[str, dict]:
+        return {template: m.as_dict() for template, m in sorted(self.endpoints.items())}
@@ -1,33 +1,131 @@
 import logging
+import time
+from email.utils import parsedate_to_datetime
+from typing import List, Optional
 
-import ujson
 from aiohttp import ClientSession, ClientTimeout
 from aiohttp.helpers import sentinel
 
 from aiothornode.env import ThorEnvironment
+from aiothornode.health import ThorClientStats
+from aiothornode.jsonlib import json_loads as default_json_loads
+from aiothornode.metrics import ThorObserver, ThorPathTemplates, ThorRequestRecord
+from aiothornode.ratelimit import ThorRateLimiter
+from aiothornode.transport import ThorTransport, AiohttpTransport
+from aiothornode.types import ThorHTTPError
 
 
 class ThorNodeClient:
     HEADER_CLIENT_ID = 'x-client-id'
 
-    def __init__(self, session: ClientSession, env: ThorEnvironment, logger=None, extra_headers=None):
+    def __init__(self, session: ClientSession, env: ThorEnvironment, logger=None, extra_headers=None,
+                 json_loads=None, transport: Optional[ThorTransport] = None):
         self.session = session
+        self.transport = transport or AiohttpTransport(session)
         self.timeout = ClientTimeout(total=env.timeout) if env.timeout else sentinel
         self.logger = logger or logging.getLogger(self.__class__.__name__)
         self.extra_headers = extra_headers
         self.env = env
+        # THORNode and Tendermint RPC may be separate hosts, so each URL has its own health and latency
+        self.stats = ThorClientStats()
+        self.rpc_stats = self.stats if env.rpc_url == env.thornode_url else ThorClientStats()
+        self.json_loads = json_loads or default_json_loads  # bytes -> object
+        self.observers: List[ThorObserver] = []
+        self.templates = ThorPathTemplates(env)
+        self.limiter = self._make_limiter(env.rate_limit, env.rate_burst)
+        self.rpc_limiter = self._make_limiter(env.rpc_rate_limit, env.rpc_rate_burst)
+
+    @staticmethod
+    def _make_limiter(rate, burst) -> Optional[ThorRateLimiter]:
+        return ThorRateLimiter(rate, burst or None) if rate else None
+
+    def limiter_of(self, is_rpc) -> Optional[ThorRateLimiter]:
+        return self.rpc_limiter if is_rpc else self.limiter
+
+    def stats_of(self, is_rpc) -> ThorClientStats:
+        return self.rpc_stats if is_rpc else self.stats
 
     async def request(self, path, is_rpc=False):
         url = self.connection_url(path, is_rpc)
+        limiter = self.limiter_of(is_rpc)
+        stats = self.stats_of(is_rpc)
+        queue_wait = await limiter.acquire() if limiter else 0.0
         self.logger.debug(f'Node GET "{url}"')
-        async with self.session.get(url, timeout=self.timeout, headers=self.extra_headers) as resp:
+        started_at = time.monotonic()
+        status, size, parse_time, error = 0, 0, 0.0, ''
+        try:
+            resp = await self.transport.get(url, timeout=self.timeout, headers=self.extra_headers)
+            status = resp.status
             self.logger.debug(f'Node RESPONSE "{url}" code={resp.status}')
             if resp.status == 404:
                 raise FileNotFoundError(f'{url} not found, sorry!')
             elif resp.status == 501:
                 raise NotImplementedError(f'{url} not implemented, sorry!')
-            text = await resp.text()
-            return ujson.loads(text)
+            elif not 200 <= resp.status < 300:
+                # error bodies must never reach the caller (or the cache) as data
+                raise ThorHTTPError(resp.status, url, self.parse_retry_after(resp.headers.get('Retry-After')))
+            raw = resp.body
+            size = len(raw)
+            parse_started_at = time.monotonic()
+            data = self.json_loads(raw)
+            parse_time = time.monotonic() - parse_started_at
+        except (FileNotFoundError, NotImplementedError) as e:
+            # the node has answered, so it is alive
+            error = type(e).__name__
+            stats.record_success(time.monotonic() - started_at)
+            raise
+        except ThorHTTPError as e:
+            error = type(e).__name__
+            if e.is_client_error:
+                stats.record_success(time.monotonic() - started_at)
+            else:
+                stats.record_failure(e)
+            raise
+        except BaseException as e:
+            error = type(e).__name__
+            if isinstance(e, Exception):
+                stats.record_failure(e)
+            raise
+        else:
+            stats.record_success(time.monotonic() - started_at)
+        finally:
+            if self.observers:
+                self._notify(ThorRequestRecord(
+                    client=self.base_url(is_rpc),
+                    path=path,
+                    template=self.templates.template_of(path),
+                    is_rpc=is_rpc,
+                    status=status,
+                    latency=time.monotonic() - started_at,
+                    bytes=size,
+                    parse_time=parse_time,
+                    error=error,
+                    queue_wait=queue_wait,
+                ))
+        return data
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Retry-After is either a number of seconds or an HTTP date.
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def _notify(self, record: ThorRequestRecord):
+        for observer in self.observers:
+            try:
+                observer.on_request(record)
+            except Exception:
+                self.logger.exception(f'Observer {observer} failed')
 
     def set_client_id_header(self, client_id: str):
         if not isinstance(self.extra_headers, dict):
@@ -41,8 +139,8 @@ class ThorNodeClient:
     def __repr__(self) -> str:
         return f'ThorNodeClient({self.env.thornode_url!r})'
 
+    def base_url(self, is_rpc):
+        return self.env.rpc_url if is_rpc else self.env.thornode_url
+
     def connection_url(self, path, is_rpc):
-        if is_rpc:
-            return f'{self.env.rpc_url}{path}'
-        else:
-            return f'{self.env.thornode_url}{path}'
+        return f'{self.base_url(is_rpc)}{path}'
@@ -0,0 +1,114 @@
+"""
+A snapshot of all pools with an asset index and prices computed once per snapshot.
+"""
+
+from typing import List, Dict, Optional, Iterable, Iterator
+
+from .types import ThorPool
+
+NATIVE_RUNE = 'THOR.RUNE'
+
+
+def chain_of(asset: str) -> str:
+    """
+    "BTC.BTC" => "BTC", "ETH.USDC-0XA0B8..." => "ETH"
+    """
+    return asset.partition('.')[0]
+
+
+class PoolSet:
+    """
+    Pools by asset and by chain, RUNE prices (runes per 1 asset, assets per 1 rune) and USD prices.
+    The USD price of RUNE is derived from the stable coin pools: their summed asset depth over their summed RUNE depth.
+    Only available pools with both balances non-zero get prices.
+
+        pools = await connector.query_pools(as_pool_set=True)
+        pools.usd_per_rune, pools.usd_price('BTC.BTC'), pools.chain('ETH')
+    """
+
+    DEFAULT_STABLE_COINS = (
+        'ETH.USDC-0XA0B86991C6218B36C1D19D4A2E9EB0CE3606EB48',
+        'ETH.USDT-0XDAC17F958D2EE523A2206206994597C13D831EC7',
+        'AVAX.USDC-0XB97EF9EF8734C71904D8002F8B6BC66DD9C48A6E',
+        'BSC.USDT-0X55D398326F99059FF775485246999027B3197955',
+        'BSC.USDC-0X8AC76A51CC950D9822D68B83FE1AD97B32CD580D',
+        'BNB.BUSD-BD1',
+    )
+
+    def __init__(self, pools: Iterable[ThorPool], stable_coins: Iterable[str] = DEFAULT_STABLE_COINS, height=None):
+        self.height = height
+        self.pools: Dict[str, ThorPool] = {}
+        self.by_chain: Dict[str, List[ThorPool]] = {}
+        self.runes_per_asset: Dict[str, float] = {}
+        self.assets_per_rune: Dict[str, float] = {}
+
+        for pool in pools:
+            self.pools[pool.asset] = pool
+            self.by_chain.setdefault(chain_of(pool.asset), []).append(pool)
+            if pool.status == ThorPool.STATUS_AVAILABLE and pool.balance_asset and pool.balance_rune:
+                self.runes_per_asset[pool.asset] = pool.balance_rune / pool.balance_asset
+                self.assets_per_rune[pool.asset] = pool.balance_asset / pool.balance_rune
+
+        self.stable_coins = [asset for asset in stable_coins if asset in self.runes_per_asset]
+        stable_rune = sum(self.pools[asset].balance_rune for asset in self.stable_coins)
+        stable_usd = sum(self.pools[asset].balance_asset for asset in self.stable_coins)
+        # None if there is no usable stable coin pool
+        self.usd_per_rune: Optional[float] = stable_usd / stable_rune if stable_rune else None
+
+    @classmethod
+    def from_json(cls, j: list, stable_coins: Iterable[str] = DEFAULT_STABLE_COINS, height=None):
+        from_json = ThorPool.from_json
+        return cls([from_json(p) for p in j or []], stable_coins, height)
+
+    def __len__(self):
+        return len(self.pools)
+
+    def __iter__(self) -> Iterator[ThorPool]:
+        return iter(self.pools.values())
+
+    def __contains__(self, asset):
+        return asset in self.pools
+
+    def __getitem__(self, asset) -> ThorPool:
+        return self.pools[asset]
+
+    def get(self, asset, default=None) -> Optional[ThorPool]:
+        return self.pools.get(asset, default)
+
+    def chain(self, chain: str) -> List[ThorPool]:
+        return self.by_chain.get(chain, [])
+
+    @property
+    def assets(self) -> List[str]:
+        return list(self.pools)
+
+    @property
+    def chains(self) -> List[str]:
+        return list(self.by_chain)
+
+    def rune_price(self, asset) -> Optional[float]:
+        """
+        How many RUNE 1 unit of the asset is worth. None if the pool is unknown or not priced.
+        """
+        if asset == NATIVE_RUNE:
+            return 1.0
+        return self.runes_per_asset.get(asset)
+
+    def usd_price(self, asset) -> Optional[float]:
+        if self.usd_per_rune is None:
+            return None
+        runes = self.rune_price(asset)
+        return runes * self.usd_per_rune if runes is not None else None
+
+    @property
+    def usd_prices(self) -> Dict[str, float]:
+        """
+        Asset => USD price for all priced pools.
+        """
+        if self.usd_per_rune is None:
+            return {}
+        usd_per_rune = self.usd_per_rune
+        return {asset: runes * usd_per_rune for asset, runes in self.runes_per_asset.items()}
+
+    def total_rune_depth(self) -> int:
+        return sum(pool.balance_rune for pool in self.pools.values() if pool.status == ThorPool.STATUS_AVAILABLE)
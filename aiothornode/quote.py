@@ -0,0 +1,215 @@
+"""
+Local swap quotes with THORChain's CLP (slip-based fee) math over a pool snapshot, no node round trips.
+For a swap of x into a pool with depths X (input side) and Y (output side):
+    output = x * X * Y / (x + X) ** 2
+    liquidity fee = x ** 2 * Y / (x + X) ** 2  (in the output units)
+    slip = x / (x + X)
+Asset to asset swaps go through RUNE (double swap). The outbound fee of the target chain is deducted from the output.
+Streaming swaps, the min liquidity fee and synths are not modeled. All amounts are in 1e8 units, like in THORNode.
+"""
+
+import asyncio
+from typing import NamedTuple, Dict, Iterable, Optional, Tuple, List, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from .poolset import PoolSet, NATIVE_RUNE, chain_of
+from .types import ThorPool, ThorChainInfo
+
+GAS_ASSETS = {
+    'BTC': 'BTC.BTC',
+    'ETH': 'ETH.ETH',
+    'BSC': 'BSC.BNB',
+    'BNB': 'BNB.BNB',
+    'AVAX': 'AVAX.AVAX',
+    'GAIA': 'GAIA.ATOM',
+    'BASE': 'BASE.ETH',
+    'LTC': 'LTC.LTC',
+    'BCH': 'BCH.BCH',
+    'DOGE': 'DOGE.DOGE',
+}
+
+DEFAULT_NATIVE_OUTBOUND_FEE = 2_000_000  # 0.02 RUNE
+
+
+def gas_asset_of(chain: str) -> str:
+    return GAS_ASSETS.get(chain, f'{chain}.{chain}')
+
+
+def swap_output(x: int, x_depth: int, y_depth: int) -> Tuple[int, int, int]:
+    """
+    Single swap: (output, liquidity fee in output units, slip in basis points), truncated like THORNode does.
+    """
+    denominator = (x + x_depth) ** 2
+    return (x * x_depth * y_depth // denominator,
+            x * x * y_depth // denominator,
+            x * 10000 // (x + x_depth))
+
+
+class ThorSwapQuote(NamedTuple):
+    from_asset: str
+    to_asset: str
+    amount: int  # input
+    emit_amount: int  # output before the outbound fee
+    expected_amount_out: int  # output after the outbound fee
+    liquidity_fee_in_rune: int
+    outbound_fee: int  # in the units of to_asset
+    slip_bps: int  # sum of the slips of both swaps
+    swaps: int  # 1 or 2
+
+    @property
+    def is_possible(self):
+        return self.expected_amount_out > 0
+
+
+class ThorQuoteEngine:
+    """
+    Quotes swaps against a pool snapshot and the outbound fees from query_chain_info.
+
+        engine = await ThorQuoteEngine.from_connector(connector)
+        quote = engine.quote('BTC.BTC', 'ETH.ETH', 1_0000_0000)
+        batch = engine.quote_batch('BTC.BTC', 'ETH.ETH', amounts)  # NumPy arrays
+    """
+
+    def __init__(self, pools: Union[PoolSet, Iterable[ThorPool]], chain_info: Optional[Dict[str, ThorChainInfo]] = None,
+                 native_outbound_fee=DEFAULT_NATIVE_OUTBOUND_FEE):
+        self.pools = pools if isinstance(pools, PoolSet) else PoolSet(pools)
+        self.chain_info = chain_info or {}
+        self.native_outbound_fee = native_outbound_fee
+        self.outbound_fees: Dict[str, int] = {
+            asset: self._outbound_fee_of(asset) for asset in self.pools.runes_per_asset
+        }
+        self.outbound_fees[NATIVE_RUNE] = native_outbound_fee
+        self._arrays = None
+
+    @classmethod
+    async def from_connector(cls, connector, height=None, stable_coins=PoolSet.DEFAULT_STABLE_COINS, **kwargs):
+        pools, chain_info = await asyncio.gather(
+            connector.query_pools(height, as_pool_set=True, stable_coins=stable_coins),
+            connector.query_chain_info(),
+        )
+        return cls(pools, chain_info, **kwargs)
+
+    def _outbound_fee_of(self, asset) -> int:
+        """
+        The chain's outbound fee is set in its gas asset, so it is converted to the asset via RUNE prices.
+        """
+        info = self.chain_info.get(chain_of(asset))
+        if not info or not info.outbound_fee:
+            return 0
+        gas_asset = gas_asset_of(info.chain)
+        if asset == gas_asset:
+            return info.outbound_fee
+        runes_per_gas = self.pools.rune_price(gas_asset)
+        if runes_per_gas is None:
+            return 0
+        return int(info.outbound_fee * runes_per_gas / self.pools.runes_per_asset[asset])
+
+    def _pool(self, asset) -> ThorPool:
+        if asset not in self.pools.runes_per_asset:
+            raise ValueError(f'No available pool for {asset}')
+        return self.pools[asset]
+
+    def quote(self, from_asset: str, to_asset: str, amount: int) -> ThorSwapQuote:
+        if from_asset == to_asset:
+            raise ValueError('Source and target assets are the same')
+
+        rune_amount, fee_in_rune, slip, swaps = amount, 0, 0, 0
+        if from_asset != NATIVE_RUNE:
+            pool = self._pool(from_asset)
+            rune_amount, fee_in_rune, slip = swap_output(amount, pool.balance_asset, pool.balance_rune)
+            swaps += 1
+
+        emit = rune_amount
+        if to_asset != NATIVE_RUNE:
+            pool = self._pool(to_asset)
+            emit, _, slip2 = swap_output(rune_amount, pool.balance_rune, pool.balance_asset)
+            fee_in_rune += rune_amount * rune_amount * pool.balance_rune // (rune_amount + pool.balance_rune) ** 2
+            slip += slip2
+            swaps += 1
+
+        outbound_fee = self.outbound_fees.get(to_asset, 0)
+        return ThorSwapQuote(
+            from_asset=from_asset,
+            to_asset=to_asset,
+            amount=amount,
+            emit_amount=emit,
+            expected_amount_out=max(0, emit - outbound_fee),
+            liquidity_fee_in_rune=fee_in_rune,
+            outbound_fee=outbound_fee,
+            slip_bps=slip,
+            swaps=swaps,
+        )
+
+    def quote_many(self, requests: Iterable[Tuple[str, str, int]]) -> List[ThorSwapQuote]:
+        """
+        requests: (from_asset, to_asset, amount)
+        """
+        quote = self.quote
+        return [quote(*r) for r in requests]
+
+    # ---- NumPy ----
+
+    def _build_arrays(self):
+        if np is None:
+            raise ImportError('numpy is required for batch quotes: pip install aiothornode[numpy]')
+        if self._arrays is None:
+            assets = list(self.pools.runes_per_asset)
+            # the last row stands for RUNE: depths of 1 keep the masked out math finite
+            index = {asset: i for i, asset in enumerate(assets)}
+            index[NATIVE_RUNE] = len(assets)
+            asset_depth = np.array([self.pools[a].balance_asset for a in assets] + [1], dtype=np.float64)
+            rune_depth = np.array([self.pools[a].balance_rune for a in assets] + [1], dtype=np.float64)
+            outbound_fee = np.array([self.outbound_fees[a] for a in assets] + [self.native_outbound_fee],
+                                    dtype=np.float64)
+            self._arrays = index, asset_depth, rune_depth, outbound_fee
+        return self._arrays
+
+    def _indices(self, assets, n, index):
+        if isinstance(assets, str):
+            assets = [assets] * n
+        try:
+            return np.fromiter((index[a] for a in assets), dtype=np.int64, count=n)
+        except KeyError as e:
+            raise ValueError(f'No available pool for {e.args[0]}')
+
+    def quote_batch(self, from_assets, to_assets, amounts) -> Dict[str, 'np.ndarray']:
+        """
+        Vectorized quote(): from_assets and to_assets are asset names or sequences of them, one per amount.
+        Returns float64 arrays (not truncated): emit_amount, expected_amount_out, liquidity_fee_in_rune,
+        outbound_fee, slip_bps.
+        """
+        index, asset_depth, rune_depth, outbound_fees = self._build_arrays()
+        amounts = np.asarray(amounts, dtype=np.float64)
+        n = len(amounts)
+        rune_index = index[NATIVE_RUNE]
+        src = self._indices(from_assets, n, index)
+        dst = self._indices(to_assets, n, index)
+
+        # the first swap: asset -> RUNE
+        from_rune = src == rune_index
+        x_depth, y_depth = asset_depth[src], rune_depth[src]
+        denominator = (amounts + x_depth) ** 2
+        rune_amount = np.where(from_rune, amounts, amounts * x_depth * y_depth / denominator)
+        fee_in_rune = np.where(from_rune, 0.0, amounts * amounts * y_depth / denominator)
+        slip = np.where(from_rune, 0.0, amounts * 10000.0 / (amounts + x_depth))
+
+        # the second swap: RUNE -> asset
+        to_rune = dst == rune_index
+        x_depth, y_depth = rune_depth[dst], asset_depth[dst]
+        denominator = (rune_amount + x_depth) ** 2
+        emit = np.where(to_rune, rune_amount, rune_amount * x_depth * y_depth / denominator)
+        fee_in_rune += np.where(to_rune, 0.0, rune_amount * rune_amount * x_depth / denominator)
+        slip += np.where(to_rune, 0.0, rune_amount * 10000.0 / (rune_amount + x_depth))
+
+        outbound_fee = outbound_fees[dst]
+        return {
+            'emit_amount': emit,
+            'expected_amount_out': np.maximum(emit - outbound_fee, 0.0),
+            'liquidity_fee_in_rune': fee_in_rune,
+            'outbound_fee': outbound_fee,
+            'slip_bps': slip,
+        }
@@ -0,0 +1,115 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, List
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+# lower value goes first; tasks inherit it from the code that created them
+request_priority: ContextVar[int] = ContextVar('thor_request_priority', default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def priority(level: int):
+    """
+    All requests made inside the block (and by the tasks created there) wait in rate limiters with this priority:
+        with priority(PRIORITY_BACKGROUND):
+            await connector.query_pools(height)
+    """
+    token = request_priority.set(level)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+def background_priority():
+    return priority(PRIORITY_BACKGROUND)
+
+
+class ThorRateLimiter:
+    """
+    Token bucket: allows "rate" requests per second on average with bursts up to "burst" requests.
+    Waiters are served by priority (see request_priority), FIFO within the same priority.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        assert rate > 0.0
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._waiters: List[list] = []  # heap of [priority, seq, asyncio.Event]
+        self._seq = itertools.count()
+
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def _wake_head(self):
+        if self._waiters:
+            self._waiters[0][2].set()
+
+    def _record(self, wait):
+        self.acquired += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def average_wait(self) -> float:
+        return self.total_wait / self.acquired if self.acquired else 0.0
+
+    def as_dict(self):
+        return {
+            'rate': self.rate,
+            'burst': self.capacity,
+            'waiting': self.waiting,
+            'acquired': self.acquired,
+            'average_wait': self.average_wait,
+            'max_wait': self.max_wait,
+        }
+
+    async def acquire(self, priority: Optional[int] = None) -> float:
+        """
+        Waits for a token. Returns the time spent in the queue (sec).
+        """
+        self._refill()
+        if not self._waiters and self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return self._record(0.0)
+
+        started_at = time.monotonic()
+        entry = [request_priority.get() if priority is None else priority, next(self._seq), asyncio.Event()]
+        heapq.heappush(self._waiters, entry)
+        try:
+            while True:
+                if self._waiters[0] is entry:
+                    self._refill()
+                    if self.tokens >= 1.0:
+                        self.tokens -= 1.0
+                        heapq.heappop(self._waiters)
+                        return self._record(time.monotonic() - started_at)
+                    await asyncio.sleep((1.0 - self.tokens) / self.rate)
+                else:
+                    entry[2].clear()
+                    await entry[2].wait()
+        finally:
+            if entry in self._waiters:
+                # cancelled
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            self._wake_head()
@@ -0,0 +1,116 @@
+import asyncio
+import random
+import time
+from typing import Optional, Tuple
+
+from .types import ThorHTTPError
+
+
+class ThorRetryBudget:
+    """
+    Limits retries to a fraction of the requests: every first attempt deposits "ratio" tokens,
+    every retry takes one token. min_per_sec tokens are added each second, so that a quiet
+    client can still retry. Share one budget between workers to keep a node outage from causing a retry storm.
+    """
+
+    def __init__(self, ratio=0.2, min_per_sec=1.0, max_tokens=100.0):
+        self.ratio = ratio
+        self.min_per_sec = min_per_sec
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.updated_at = time.monotonic()
+        self.denied = 0
+
+    def _refill(self, amount=0.0):
+        now = time.monotonic()
+        self.tokens = min(self.max_tokens, self.tokens + amount + (now - self.updated_at) * self.min_per_sec)
+        self.updated_at = now
+
+    def deposit(self):
+        self._refill(self.ratio)
+
+    def try_spend(self) -> bool:
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        self.denied += 1
+        return False
+
+
+class ThorRetryPolicy:
+    """
+    Exponential backoff with jitter:
+        delay = min(base_delay * multiplier ** (attempt - 1), max_delay) * throttle_multiplier (for 429/503)
+    then reduced by a random fraction of up to "jitter" (0..1). A Retry-After header, if present,
+    makes the delay at least that long (capped by max_retry_after).
+    max_attempts counts the first attempt too. Errors are retried according to the retry_on_* flags.
+    """
+
+    THROTTLE_STATUSES = (429, 503)
+
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=30.0, multiplier=2.0, jitter=0.5,
+                 retry_on_timeout=True, retry_on_connection_error=True, retry_on_not_found=False,
+                 retry_statuses: Tuple[int, ...] = (429, 502, 503, 504),
+                 throttle_multiplier=2.0, respect_retry_after=True, max_retry_after=60.0,
+                 budget: Optional[ThorRetryBudget] = None):
+        assert max_attempts >= 1
+        assert 0.0 <= jitter <= 1.0
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.retry_on_timeout = retry_on_timeout
+        self.retry_on_connection_error = retry_on_connection_error
+        self.retry_on_not_found = retry_on_not_found
+        self.retry_statuses = tuple(retry_statuses)
+        self.throttle_multiplier = throttle_multiplier
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.budget = budget
+
+    @classmethod
+    def fixed(cls, retries=1, delay=0.0):
+        """
+        The legacy behavior of ThorEnvironment.retries / retry_delay with the same delay for every retry.
+        Timeouts, connection errors, 404 and HTTP 429/502/503/504 are retried;
+        other HTTP errors (ThorHTTPError with 500 or a 4xx) are not.
+        """
+        return cls(max_attempts=retries, base_delay=delay, max_delay=delay, multiplier=1.0, jitter=0.0,
+                   retry_on_not_found=True, retry_statuses=(429, 502, 503, 504), throttle_multiplier=1.0,
+                   respect_retry_after=False)
+
+    def on_first_attempt(self):
+        if self.budget:
+            self.budget.deposit()
+
+    def is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, ThorHTTPError):
+            return error.status in self.retry_statuses
+        if isinstance(error, asyncio.TimeoutError):
+            return self.retry_on_timeout
+        if isinstance(error, FileNotFoundError):
+            return self.retry_on_not_found
+        return self.retry_on_connection_error
+
+    def should_retry(self, attempt: int, error: Exception) -> bool:
+        """
+        attempt: number of the attempt that has just failed (1-based).
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return False
+        if self.budget and not self.budget.try_spend():
+            return False
+        return True
+
+    def delay(self, attempt: int, error: Exception = None) -> float:
+        delay = min(self.base_delay * self.multiplier ** (attempt - 1), self.max_delay)
+        if isinstance(error, ThorHTTPError):
+            if error.status in self.THROTTLE_STATUSES:
+                delay *= self.throttle_multiplier
+        if self.jitter:
+            delay *= 1.0 - self.jitter * random.random()
+        if self.respect_retry_after and isinstance(error, ThorHTTPError) and error.retry_after:
+            delay = max(delay, min(error.retry_after, self.max_retry_after))
+        return delay
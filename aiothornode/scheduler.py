@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from typing import Callable, Awaitable, Dict, Optional, List, Any
+
+from .connector import ThorConnector
+
+
+class ThorSubscription:
+    def __init__(self, name, query: Callable[[], Awaitable], is_changed: Callable[[Any, Any], bool] = None):
+        self.name = name
+        self.query = query
+        self.is_changed = is_changed or (lambda old, new: old != new)
+        self.callbacks: List[Callable] = []
+        self.value = None
+        self.height = 0  # THORChain height when the value was fetched
+
+
+class ThorBlockScheduler:
+    """
+    Polls the THORChain height and, once per new block, refreshes all subscribed queries concurrently.
+    Subscribers are called only when the result differs from the previous one:
+        callback(name, new_value, old_value, height), may be a coroutine function.
+
+    Example:
+        scheduler = ThorBlockScheduler(connector)
+        scheduler.subscribe('mimir', connector.query_mimir, on_mimir_changed)
+        scheduler.start()
+    """
+
+    def __init__(self, connector: ThorConnector, poll_interval=3.0, logger=None):
+        self.connector = connector
+        self.poll_interval = poll_interval
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.subscriptions: Dict[str, ThorSubscription] = {}
+        self.last_height = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, name, query: Callable[[], Awaitable], callback: Callable,
+                  is_changed: Callable[[Any, Any], bool] = None):
+        """
+        Subscribers of the same name share one query. is_changed(old, new) defaults to "!=".
+        """
+        sub = self.subscriptions.get(name)
+        if sub is None:
+            sub = self.subscriptions[name] = ThorSubscription(name, query, is_changed)
+        sub.callbacks.append(callback)
+        return self
+
+    def unsubscribe(self, name, callback: Callable = None):
+        sub = self.subscriptions.get(name)
+        if sub is None:
+            return
+        if callback is not None and callback in sub.callbacks:
+            sub.callbacks.remove(callback)
+        if callback is None or not sub.callbacks:
+            del self.subscriptions[name]
+
+    def value(self, name):
+        sub = self.subscriptions.get(name)
+        return sub.value if sub else None
+
+    async def query_thor_height(self) -> int:
+        last_blocks = await self.connector.query_last_blocks()
+        heights = [int(lb.thorchain) for lb in last_blocks if lb.thorchain]
+        if heights:
+            return max(heights)
+        return await self.connector.query_latest_block_height()
+
+    async def tick(self) -> bool:
+        """
+        One polling step. Returns True if a new block was seen and the subscriptions were refreshed.
+        """
+        height = await self.query_thor_height()
+        if not height or height <= self.last_height:
+            return False
+        self.last_height = height
+
+        subs = list(self.subscriptions.values())
+        results = await asyncio.gather(*[sub.query() for sub in subs], return_exceptions=True)
+        for sub, new_value in zip(subs, results):
+            await self._update(sub, new_value, height)
+        return True
+
+    async def _update(self, sub: ThorSubscription, new_value, height):
+        if isinstance(new_value, Exception) or new_value is None:
+            self.logger.warning(f'Failed to refresh "{sub.name}" at #{height}: {new_value!r}')
+            return
+
+        old_value = sub.value
+        changed = old_value is None or sub.is_changed(old_value, new_value)
+        sub.value, sub.height = new_value, height
+        if not changed:
+            return
+
+        for callback in list(sub.callbacks):
+            try:
+                result = callback(sub.name, new_value, old_value, height)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception:
+                self.logger.exception(f'Subscriber of "{sub.name}" failed')
+
+    async def run(self):
+        while True:
+            try:
+                await self.tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.logger.exception('Scheduler tick failed')
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+        return self._task
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,228 @@
+"""
+Transports beneath ThorNodeClient: aiohttp (default), recording to disk and offline replay.
+
+    store = ThorRecordStore('recordings/mainnet')
+    connector = ThorConnector(MAINNET, session, transport=RecordingTransport(AiohttpTransport(session), store))
+    ...
+    connector = ThorConnector(MAINNET, session, transport=ReplayTransport(store, latency=0.05, jitter=0.02))
+"""
+
+import asyncio
+import base64
+import hashlib
+import os
+import random
+from typing import NamedTuple, Mapping, Optional, Dict, Iterator
+
+import ujson
+from aiohttp import ClientSession, web
+from yarl import URL
+
+
+class ThorResponse(NamedTuple):
+    status: int
+    body: bytes
+    headers: Mapping[str, str]
+
+
+def path_of(url: str) -> str:
+    """
+    "https://thornode.ninerealms.com/thorchain/pools?height=1" => "/thorchain/pools?height=1"
+    Recordings are keyed by it, so they can be replayed against any host.
+    It is quoted the same way aiohttp sends it, so it matches what ReplayServer receives.
+    """
+    return URL(url).raw_path_qs
+
+
+class ThorTransport:
+    """
+    Base class: performs a GET and returns the whole response.
+    """
+
+    async def get(self, url: str, timeout=None, headers=None) -> ThorResponse:
+        raise NotImplementedError
+
+
+class AiohttpTransport(ThorTransport):
+    def __init__(self, session: ClientSession):
+        self.session = session
+
+    async def get(self, url: str, timeout=None, headers=None) -> ThorResponse:
+        kwargs = {'headers': headers}
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+        async with self.session.get(url, **kwargs) as resp:
+            return ThorResponse(resp.status, await resp.read(), resp.headers)
+
+
+class ThorRecordStore:
+    """
+    Responses on disk, one JSON file per path. Only the headers the client needs are kept.
+    """
+
+    KEPT_HEADERS = ('Content-Type', 'Retry-After')
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(path: str) -> str:
+        return hashlib.sha1(path.encode('utf-8')).hexdigest()
+
+    def file_name(self, path: str) -> str:
+        return os.path.join(self.directory, f'{self.key(path)}.json')
+
+    def save(self, path: str, response: ThorResponse):
+        record = {
+            'path': path,
+            'status': response.status,
+            'headers': {name: response.headers[name] for name in self.KEPT_HEADERS if name in response.headers},
+        }
+        try:
+            record['body'] = response.body.decode('utf-8')
+        except UnicodeDecodeError:
+            record['body_b64'] = base64.b64encode(response.body).decode('ascii')
+
+        tmp_name = self.file_name(path) + '.tmp'
+        with open(tmp_name, 'w') as f:
+            ujson.dump(record, f)
+        os.replace(tmp_name, self.file_name(path))
+
+    @staticmethod
+    def _from_record(record: dict) -> ThorResponse:
+        if 'body_b64' in record:
+            body = base64.b64decode(record['body_b64'])
+        else:
+            body = record['body'].encode('utf-8')
+        return ThorResponse(record['status'], body, record.get('headers', {}))
+
+    def load(self, path: str) -> Optional[ThorResponse]:
+        try:
+            with open(self.file_name(path)) as f:
+                return self._from_record(ujson.load(f))
+        except FileNotFoundError:
+            return None
+
+    def paths(self) -> Iterator[str]:
+        for name in sorted(os.listdir(self.directory)):
+            if name.endswith('.json'):
+                with open(os.path.join(self.directory, name)) as f:
+                    yield ujson.load(f)['path']
+
+
+class RecordingTransport(ThorTransport):
+    """
+    Passes requests to the inner transport and saves every response to the store.
+    """
+
+    def __init__(self, inner: ThorTransport, store: ThorRecordStore):
+        self.inner = inner
+        self.store = store
+
+    async def get(self, url: str, timeout=None, headers=None) -> ThorResponse:
+        response = await self.inner.get(url, timeout, headers)
+        self.store.save(path_of(url), response)
+        return response
+
+
+class ReplayTransport(ThorTransport):
+    """
+    Serves recorded responses without network. Unknown paths get 404.
+    Faults are simulated with a seeded RNG, so runs are reproducible:
+        latency + uniform(0, jitter) sec of delay for every request;
+        error_rate: share of requests answered with error_status;
+        timeout_rate: share of requests that raise asyncio.TimeoutError (after the delay).
+    """
+
+    def __init__(self, store: Optional[ThorRecordStore] = None, latency=0.0, jitter=0.0,
+                 error_rate=0.0, error_status=503, timeout_rate=0.0, seed=0):
+        self.store = store
+        self.responses: Dict[str, ThorResponse] = {}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.timeout_rate = timeout_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+
+    def add(self, path: str, data, status=200, headers=None):
+        """
+        Adds (or overrides) a response in memory. data is a JSON-serializable object or raw bytes.
+        """
+        body = data if isinstance(data, bytes) else ujson.dumps(data).encode('utf-8')
+        self.responses[path] = ThorResponse(status, body, headers or {'Content-Type': 'application/json'})
+        return self
+
+    def lookup(self, path: str) -> ThorResponse:
+        response = self.responses.get(path)
+        if response is None and self.store:
+            response = self.store.load(path)
+        return response or ThorResponse(404, b'', {})
+
+    async def respond(self, path: str) -> ThorResponse:
+        self.requests += 1
+        delay = self.latency + (self.random.uniform(0.0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        dice = self.random.random()
+        if dice < self.timeout_rate:
+            raise asyncio.TimeoutError(f'Simulated timeout for {path}')
+        if dice < self.timeout_rate + self.error_rate:
+            return ThorResponse(self.error_status, b'', {})
+        return self.lookup(path)
+
+    async def get(self, url: str, timeout=None, headers=None) -> ThorResponse:
+        return await self.respond(path_of(url))
+
+
+class ReplayServer:
+    """
+    Local HTTP stand-in for THORNode/RPC backed by a ReplayTransport, for end-to-end tests through aiohttp.
+    Serve the same store for both: ThorEnvironment(thornode_url=server.url, rpc_url=server.url)
+    A simulated timeout drops the connection here, the client sees it as a disconnect.
+
+        async with ReplayServer(ReplayTransport(store, latency=0.01)) as server:
+            ...
+    """
+
+    def __init__(self, replay: ReplayTransport, host='127.0.0.1', port=0):
+        self.replay = replay
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handler(self, request: web.Request):
+        try:
+            response = await self.replay.respond(request.raw_path)
+        except asyncio.TimeoutError:
+            request.transport.close()
+            raise web.HTTPServiceUnavailable()
+        return web.Response(status=response.status, body=response.body, headers=dict(response.headers))
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_route('GET', '/{tail:.*}', self._handler)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self
+
+    async def close(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def url(self):
+        return f'http://{self.host}:{self.port}'
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -1,8 +1,9 @@
 import base64
+import binascii
 import datetime
 import re
 from hashlib import sha256
-from typing import List, NamedTuple
+from typing import List, NamedTuple, Optional, Sequence, Union, Dict, Callable
 
 import ujson
 from dateutil.parser import parse as date_parser
@@ -21,6 +22,22 @@ def float_to_thor(x: float) -> int:
     return int(x * THOR_BASE_MULT)
 
 
+def parse_rfc3339(s: str) -> datetime.datetime:
+    """
+    Fast parser for Tendermint timestamps like "2021-04-10T06:11:32.123456789Z".
+    Nanoseconds are truncated to microseconds. Falls back to dateutil for other formats.
+    """
+    if len(s) >= 20 and s[10] == 'T' and s[-1] == 'Z' and s[19] in '.Z':
+        frac = s[20:-1][:6] if s[19] == '.' else ''
+        return datetime.datetime(
+            int(s[0:4]), int(s[5:7]), int(s[8:10]),
+            int(s[11:13]), int(s[14:16]), int(s[17:19]),
+            int(frac.ljust(6, '0')) if frac else 0,
+            tzinfo=datetime.timezone.utc
+        )
+    return date_parser(s)
+
+
 class ThorException(Exception):
     def __init__(self, j, *args) -> None:
         super().__init__(*args)
@@ -36,6 +53,26 @@ class ThorException(Exception):
             ]
 
 
+class ThorHTTPError(ConnectionError):
+    """
+    The node answered with a non-2xx status (other than 404 and 501). The error body is never returned as data.
+    429 and 502/503/504 mean "try later"; retry_after is the Retry-After header in seconds (None if absent).
+    """
+
+    def __init__(self, status: int, url='', retry_after=None):
+        super().__init__(f'{url} returned HTTP {status}')
+        self.status = status
+        self.url = url
+        self.retry_after = retry_after
+
+    @property
+    def is_client_error(self):
+        """
+        4xx except 429: the node is alive, but refuses this request.
+        """
+        return 400 <= self.status < 500 and self.status != 429
+
+
 class ThorQueue(NamedTuple):
     outbound: int = 0
     swap: int = 0
@@ -87,31 +124,7 @@ class ThorNodeAccount(NamedTuple):
 
     @classmethod
     def from_json(cls, j):
-        bond = int(j.get('total_bond', 0)) or int(j.get('bond', 0))
-        node_operator_address = str(j.get('node_operator_address', '')) or str(j.get('bond_address', ''))
-
-        return cls(
-            node_address=str(j.get('node_address', '')),
-            status=str(j.get('status', '')),
-            pub_key_set=j.get('pub_key_set'),
-            validator_cons_pub_key=str(j.get('validator_cons_pub_key', '')),
-            bond=bond,
-            active_block_height=int(j.get('active_block_height', 0)),
-            bond_address=node_operator_address,
-            status_since=int(j.get('status_since', 0)),
-            signer_membership=j.get('signer_membership', []),
-            requested_to_leave=bool(j.get('requested_to_leave', False)),
-            forced_to_leave=bool(j.get('forced_to_leave', False)),
-            leave_height=int(j.get('leave_height', 0)),
-            ip_address=str(j.get('ip_address', '')),
-            version=str(j.get('version', '')),
-            slash_points=int(j.get('slash_points', 0)),
-            jail=j.get('jail', {}),
-            current_award=int(j.get('current_award', 0)),
-            observe_chains=j.get('observe_chains', []),
-            preflight_status=j.get('preflight_status', {}),
-            bond_providers=j.get('bond_providers', {})
-        )
+        return cls._make([convert(j) for convert in NODE_ACCOUNT_CONVERTERS.values()])
 
     @property
     def preflight_status_reason_and_code(self):
@@ -129,6 +142,32 @@ class ThorNodeAccount(NamedTuple):
         )
 
 
+# field => converter of the raw JSON, in the order of the fields;
+# shared by from_json, the lazy models (lazy.py) and the columnar tables (columnar.py)
+NODE_ACCOUNT_CONVERTERS: Dict[str, Callable[[dict], object]] = {
+    'node_address': lambda j: str(j.get('node_address', '')),
+    'status': lambda j: str(j.get('status', '')),
+    'pub_key_set': lambda j: j.get('pub_key_set'),
+    'validator_cons_pub_key': lambda j: str(j.get('validator_cons_pub_key', '')),
+    'bond': lambda j: int(j.get('total_bond', 0)) or int(j.get('bond', 0)),
+    'active_block_height': lambda j: int(j.get('active_block_height', 0)),
+    'bond_address': lambda j: str(j.get('node_operator_address', '')) or str(j.get('bond_address', '')),
+    'status_since': lambda j: int(j.get('status_since', 0)),
+    'signer_membership': lambda j: j.get('signer_membership', []),
+    'requested_to_leave': lambda j: bool(j.get('requested_to_leave', False)),
+    'forced_to_leave': lambda j: bool(j.get('forced_to_leave', False)),
+    'leave_height': lambda j: int(j.get('leave_height', 0)),
+    'ip_address': lambda j: str(j.get('ip_address', '')),
+    'version': lambda j: str(j.get('version', '')),
+    'slash_points': lambda j: int(j.get('slash_points', 0)),
+    'jail': lambda j: j.get('jail', {}),
+    'current_award': lambda j: int(j.get('current_award', 0)),
+    'observe_chains': lambda j: j.get('observe_chains', []),
+    'preflight_status': lambda j: j.get('preflight_status', {}),
+    'bond_providers': lambda j: j.get('bond_providers', {}),
+}
+
+
 class ThorLastBlock(NamedTuple):
     chain: str = ''
     last_observed_in: int = 0
@@ -176,23 +215,26 @@ class ThorPool(NamedTuple):
 
     @classmethod
     def from_json(cls, j):
-        return cls(
-            balance_asset=int(j.get('balance_asset', 0)),
-            balance_rune=int(j.get('balance_rune', 0)),
-            asset=j.get('asset', ''),
-            lp_units=int(j.get('LP_units', 0)),
-            pool_units=int(j.get('pool_units', 0)),  # Sum of LP_units and synth_units
-            status=j.get('status', cls.STATUS_BOOTSTRAP),
-            synth_units=int(j.get('synth_units', 0)),
-            synth_supply=int(j.get('synth_supply', 0)),
-            decimals=int(j.get('decimals', 0)),
-            error=j.get('error', ''),
-            pending_inbound_rune=int(j.get('pending_inbound_rune', 0)),
-            pending_inbound_asset=int(j.get('pending_inbound_asset', 0)),
-            savers_depth=int(j.get('savers_depth', 0)),
-            savers_units=int(j.get('savers_units', 0)),
-            synth_mint_paused=bool(j.get('synth_mint_paused', False)),
-        )
+        return cls._make([convert(j) for convert in POOL_CONVERTERS.values()])
+
+
+POOL_CONVERTERS: Dict[str, Callable[[dict], object]] = {
+    'balance_asset': lambda j: int(j.get('balance_asset', 0)),
+    'balance_rune': lambda j: int(j.get('balance_rune', 0)),
+    'asset': lambda j: j.get('asset', ''),
+    'lp_units': lambda j: int(j.get('LP_units', 0)),
+    'pool_units': lambda j: int(j.get('pool_units', 0)),  # Sum of LP_units and synth_units
+    'status': lambda j: j.get('status', ThorPool.STATUS_BOOTSTRAP),
+    'synth_units': lambda j: int(j.get('synth_units', 0)),
+    'decimals': lambda j: int(j.get('decimals', 0)),
+    'error': lambda j: j.get('error', ''),
+    'pending_inbound_rune': lambda j: int(j.get('pending_inbound_rune', 0)),
+    'pending_inbound_asset': lambda j: int(j.get('pending_inbound_asset', 0)),
+    'savers_depth': lambda j: int(j.get('savers_depth', 0)),
+    'savers_units': lambda j: int(j.get('savers_units', 0)),
+    'synth_mint_paused': lambda j: bool(j.get('synth_mint_paused', False)),
+    'synth_supply': lambda j: int(j.get('synth_supply', 0)),
+}
 
 
 class ThorConstants(NamedTuple):
@@ -353,20 +395,23 @@ class ThorVault(NamedTuple):
 
     @classmethod
     def from_json(cls, j):
-        return cls(
-            block_height=int(j.get('block_height', 0)),
-            pub_key=j.get('pub_key', ''),
-            coins=[ThorCoin.from_json(coin) for coin in j.get('coins', [])],
-            type=j.get('type', ''),
-            status=j.get('status', ''),
-            status_since=int(j.get('status_since', 0)),
-            membership=j.get('membership', []),
-            chains=j.get('chains', []),
-            inbound_tx_count=int(j.get('inbound_tx_count', 0)),
-            outbound_tx_count=int(j.get('outbound_tx_count', 0)),
-            routers=[ThorRouter.from_json(r) for r in j.get('routers', [])],
-            addresses=[ThorAddress.from_json(a) for a in j.get('addresses', [])],
-        )
+        return cls._make([convert(j) for convert in VAULT_CONVERTERS.values()])
+
+
+VAULT_CONVERTERS: Dict[str, Callable[[dict], object]] = {
+    'block_height': lambda j: int(j.get('block_height', 0)),
+    'pub_key': lambda j: j.get('pub_key', ''),
+    'coins': lambda j: [ThorCoin.from_json(coin) for coin in j.get('coins', [])],
+    'type': lambda j: j.get('type', ''),
+    'status': lambda j: j.get('status', ''),
+    'status_since': lambda j: int(j.get('status_since', 0)),
+    'membership': lambda j: j.get('membership', []),
+    'chains': lambda j: j.get('chains', []),
+    'inbound_tx_count': lambda j: int(j.get('inbound_tx_count', 0)),
+    'outbound_tx_count': lambda j: int(j.get('outbound_tx_count', 0)),
+    'routers': lambda j: [ThorRouter.from_json(r) for r in j.get('routers', [])],
+    'addresses': lambda j: [ThorAddress.from_json(a) for a in j.get('addresses', [])],
+}
 
 
 RUNE = 'rune'
@@ -407,8 +452,8 @@ class ThorBlock(NamedTuple):
     height: int
     chain_id: str
     time: datetime.datetime
-    hash: str
-    txs_hashes: List[str]
+    hash: Optional[str]  # None if the block id is unknown (a NewBlock event without block_id)
+    txs_hashes: Optional[List[str]]  # None if parsed with with_hashes=False
 
     @classmethod
     def decode_tx_hash(cls, tx_b64: str):
@@ -416,25 +461,48 @@ class ThorBlock(NamedTuple):
         return sha256(decoded).hexdigest().upper()
 
     @classmethod
-    def from_json(cls, j):
+    def decode_tx_hashes(cls, txs_b64: List[str]) -> List[str]:
+        """
+        Same as '0x' + decode_tx_hash(tx) for every tx, without per-call overhead.
+        """
+        a2b, sha = binascii.a2b_base64, sha256
+        return ['0x' + sha(a2b(tx)).hexdigest().upper() for tx in txs_b64]
+
+    @classmethod
+    def from_json(cls, j, with_hashes=True):
+        """
+        with_hashes=False skips hashing of the txs, then txs_hashes is None.
+        """
         result = j.get('result', {})
         block = result['block']
         header = block['header']
-        time = date_parser(header['time'])
+        time = parse_rfc3339(header['time'])
 
-        txs = [
-            '0x' + cls.decode_tx_hash(content) for content in block['data']['txs']
-        ]
+        txs = cls.decode_tx_hashes(block['data']['txs'] or []) if with_hashes else None
 
         return cls(
             height=int(header['height']),
             chain_id=header['chain_id'],
             time=time,
-            hash=result['block_id']['hash'],
+            hash=(result.get('block_id') or {}).get('hash'),
             txs_hashes=txs
         )
 
 
+def decode_b64_str(s):
+    return base64.b64decode(s).decode('utf-8') if s else None
+
+
+AMOUNT_RE = re.compile(r'(\d+)([^,]*)')
+
+
+def parse_amounts(amount_str: str):
+    """
+    "2000000rune,100btc/btc" => [(2000000, 'rune'), (100, 'btc/btc')]
+    """
+    return [(int(value), asset) for value, asset in AMOUNT_RE.findall(amount_str)]
+
+
 class ThorTxAttribute(NamedTuple):
     key: str
     value: str
@@ -442,28 +510,86 @@ class ThorTxAttribute(NamedTuple):
 
     @classmethod
     def from_json(cls, j):
-        k = j.get('key')
-        v = j.get('value')
         return cls(
-            base64.b64decode(k).decode('utf-8') if k else None,
-            base64.b64decode(v).decode('utf-8') if v else None,
+            decode_b64_str(j.get('key')),
+            decode_b64_str(j.get('value')),
             bool(j['index'])
         )
 
 
+class ThorTxAttributes(Sequence):
+    """
+    Attributes of a tx event as a read-only sequence of ThorTxAttribute.
+    They are kept as they come in JSON (base64) and decoded only when accessed.
+    Equality compares the raw JSON, so it does not depend on what has been decoded so far.
+    """
+
+    __slots__ = ('raw', '_decoded', '_raw_by_key', '_values')
+
+    def __init__(self, raw: List[dict]):
+        self.raw = raw
+        self._decoded = None  # List[ThorTxAttribute]
+        self._raw_by_key = None  # decoded key => raw (base64) value; the first attribute wins if a key is repeated
+        self._values = {}  # decoded key => decoded value
+
+    def _decode_all(self) -> List[ThorTxAttribute]:
+        if self._decoded is None:
+            self._decoded = [ThorTxAttribute.from_json(a) for a in self.raw]
+        return self._decoded
+
+    def __getitem__(self, i):
+        return self._decode_all()[i]
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __eq__(self, other):
+        if isinstance(other, ThorTxAttributes):
+            return self.raw == other.raw
+        if isinstance(other, (list, tuple)):
+            return self._decode_all() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'ThorTxAttributes({self._decode_all()!r})'
+
+    def value_of(self, key):
+        """
+        Decodes only the value of this key. Raises KeyError if there is no such attribute.
+        """
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+
+        if self._raw_by_key is None:
+            self._raw_by_key = {}
+            for a in self.raw:
+                self._raw_by_key.setdefault(decode_b64_str(a.get('key')), a.get('value'))
+        value = self._values[key] = decode_b64_str(self._raw_by_key[key])
+        return value
+
+
 class ThorTxEvent(NamedTuple):
     type: str
-    attributes: List[ThorTxAttribute]
+    attributes: Sequence  # ThorTxAttributes (lazy) from JSON or a list of ThorTxAttribute
 
     @classmethod
     def from_json(cls, j):
         return cls(
             type=j['type'],
-            attributes=[ThorTxAttribute.from_json(a) for a in j['attributes']]
+            attributes=ThorTxAttributes(j['attributes'])
         )
 
     def value_of(self, key):
-        return next(a.value for a in self.attributes if a.key == key)
+        if isinstance(self.attributes, ThorTxAttributes):
+            return self.attributes.value_of(key)
+        for a in self.attributes:
+            if a.key == key:
+                return a.value
+        raise KeyError(key)
 
     @property
     def sender(self):
@@ -475,9 +601,24 @@ class ThorTxEvent(NamedTuple):
 
     @property
     def amount(self):
-        amt_str = self.value_of('amount')
-        value, asset = re.findall(r'[A-Za-z]+|\d+', amt_str)
-        return int(value), asset
+        """
+        The first coin of the "amount" attribute as (value, asset)
+        """
+        return self.amounts[0]
+
+    @property
+    def amounts(self):
+        return parse_amounts(self.value_of('amount'))
+
+
+def parse_tx_log(log: str):
+    """
+    The log of a successful tx is JSON, but failed ones (code != 0) have a plain error message there.
+    """
+    try:
+        return ujson.loads(log)
+    except ValueError:
+        return log
 
 
 class ThorNativeTX(NamedTuple):
@@ -486,7 +627,7 @@ class ThorNativeTX(NamedTuple):
     index: int
     code: int
     data: str
-    log: List[dict]
+    log: Union[List[dict], str]  # failed txs have a plain error message here
     gas_wanted: int
     gas_used: int
     events: List[ThorTxEvent]
@@ -504,12 +645,19 @@ class ThorNativeTX(NamedTuple):
         return [e for e in self.events if e.type == 'transfer']
 
     @classmethod
-    def from_json(cls, j):
+    def from_json(cls, j, event_types=None):
+        """
+        event_types: if given, only events of these types are kept
+        """
         result = j.get('result', j)
         tx_result = result['tx_result']
         data = base64.b64decode(tx_result['data']).decode('utf-8').strip()
-        log = ujson.loads(tx_result['log'])
-        events = [ThorTxEvent.from_json(e) for e in tx_result['events']]
+        log = parse_tx_log(tx_result['log'])
+        if event_types is None:
+            events = [ThorTxEvent.from_json(e) for e in tx_result['events']]
+        else:
+            event_types = set(event_types)
+            events = [ThorTxEvent.from_json(e) for e in tx_result['events'] if e['type'] in event_types]
 
         return cls(
             hash=result['hash'],
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from typing import List, Union, AsyncIterator, Optional
+
+import ujson
+from aiohttp import ClientSession, ClientError, WSMsgType
+
+from .env import ThorEnvironment
+from .types import ThorBlock, ThorNativeTX
+
+
+class ThorWebSocketClient:
+    """
+    Subscribes to Tendermint events over the websocket at env.rpc_url and yields ThorBlock / ThorNativeTX objects.
+    Reconnects with exponential backoff. A connection error switches to the next environment,
+    a clean close by the server reconnects to the same one.
+
+    Example:
+        ws = ThorWebSocketClient([primary_env, backup_env], session)
+        async for item in ws:
+            if isinstance(item, ThorBlock):
+                ...
+    """
+
+    QUERY_NEW_BLOCK = "tm.event='NewBlock'"
+    QUERY_TX = "tm.event='Tx'"
+
+    EVENT_NEW_BLOCK = 'tendermint/event/NewBlock'
+    EVENT_TX = 'tendermint/event/Tx'
+
+    def __init__(self, envs: Union[ThorEnvironment, List[ThorEnvironment]], session: ClientSession, logger=None,
+                 queries=(QUERY_NEW_BLOCK, QUERY_TX),
+                 reconnect_delay=1.0, max_reconnect_delay=60.0, heartbeat=30.0):
+        self.envs = envs if isinstance(envs, (list, tuple)) else [envs]
+        assert self.envs
+        self.session = session
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.queries = list(queries)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.heartbeat = heartbeat
+        self.reconnects = 0
+        self._closed = False
+
+    @staticmethod
+    def ws_url(env: ThorEnvironment):
+        url = env.rpc_url.rstrip('/')
+        if url.startswith('https://'):
+            url = 'wss://' + url[len('https://'):]
+        elif url.startswith('http://'):
+            url = 'ws://' + url[len('http://'):]
+        return f'{url}/websocket'
+
+    def close(self):
+        """
+        Stops the iteration after the current message.
+        """
+        self._closed = True
+
+    def __aiter__(self):
+        return self.iter_events()
+
+    async def iter_events(self) -> AsyncIterator[Union[ThorBlock, ThorNativeTX]]:
+        env_index = 0
+        delay = self.reconnect_delay
+        while not self._closed:
+            env = self.envs[env_index % len(self.envs)]
+            url = self.ws_url(env)
+            failed = False
+            try:
+                async for item in self._listen(url):
+                    delay = self.reconnect_delay  # the connection works, so reset the backoff
+                    yield item
+                    if self._closed:
+                        return
+                self.logger.warning(f'Websocket {url} was closed by the server')
+            except (ClientError, ConnectionError, asyncio.TimeoutError) as e:
+                self.logger.warning(f'Websocket {url} failed: {type(e).__name__} {e}')
+                failed = True
+
+            if self._closed:
+                return
+            if failed:
+                env_index += 1
+            self.reconnects += 1
+            self.logger.info(f'Reconnecting in {delay:.1f} sec...')
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _listen(self, url):
+        async with self.session.ws_connect(url, heartbeat=self.heartbeat) as ws:
+            for i, query in enumerate(self.queries, start=1):
+                await ws.send_str(ujson.dumps({
+                    'jsonrpc': '2.0',
+                    'method': 'subscribe',
+                    'id': i,
+                    'params': {'query': query},
+                }))
+
+            async for msg in ws:
+                if msg.type == WSMsgType.TEXT:
+                    item = self.parse_message(msg.data)
+                    if item is not None:
+                        yield item
+                elif msg.type == WSMsgType.ERROR:
+                    raise ConnectionError(f'Websocket error: {ws.exception()!r}')
+
+    def parse_message(self, text: str) -> Optional[Union[ThorBlock, ThorNativeTX]]:
+        try:
+            message = ujson.loads(text)
+            if error := message.get('error'):
+                self.logger.error(f'Websocket subscription error: {error}')
+                return None
+
+            data = (message.get('result') or {}).get('data')
+            if not data:
+                return None  # subscription confirmation
+
+            event_type, value = data.get('type'), data.get('value', {})
+            if event_type == self.EVENT_NEW_BLOCK:
+                return self.block_from_event(value)
+            elif event_type == self.EVENT_TX:
+                return self.tx_from_event(value)
+        except (ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f'Failed to parse websocket message: {type(e).__name__} {e}')
+        return None
+
+    @staticmethod
+    def block_from_event(value: dict) -> ThorBlock:
+        return ThorBlock.from_json({
+            'result': {
+                'block': value['block'],
+                'block_id': value.get('block_id'),  # not always in the event, then the hash is None
+            }
+        })
+
+    @staticmethod
+    def tx_from_event(value: dict) -> ThorNativeTX:
+        tx_result = value['TxResult']
+        result = tx_result.get('result', {})
+        # Tendermint omits zero/empty fields in events
+        return ThorNativeTX.from_json({
+            'hash': ThorBlock.decode_tx_hash(tx_result['tx']),
+            'height': tx_result['height'],
+            'index': tx_result.get('index', 0),
+            'tx_result': {
+                'code': result.get('code', 0),
+                'data': result.get('data') or '',
+                'log': result.get('log') or '[]',
+                'gas_wanted': result.get('gas_wanted', 0),
+                'gas_used': result.get('gas_used', 0),
+                'events': result.get('events') or [],
+            }
+        })
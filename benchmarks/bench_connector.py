@@ -0,0 +1,123 @@
+"""
+End-to-end ThorConnector throughput against a local ReplayServer (or the in-process ReplayTransport)
+serving the benchmark payloads, at several concurrency levels. Coalescing of identical requests is off,
+so every call goes through the whole pipeline.
+
+    python benchmarks/bench_connector.py [--endpoint pools|nodes|vaults|block|mixed] [--requests N]
+                                         [--concurrency 1,4,16,64] [--latency SEC] [--jitter SEC]
+                                         [--in-process] [--recorded DIR] [--json FILE]
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+
+import aiohttp
+
+from aiothornode.connector import ThorConnector
+from aiothornode.env import ThorEnvironment
+from aiothornode.transport import ReplayTransport, ReplayServer
+from payloads import load_payloads
+from report import make_report, write_report
+
+BLOCK_HEIGHT = 12_000_000
+
+ENDPOINTS = {
+    'pools': lambda c: c.query_pools(),
+    'nodes': lambda c: c.query_node_accounts(),
+    'vaults': lambda c: c.query_vault(),
+    'block': lambda c: c.query_block(BLOCK_HEIGHT),
+}
+
+
+def make_replay(payloads, latency, jitter):
+    replay = ReplayTransport(latency=latency, jitter=jitter)
+    replay.add('/thorchain/pools', payloads['pools'])
+    replay.add('/thorchain/nodes', payloads['nodes'])
+    replay.add('/thorchain/vaults/asgard', payloads['vaults'])
+    replay.add(f'/block?height={BLOCK_HEIGHT}', payloads['block'])
+    return replay
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+async def measure(connector: ThorConnector, endpoint, requests, concurrency):
+    names = itertools.cycle(ENDPOINTS) if endpoint == 'mixed' else itertools.repeat(endpoint)
+    calls = iter([ENDPOINTS[next(names)] for _ in range(requests)])
+    latencies, failures = [], 0
+
+    async def worker():
+        nonlocal failures
+        for call in calls:
+            started_at = time.perf_counter()
+            result = await call(connector)
+            latencies.append(time.perf_counter() - started_at)
+            if not result:
+                failures += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        'endpoint': endpoint,
+        'concurrency': concurrency,
+        'requests': requests,
+        'failures': failures,
+        'elapsed': elapsed,
+        'requests_per_sec': requests / elapsed,
+        'latency_p50_ms': percentile(latencies, 0.5) * 1e3,
+        'latency_p99_ms': percentile(latencies, 0.99) * 1e3,
+        'latency_max_ms': latencies[-1] * 1e3,
+    }
+
+
+async def run(endpoint='mixed', requests=500, concurrency_levels=(1, 4, 16, 64), latency=0.0, jitter=0.0,
+              in_process=False, recorded_dir=None):
+    replay = make_replay(load_payloads(recorded_dir), latency, jitter)
+    results = []
+    async with aiohttp.ClientSession() as session:
+        if in_process:
+            env = ThorEnvironment(thornode_url='http://replay', rpc_url='http://replay')
+            connector = ThorConnector(env, session, coalesce_requests=False, transport=replay)
+            for concurrency in concurrency_levels:
+                results.append(await measure(connector, endpoint, requests, concurrency))
+        else:
+            async with ReplayServer(replay) as server:
+                env = ThorEnvironment(thornode_url=server.url, rpc_url=server.url)
+                connector = ThorConnector(env, session, coalesce_requests=False)
+                for concurrency in concurrency_levels:
+                    results.append(await measure(connector, endpoint, requests, concurrency))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--endpoint', default='mixed', choices=[*ENDPOINTS, 'mixed'])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', default='1,4,16,64', help='comma separated levels')
+    parser.add_argument('--latency', type=float, default=0.0, help='server latency, sec')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random latency up to this, sec')
+    parser.add_argument('--in-process', action='store_true', help='ReplayTransport instead of a local HTTP server')
+    parser.add_argument('--recorded', help='directory with recorded responses (name.json)')
+    parser.add_argument('--json', help='write the report to this file ("-" for stdout)')
+    args = parser.parse_args()
+
+    levels = [int(c) for c in args.concurrency.split(',')]
+    results = asyncio.run(run(args.endpoint, args.requests, levels, args.latency, args.jitter,
+                              args.in_process, args.recorded))
+    if args.json:
+        write_report(make_report('connector', results, **vars(args)), args.json)
+    if args.json != '-':
+        for r in results:
+            print(f"{r['endpoint']:>6} c={r['concurrency']:<4} {r['requests_per_sec']:>9.1f} req/s  "
+                  f"p50 {r['latency_p50_ms']:>8.2f} ms  p99 {r['latency_p99_ms']:>8.2f} ms  "
+                  f"failures {r['failures']}")
+
+
+if __name__ == '__main__':
+    main()
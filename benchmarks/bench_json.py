@@ -0,0 +1,65 @@
+"""
+Compares decoding of THORNode responses: the old "bytes -> str -> ujson" path against decoding bytes directly.
+
+    python benchmarks/bench_json.py [--recorded DIR] [--repeat N] [--json FILE]
+"""
+
+import argparse
+import timeit
+
+import ujson
+
+from aiothornode.jsonlib import ujson_loads, orjson_loads, orjson
+from payloads import load_payloads, payload_bytes
+from report import make_report, write_report
+
+
+def text_then_ujson(raw: bytes):
+    # what ThorNodeClient used to do: resp.text() and then ujson.loads(text)
+    return ujson.loads(raw.decode('utf-8'))
+
+
+DECODERS = {
+    'text+ujson': text_then_ujson,
+    'bytes+ujson': ujson_loads,
+}
+if orjson is not None:
+    DECODERS['bytes+orjson'] = orjson_loads
+
+
+def run(recorded_dir=None, repeat=200):
+    results = []
+    for name, raw in payload_bytes(load_payloads(recorded_dir)).items():
+        baseline = None
+        for decoder_name, decoder in DECODERS.items():
+            best = min(timeit.repeat(lambda: decoder(raw), number=repeat, repeat=5)) / repeat
+            baseline = baseline or best
+            results.append({
+                'payload': name,
+                'bytes': len(raw),
+                'decoder': decoder_name,
+                'us_per_call': best * 1e6,
+                'speedup': baseline / best,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--recorded', help='directory with recorded responses (name.json)')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--json', help='write the report to this file ("-" for stdout)')
+    args = parser.parse_args()
+
+    results = run(args.recorded, args.repeat)
+    if args.json:
+        write_report(make_report('json', results, repeat=args.repeat, recorded=args.recorded), args.json)
+    if args.json == '-':
+        return
+    for r in results:
+        print(f"{r['payload']:>8} {r['bytes']:>9} B  {r['decoder']:<13} "
+              f"{r['us_per_call']:>10.1f} us  x{r['speedup']:.2f}")
+
+
+if __name__ == '__main__':
+    main()
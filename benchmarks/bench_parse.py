@@ -0,0 +1,70 @@
+"""
+Cost of from_json of the main entities: ThorNodeAccount, ThorPool, ThorVault, ThorBlock and ThorNativeTX.
+
+    python benchmarks/bench_parse.py [--recorded DIR] [--repeat N] [--json FILE]
+"""
+
+import argparse
+import timeit
+
+from aiothornode.poolset import PoolSet
+from aiothornode.types import ThorNodeAccount, ThorPool, ThorVault, ThorBlock, ThorNativeTX
+from payloads import load_payloads
+from report import make_report, write_report
+
+
+def _native_tx_decoded(j):
+    # from_json keeps the event attributes encoded, so also measure the cost of reading all of them
+    tx = ThorNativeTX.from_json(j)
+    for event in tx.events:
+        list(event.attributes)
+    return tx
+
+
+CASES = {
+    # case name: (payload name, parser of the whole payload)
+    'ThorNodeAccount.from_json': ('nodes', lambda j: [ThorNodeAccount.from_json(n) for n in j]),
+    'ThorPool.from_json': ('pools', lambda j: [ThorPool.from_json(p) for p in j]),
+    'PoolSet.from_json': ('pools', PoolSet.from_json),
+    'ThorVault.from_json': ('vaults', lambda j: [ThorVault.from_json(v) for v in j]),
+    'ThorBlock.from_json': ('block', ThorBlock.from_json),
+    'ThorBlock.from_json(with_hashes=False)': ('block', lambda j: ThorBlock.from_json(j, with_hashes=False)),
+    'ThorNativeTX.from_json': ('native_tx', ThorNativeTX.from_json),
+    'ThorNativeTX.from_json+attributes': ('native_tx', _native_tx_decoded),
+}
+
+
+def run(recorded_dir=None, repeat=200):
+    payloads = load_payloads(recorded_dir)
+    results = []
+    for case, (payload_name, parse) in CASES.items():
+        j = payloads[payload_name]
+        items = len(j) if isinstance(j, list) else 1
+        best = min(timeit.repeat(lambda: parse(j), number=repeat, repeat=5)) / repeat
+        results.append({
+            'case': case,
+            'payload': payload_name,
+            'items': items,
+            'us_per_call': best * 1e6,
+            'us_per_item': best * 1e6 / items,
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--recorded', help='directory with recorded responses (name.json)')
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--json', help='write the report to this file ("-" for stdout)')
+    args = parser.parse_args()
+
+    results = run(args.recorded, args.repeat)
+    if args.json:
+        write_report(make_report('parse', results, repeat=args.repeat, recorded=args.recorded), args.json)
+    if args.json != '-':
+        for r in results:
+            print(f"{r['case']:<40} {r['items']:>4} items {r['us_per_call']:>10.1f} us {r['us_per_item']:>9.2f} us/item")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+"""
+Payloads for the benchmarks. Real responses recorded from a node are used if found in the given directory
+(nodes.json, pools.json, vaults.json, ...), otherwise synthetic ones with the same shape and size are generated.
+"""
+
+import base64
+import os
+import random
+
+import ujson
+
+RNG_SEED = 42
+
+
+def _addr(rng: random.Random, prefix='thor1', n=38):
+    return prefix + ''.join(rng.choice('023456789acdefghjklmnpqrstuvwxyz') for _ in range(n))
+
+
+def _num(rng: random.Random, lo=0, hi=10 ** 15):
+    return str(rng.randint(lo, hi))
+
+
+CHAINS = ['BTC', 'ETH', 'BNB', 'LTC', 'BCH', 'DOGE', 'AVAX', 'GAIA', 'BSC']
+
+
+def make_node(rng: random.Random):
+    return {
+        'node_address': _addr(rng),
+        'status': rng.choice(['Active', 'Standby', 'Disabled']),
+        'pub_key_set': {'secp256k1': _addr(rng, 'thorpub1', 70), 'ed25519': _addr(rng, 'thorpub1', 70)},
+        'validator_cons_pub_key': _addr(rng, 'thorcpub1', 70),
+        'peer_id': _addr(rng, '16Uiu2', 47),
+        'active_block_height': rng.randint(1, 12_000_000),
+        'status_since': rng.randint(1, 12_000_000),
+        'node_operator_address': _addr(rng),
+        'total_bond': _num(rng, 10 ** 13, 10 ** 14),
+        'bond_providers': {
+            'node_operator_fee': '2000',
+            'providers': [{'bond_address': _addr(rng), 'bond': _num(rng)} for _ in range(rng.randint(1, 6))],
+        },
+        'signer_membership': [_addr(rng, 'thorpub1', 70) for _ in range(3)],
+        'requested_to_leave': False,
+        'forced_to_leave': False,
+        'leave_height': 0,
+        'ip_address': '.'.join(str(rng.randint(1, 254)) for _ in range(4)),
+        'version': '1.121.1',
+        'slash_points': rng.randint(0, 2000),
+        'jail': {'node_address': _addr(rng), 'release_height': 0, 'reason': ''},
+        'current_award': _num(rng, 0, 10 ** 11),
+        'observe_chains': [{'chain': c, 'height': rng.randint(1, 10 ** 8)} for c in CHAINS],
+        'preflight_status': {'status': 'Ready', 'reason': 'OK', 'code': 0},
+    }
+
+
+def make_pool(rng: random.Random, i):
+    chain = CHAINS[i % len(CHAINS)]
+    return {
+        'asset': f'{chain}.TOKEN{i}-0X{rng.getrandbits(64):016X}',
+        'short_code': '',
+        'status': rng.choice(['Available', 'Staged']),
+        'decimals': 8,
+        'pending_inbound_asset': _num(rng, 0, 10 ** 8),
+        'pending_inbound_rune': _num(rng, 0, 10 ** 8),
+        'balance_asset': _num(rng, 10 ** 8, 10 ** 14),
+        'balance_rune': _num(rng, 10 ** 10, 10 ** 15),
+        'pool_units': _num(rng),
+        'LP_units': _num(rng),
+        'synth_units': _num(rng),
+        'synth_supply': _num(rng),
+        'savers_depth': _num(rng),
+        'savers_units': _num(rng),
+        'synth_mint_paused': False,
+        'synth_supply_remaining': _num(rng),
+        'loan_collateral': '0',
+        'loan_cr': '0',
+        'derived_depth_bps': '0',
+    }
+
+
+def make_vault(rng: random.Random):
+    return {
+        'block_height': rng.randint(1, 12_000_000),
+        'pub_key': _addr(rng, 'thorpub1', 70),
+        'coins': [{'asset': f'{c}.{c}', 'amount': _num(rng), 'decimals': 8} for c in CHAINS],
+        'type': 'AsgardVault',
+        'status': 'ActiveVault',
+        'status_since': rng.randint(1, 12_000_000),
+        'membership': [_addr(rng, 'thorpub1', 70) for _ in range(rng.randint(15, 30))],
+        'chains': CHAINS + ['THOR'],
+        'inbound_tx_count': rng.randint(0, 10 ** 6),
+        'outbound_tx_count': rng.randint(0, 10 ** 6),
+        'routers': [{'chain': 'ETH', 'router': '0x' + '%040x' % rng.getrandbits(160)}],
+        'addresses': [{'chain': c, 'address': _addr(rng, 'bc1q', 38)} for c in CHAINS],
+    }
+
+
+def _b64(s: str):
+    return base64.b64encode(s.encode('utf-8')).decode('ascii')
+
+
+def make_block(rng: random.Random, height=12_000_000, n_txs=50):
+    return {
+        'result': {
+            'block_id': {'hash': '%064X' % rng.getrandbits(256)},
+            'block': {
+                'header': {'height': str(height), 'chain_id': 'thorchain-mainnet-v1',
+                           'time': '2023-07-01T12:34:56.123456789Z'},
+                'data': {'txs': [base64.b64encode(rng.randbytes(rng.randint(200, 600))).decode('ascii')
+                                 for _ in range(n_txs)]},
+            }
+        }
+    }
+
+
+def _event(event_type, **attributes):
+    return {
+        'type': event_type,
+        'attributes': [{'key': _b64(k), 'value': _b64(v), 'index': True} for k, v in attributes.items()],
+    }
+
+
+def make_native_tx(rng: random.Random, height=12_000_000):
+    sender, recipient = _addr(rng), _addr(rng)
+    return {
+        'hash': '%064X' % rng.getrandbits(256),
+        'height': str(height),
+        'index': 0,
+        'tx_result': {
+            'code': 0,
+            'data': _b64('\n\x06\n\x04send'),
+            'log': '[{"events":[]}]',
+            'gas_wanted': '200000',
+            'gas_used': '90000',
+            'events': [
+                _event('tx', acc_seq=f'{sender}/{rng.randint(1, 1000)}'),
+                _event('message', action='send', sender=sender, module='thorchain'),
+                _event('coin_spent', spender=sender, amount=f'{_num(rng, 0, 10 ** 10)}rune'),
+                _event('coin_received', receiver=recipient, amount=f'{_num(rng, 0, 10 ** 10)}rune'),
+                _event('transfer', recipient=_addr(rng), sender=sender, amount='2000000rune'),
+                _event('transfer', recipient=recipient, sender=sender, amount=f'{_num(rng, 0, 10 ** 10)}rune'),
+            ] * 2,
+        }
+    }
+
+
+def synthetic_payloads():
+    rng = random.Random(RNG_SEED)
+    return {
+        'nodes': [make_node(rng) for _ in range(120)],
+        'pools': [make_pool(rng, i) for i in range(60)],
+        'vaults': [make_vault(rng) for _ in range(6)],
+        'block': make_block(rng),
+        'native_tx': make_native_tx(rng),
+    }
+
+
+def load_payloads(recorded_dir=None):
+    """
+    Returns {name: parsed JSON}. Recorded files override the synthetic ones with the same name.
+    """
+    payloads = synthetic_payloads()
+    if recorded_dir:
+        for file_name in sorted(os.listdir(recorded_dir)):
+            if file_name.endswith('.json'):
+                with open(os.path.join(recorded_dir, file_name), 'rb') as f:
+                    payloads[file_name[:-5]] = ujson.loads(f.read())
+    return payloads
+
+
+def payload_bytes(payloads):
+    return {name: ujson.dumps(data).encode('utf-8') for name, data in payloads.items()}
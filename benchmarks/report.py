@@ -0,0 +1,51 @@
+"""
+Machine-readable results: every benchmark can dump a JSON report to compare releases with each other.
+"""
+
+import datetime
+import platform
+import subprocess
+import sys
+from importlib import metadata
+
+import ujson
+
+
+def _package_version():
+    try:
+        return metadata.version('aiothornode')
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def make_report(benchmark: str, results: list, **params) -> dict:
+    return {
+        'benchmark': benchmark,
+        'version': _package_version(),
+        'git_revision': _git_revision(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'params': params,
+        'results': results,
+    }
+
+
+def write_report(report: dict, path: str):
+    """
+    path "-" means stdout.
+    """
+    text = ujson.dumps(report, indent=2)
+    if path == '-':
+        print(text)
+    else:
+        with open(path, 'w') as f:
+            f.write(text + '\n')
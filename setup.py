@@ -30,5 +30,9 @@ setuptools.setup(
         'python-dateutil>=2.8.2',
         'ujson>=4.0.2',
         'yarl>=1.6.3',
-    ]
+    ],
+    extras_require={
+        'orjson': ['orjson>=3.6.0'],
+        'numpy': ['numpy>=1.20'],
+    },
 )
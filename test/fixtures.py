@@ -1,8 +1,20 @@
+import asyncio
+import base64
+import os
+from collections import Counter
+
 import aiohttp
+import pytest
 import pytest_asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from yarl import URL
 
 from aiothornode.connector import ThorConnector
-from aiothornode.env import MAINNET, STAGENET
+from aiothornode.nodeclient import ThorNodeClient
+from aiothornode.env import MAINNET, STAGENET, ThorEnvironment
+from aiothornode.transport import ThorRecordStore, RecordingTransport, ReplayTransport, AiohttpTransport
+from aiothornode.types import *
 
 
 @pytest_asyncio.fixture
@@ -12,13 +24,105 @@ async def session():
     await session.close()
 
 
+# THOR_TRANSPORT=record saves live responses to THOR_RECORDINGS/<network>, THOR_TRANSPORT=replay serves them offline
+TRANSPORT_MODE = os.environ.get('THOR_TRANSPORT', 'live')
+RECORDINGS_DIR = os.environ.get('THOR_RECORDINGS', os.path.join(os.path.dirname(__file__), 'recordings'))
+
+
+def make_transport(session, network):
+    if TRANSPORT_MODE == 'record':
+        return RecordingTransport(AiohttpTransport(session), ThorRecordStore(os.path.join(RECORDINGS_DIR, network)))
+    elif TRANSPORT_MODE == 'replay':
+        return ReplayTransport(ThorRecordStore(os.path.join(RECORDINGS_DIR, network)))
+
+
 @pytest_asyncio.fixture
 async def mainnet_connector(session):
-    con = ThorConnector(MAINNET, session)
+    con = ThorConnector(MAINNET, session, transport=make_transport(session, 'mainnet'))
     return con
 
 
 @pytest_asyncio.fixture
 async def stagenet_connector(session):
-    con = ThorConnector(STAGENET, session)
+    con = ThorConnector(STAGENET, session, transport=make_transport(session, 'stagenet'))
     return con
+
+
+def b64(s: str):
+    return base64.b64encode(s.encode()).decode()
+
+
+def make_event(event_type, **attributes):
+    return {
+        'type': event_type,
+        'attributes': [{'key': b64(k), 'value': b64(v), 'index': True} for k, v in attributes.items()]
+    }
+
+
+class FakeThorNode:
+    """
+    Local stand-in for THORNode and Tendermint RPC. RPC paths are served under "/rpc".
+    responses: path with query -> JSON data or (status, JSON data) or (status, JSON data, headers)
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.delays = {}
+        self.hits = Counter()
+        self.server = None
+
+    async def handler(self, request: web.Request):
+        # the client re-quotes URLs, so compare the keys in the same normalized form
+        normalized = {str(URL(k)): k for k in self.responses}
+        path = normalized.get(request.raw_path, request.raw_path)
+        self.hits[path] += 1
+        if delay := self.delays.get(path):
+            await asyncio.sleep(delay)
+        if path not in self.responses:
+            return web.Response(status=404)
+        response = self.responses[path]
+        status, data, *headers = response if isinstance(response, tuple) else (200, response)
+        return web.json_response(data, status=status, headers=headers[0] if headers else None)
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_route('GET', '/{tail:.*}', self.handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        return self
+
+    @property
+    def url(self):
+        return str(self.server.make_url('')).rstrip('/')
+
+    def add_block(self, height, txs=(), time='2021-04-10T06:11:32.123456789Z'):
+        self.responses[f'/rpc/block?height={height}'] = {
+            'result': {
+                'block_id': {'hash': f'HASH{height}'},
+                'block': {
+                    'header': {'height': str(height), 'chain_id': 'thorchain', 'time': time},
+                    'data': {'txs': list(txs)},
+                },
+            }
+        }
+        self.responses[f'/rpc/block_results?height={height}'] = {
+            'result': {'height': str(height), 'txs_results': [], 'end_block_events': []}
+        }
+
+    def set_tip(self, height):
+        self.responses['/rpc/status'] = {'result': {'sync_info': {'latest_block_height': str(height)}}}
+
+    def make_env(self, **kwargs):
+        return ThorEnvironment(thornode_url=self.url, rpc_url=f'{self.url}/rpc', kind='fake', **kwargs)
+
+
+@pytest_asyncio.fixture
+async def fake_node():
+    node = await FakeThorNode().start()
+    yield node
+    await node.server.close()
+
+
+@pytest_asyncio.fixture
+async def fake_connector(fake_node, session):
+    return ThorConnector(fake_node.make_env(), session)
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+
+from aiothornode.archive import ThorPoolArchive
+from .fixtures import *
+
+POOLS = [
+    {'asset': 'BTC.BTC', 'balance_asset': '100', 'balance_rune': '2000'},
+    {'asset': 'ETH.ETH', 'balance_asset': '300', 'balance_rune': '4000'},
+]
+
+
+def test_archive_persistence(tmp_path):
+    file_name = str(tmp_path / 'pools.bin')
+    with ThorPoolArchive(file_name) as archive:
+        assert archive.get_pools(100) is None
+        archive.put_pools(100, POOLS)
+        archive.put_pool(200, POOLS[1])
+        assert archive.get_pools(100) == POOLS
+        assert archive.get_pool('ETH.ETH', 200) == POOLS[1]
+        assert archive.get_pools(200) is None  # only one pool is known there
+
+    with ThorPoolArchive(file_name) as archive:
+        assert archive.heights == [100]
+        assert archive.get_pools(100) == POOLS
+        assert archive.get_pool('BTC.BTC', 100) == POOLS[0]
+        assert archive.get_pool('ETH.ETH', 200) == POOLS[1]
+        archive.put_pools(300, POOLS[::-1])
+        assert archive.get_pools(300) == POOLS[::-1]
+
+
+def test_archive_torn_write(tmp_path):
+    file_name = str(tmp_path / 'pools.bin')
+    with ThorPoolArchive(file_name) as archive:
+        archive.put_pools(100, POOLS)
+        good_size = os.path.getsize(file_name)
+        archive.put_pools(101, POOLS)
+
+    with open(file_name, 'r+b') as f:
+        f.truncate(os.path.getsize(file_name) - 5)  # the last record of height 101 is broken
+
+    with ThorPoolArchive(file_name) as archive:
+        assert archive.heights == [100]
+        assert os.path.getsize(file_name) == good_size
+        archive.put_pools(101, POOLS)
+        assert archive.get_pools(101) == POOLS
+
+    with ThorPoolArchive(file_name) as archive:
+        assert archive.get_pools(101) == POOLS
+
+
+@pytest.mark.asyncio
+async def test_connector_pool_archive(fake_node, session, tmp_path):
+    archive = ThorPoolArchive(str(tmp_path / 'pools.bin'))
+    connector = ThorConnector(fake_node.make_env(), session, pool_archive=archive)
+    fake_node.responses['/thorchain/pools?height=100'] = POOLS
+    fake_node.responses['/thorchain/pool/BTC.BTC?height=200'] = POOLS[0]
+
+    for _ in range(3):
+        assert len(await connector.query_pools(height=100)) == 2
+        assert (await connector.query_pool('BTC.BTC', height=200)).balance_rune == 2000
+    assert (await connector.query_pool('ETH.ETH', height=100)).balance_rune == 4000
+
+    assert fake_node.hits['/thorchain/pools?height=100'] == 1
+    assert fake_node.hits['/thorchain/pool/BTC.BTC?height=200'] == 1
+    assert fake_node.hits['/thorchain/pool/ETH.ETH?height=100'] == 0
+    archive.close()
+
+
+@pytest.mark.asyncio
+async def test_connector_pool_archive_keys(fake_node, session, tmp_path):
+    file_name = str(tmp_path / 'pools.bin')
+    archive = ThorPoolArchive(file_name)
+    connector = ThorConnector(fake_node.make_env(), session, pool_archive=archive)
+    fake_node.responses['/thorchain/pool/btc.btc?height=100'] = POOLS[0]  # the response says "BTC.BTC"
+    fake_node.responses['/thorchain/pools?height=200'] = {'error': 'unexpected'}
+
+    for _ in range(5):
+        assert (await connector.query_pool('btc.btc', height=100)).balance_rune == 2000
+    assert fake_node.hits['/thorchain/pool/btc.btc?height=100'] == 1
+    size = os.path.getsize(file_name)
+    assert archive.get_pool('BTC.BTC', 100) == POOLS[0]
+
+    assert not archive.has_snapshot(200)
+    await connector._request_pools_archived('/thorchain/pools?height=200', 200)
+    assert not archive.has_snapshot(200)
+    assert os.path.getsize(file_name) == size
+    archive.close()
@@ -0,0 +1,35 @@
+import base64
+
+from dateutil.parser import parse as date_parser
+
+from aiothornode.types import ThorBlock, parse_rfc3339
+
+TXS = [base64.b64encode(f'tx-{i}'.encode()).decode() for i in range(5)]
+
+BLOCK = {
+    'result': {
+        'block_id': {'hash': 'ABCDEF'},
+        'block': {
+            'header': {'height': '1568824', 'chain_id': 'thorchain', 'time': '2021-07-16T09:27:04.712403713Z'},
+            'data': {'txs': TXS},
+        },
+    }
+}
+
+
+def test_parse_rfc3339():
+    for s in ('2021-07-16T09:27:04.712403713Z', '2021-07-16T09:27:04.7Z', '2021-07-16T09:27:04Z',
+              '2021-07-16T09:27:04.712403Z', '2021-07-16T12:27:04.7124+03:00'):
+        assert parse_rfc3339(s) == date_parser(s), s
+    assert parse_rfc3339('2021-07-16T09:27:04.712403713Z').microsecond == 712403
+
+
+def test_block_from_json():
+    block = ThorBlock.from_json(BLOCK)
+    assert block.height == 1568824
+    assert block.time == date_parser('2021-07-16T09:27:04.712403713Z')
+    assert block.txs_hashes == ['0x' + ThorBlock.decode_tx_hash(tx) for tx in TXS]
+
+    block = ThorBlock.from_json(BLOCK, with_hashes=False)
+    assert block.txs_hashes is None
+    assert block.hash == 'ABCDEF'
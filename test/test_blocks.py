@@ -0,0 +1,59 @@
+import pytest
+
+from aiothornode.bulk import ordered_prefetch
+from .fixtures import *
+
+
+@pytest.mark.asyncio
+async def test_ordered_prefetch():
+    started = []
+
+    async def fetch(x):
+        started.append(x)
+        await asyncio.sleep(0.01 * (5 - x % 5))
+        return x
+
+    results = []
+    async for x, r in ordered_prefetch(range(12), fetch, window=3):
+        assert len(started) <= x + 3  # no more than window items ahead
+        results.append(r)
+    assert results == list(range(12))
+
+
+@pytest.mark.asyncio
+async def test_iter_blocks_range(fake_node, fake_connector: ThorConnector):
+    for h in range(100, 120):
+        fake_node.add_block(h)
+
+    blocks = [b async for b in fake_connector.iter_blocks(100, 119, window=5)]
+    assert [b.height for b in blocks] == list(range(100, 120))
+    assert blocks[0].hash == 'HASH100'
+
+    pairs = [p async for p in fake_connector.iter_blocks(110, 112, with_results=True)]
+    assert [(b.height, int(r['result']['height'])) for b, r in pairs] == [(110, 110), (111, 111), (112, 112)]
+
+
+@pytest.mark.asyncio
+async def test_iter_blocks_missing(fake_node, fake_connector: ThorConnector):
+    fake_node.add_block(1)
+    with pytest.raises(ConnectionError):
+        _ = [b async for b in fake_connector.iter_blocks(1, 2)]
+
+
+@pytest.mark.asyncio
+async def test_iter_blocks_follow(fake_node, fake_connector: ThorConnector):
+    for h in range(1, 6):
+        fake_node.add_block(h)
+    fake_node.set_tip(3)
+
+    heights = []
+    async for block in fake_connector.iter_blocks(1, follow=True, poll_interval=0.01):
+        heights.append(block.height)
+        if block.height == 3:
+            fake_node.set_tip(5)
+        if block.height == 5:
+            break
+    assert heights == [1, 2, 3, 4, 5]
+
+    fake_node.set_tip(4)
+    assert [b.height async for b in fake_connector.iter_blocks(3)] == [3, 4]
@@ -0,0 +1,94 @@
+import gc
+import time
+
+import pytest
+
+from aiothornode.bulk import bounded_as_completed, ordered_prefetch
+from aiothornode.ratelimit import ThorRateLimiter
+from .fixtures import *
+
+
+@pytest.mark.asyncio
+async def test_bounded_as_completed_concurrency():
+    running, max_running = 0, 0
+
+    async def fetch(x):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01 * (x % 3))
+        running -= 1
+        return x * 2
+
+    results = {x: r async for x, r in bounded_as_completed(range(20), fetch, concurrency=4)}
+    assert results == {x: x * 2 for x in range(20)}
+    assert max_running == 4
+
+
+@pytest.mark.asyncio
+async def test_ordered_prefetch_retrieves_failed_tasks():
+    loop = asyncio.get_running_loop()
+    unhandled = []
+    old_handler = loop.get_exception_handler()
+    loop.set_exception_handler(lambda _, context: unhandled.append(context))
+
+    async def fetch(x):
+        if not x:
+            return x
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            raise ConnectionError(f'Failed #{x} while cancelling')
+
+    try:
+        stream = ordered_prefetch(range(5), fetch, window=5)
+        async for x, _ in stream:
+            assert x == 0
+            break
+        await stream.aclose()
+        del stream
+        gc.collect()
+        await asyncio.sleep(0)
+        assert not unhandled
+    finally:
+        loop.set_exception_handler(old_handler)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter():
+    limiter = ThorRateLimiter(rate=50, burst=5)
+    started_at = time.monotonic()
+    for _ in range(10):
+        await limiter.acquire()
+    # 5 tokens at once, then 5 more at 50/sec
+    assert 0.08 <= time.monotonic() - started_at < 0.5
+
+
+@pytest.mark.asyncio
+async def test_query_pool_many(fake_node, fake_connector: ThorConnector):
+    for asset in ('BTC.BTC', 'ETH.ETH'):
+        for height in (100, 200):
+            fake_node.responses[f'/thorchain/pool/{asset}?height={height}'] = {
+                'asset': asset, 'balance_asset': str(height), 'balance_rune': '1'
+            }
+
+    results = {}
+    async for key, pool in fake_connector.query_pool_many(['BTC.BTC', 'ETH.ETH'], [100, 200], concurrency=2):
+        results[key] = pool
+    assert len(results) == 4
+    assert results[('ETH.ETH', 200)].balance_asset == 200
+
+
+@pytest.mark.asyncio
+async def test_query_liquidity_provider_many(fake_node, fake_connector: ThorConnector):
+    addresses = [f'thor1addr{i}' for i in range(10)]
+    for i, address in enumerate(addresses[:-1]):
+        fake_node.responses[f'/thorchain/pool/BTC.BTC/liquidity_provider/{address}?height=0'] = {
+            'asset': 'BTC.BTC', 'rune_address': address, 'units': str(i + 1)
+        }
+
+    results = {}
+    async for address, lp in fake_connector.query_liquidity_provider_many('BTC.BTC', addresses, rate_limit=100):
+        results[address] = lp
+    assert results['thor1addr3'].units == 4
+    assert results['thor1addr9'] is None
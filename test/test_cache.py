@@ -0,0 +1,95 @@
+import pytest
+
+from aiothornode.cache import ThorMemoryCache, ThorDiskCache, pinned_height
+from .fixtures import *
+
+POOL_BTC = {'asset': 'BTC.BTC', 'balance_asset': '100', 'balance_rune': '200', 'status': 'Available'}
+
+
+def test_pinned_height():
+    assert pinned_height('/thorchain/pools?height=1000') == 1000
+    assert pinned_height('/thorchain/pool/BTC.BTC/liquidity_providers?height=0') == 0
+    assert pinned_height('/thorchain/pools') == 0
+    assert pinned_height('/block?height=42') == 42
+
+
+def test_memory_cache_lru():
+    cache = ThorMemoryCache(max_bytes=100)
+    cache.set('a', 'x' * 40)
+    cache.set('b', 'y' * 40)
+    assert cache.get('a')  # now "b" is the oldest
+    cache.set('c', 'z' * 40)
+    assert cache.get('b') is None
+    assert cache.get('a') and cache.get('c')
+    assert cache.total_bytes <= 100
+
+    cache.set('d', 'w', ttl=-1.0)
+    assert cache.get('d') is None
+
+
+def test_disk_cache(tmp_path):
+    cache = ThorDiskCache(str(tmp_path))
+    cache.set('node:/thorchain/pools?height=1', [POOL_BTC])
+    assert ThorDiskCache(str(tmp_path)).get('node:/thorchain/pools?height=1') == [POOL_BTC]
+
+    cache.set('expired', 1, ttl=-1.0)
+    assert cache.get('expired') is None
+    assert cache.get('unknown') is None
+
+
+@pytest.mark.asyncio
+async def test_connector_cache(fake_node, session):
+    connector = ThorConnector(fake_node.make_env(), session, cache=ThorMemoryCache())
+    fake_node.responses['/thorchain/pools?height=100'] = [POOL_BTC]
+    fake_node.responses['/thorchain/pools'] = [POOL_BTC]
+
+    for _ in range(3):
+        pools = await connector.query_pools(height=100)
+        assert pools[0].asset == 'BTC.BTC'
+        await connector.query_pools()
+
+    assert fake_node.hits['/thorchain/pools?height=100'] == 1
+    assert fake_node.hits['/thorchain/pools'] == 3  # cache_latest_ttl is 0
+
+    connector.cache_latest_ttl = 60.0
+    await connector.query_pools()
+    await connector.query_pools()
+    assert fake_node.hits['/thorchain/pools'] == 4
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_returns_copies(fake_node, session):
+    connector = ThorConnector(fake_node.make_env(), session, cache=ThorMemoryCache())
+    fake_node.add_block(5)
+    first = await connector.query_tendermint_block_raw(5)
+    first['result']['block']['header']['height'] = 'garbage'
+
+    second = await connector.query_tendermint_block_raw(5)
+    assert second['result']['block']['header']['height'] == '5'
+    assert fake_node.hits['/rpc/block?height=5'] == 1
+
+@pytest.mark.asyncio
+async def test_connector_cache_skips_errors(fake_node, session):
+    connector = ThorConnector(fake_node.make_env(), session, cache=ThorMemoryCache())
+    fake_node.responses['/rpc/block?height=5'] = (500, {'error': 'height 5 must be less than or equal to 4'})
+    assert await connector.query_tendermint_block_raw(5) is None
+
+    fake_node.add_block(5)
+    block = await connector.query_block(5)
+    assert block.height == 5
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_between_networks(fake_node, session):
+    other_node = await FakeThorNode().start()
+    try:
+        fake_node.responses['/thorchain/pools?height=100'] = [POOL_BTC]
+        other_node.responses['/thorchain/pools?height=100'] = [dict(POOL_BTC, balance_rune='999')]
+        cache = ThorMemoryCache()
+        first = ThorConnector(fake_node.make_env(), session, cache=cache)
+        second = ThorConnector(other_node.make_env(), session, cache=cache)
+
+        assert (await first.query_pools(100))[0].balance_rune == 200
+        assert (await second.query_pools(100))[0].balance_rune == 999
+    finally:
+        await other_node.server.close()
@@ -0,0 +1,41 @@
+import pytest
+
+from .fixtures import *
+
+
+@pytest.mark.asyncio
+async def test_coalesce_identical_requests(fake_node, fake_connector: ThorConnector):
+    fake_node.responses['/thorchain/mimir'] = {'HALTBTCCHAIN': 0, 'MINIMUMBONDINRUNE': 30000000000000}
+    fake_node.delays['/thorchain/mimir'] = 0.1
+
+    results = await asyncio.gather(*[fake_connector.query_mimir() for _ in range(20)])
+    assert fake_node.hits['/thorchain/mimir'] == 1
+    assert all(m['MINIMUMBONDINRUNE'] == 30000000000000 for m in results)
+    assert not fake_connector._in_flight
+
+    # not concurrent => not coalesced
+    await fake_connector.query_mimir()
+    assert fake_node.hits['/thorchain/mimir'] == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesce_cancelled_caller(fake_node, fake_connector: ThorConnector):
+    fake_node.responses['/thorchain/queue'] = {'swap': 5, 'outbound': 2}
+    fake_node.delays['/thorchain/queue'] = 0.1
+
+    first = asyncio.create_task(fake_connector.query_queue())
+    second = asyncio.create_task(fake_connector.query_queue())
+    await asyncio.sleep(0.02)
+    first.cancel()
+
+    queue = await second
+    assert queue.swap == 5
+    assert fake_node.hits['/thorchain/queue'] == 1
+
+
+@pytest.mark.asyncio
+async def test_coalesce_disabled(fake_node, session):
+    connector = ThorConnector(fake_node.make_env(), session, coalesce_requests=False)
+    fake_node.responses['/thorchain/queue'] = {'swap': 5}
+    await asyncio.gather(*[connector.query_queue() for _ in range(3)])
+    assert fake_node.hits['/thorchain/queue'] == 3
@@ -0,0 +1,63 @@
+import pytest
+
+from .fixtures import *
+
+np = pytest.importorskip('numpy')
+
+from aiothornode.columnar import PoolTable, NodeTable  # noqa: E402
+from aiothornode.types import ThorPool, ThorNodeAccount  # noqa: E402
+from benchmarks.payloads import synthetic_payloads  # noqa: E402
+
+POOLS = [
+    {'asset': 'BTC.BTC', 'status': 'Available', 'balance_asset': '100', 'balance_rune': '2000000'},
+    {'asset': 'ETH.ETH', 'status': 'Available', 'balance_asset': '1000', 'balance_rune': '1500000',
+     'synth_mint_paused': True, 'error': 'synth mint paused'},
+    {'asset': 'DOGE.DOGE', 'status': 'Staged', 'balance_asset': '0', 'balance_rune': '0'},
+]
+
+NODES = [
+    {'node_address': 'thor1a', 'status': 'Active', 'total_bond': '300'},
+    {'node_address': 'thor1b', 'status': 'Active', 'bond': '200'},
+    {'node_address': 'thor1c', 'status': 'Standby', 'total_bond': '50', 'requested_to_leave': True},
+]
+
+
+def test_pool_table():
+    table = PoolTable.from_json(POOLS)
+    assert len(table) == 3
+    assert table.balance_rune.dtype == np.int64
+    assert table.runes_per_asset[:2].tolist() == [20000.0, 1500.0]
+    assert np.isnan(table.assets_per_rune[2])
+    assert table.index_of('ETH.ETH') == 1
+
+    available = table.filter_by_status(ThorPool.STATUS_AVAILABLE)
+    assert list(available.asset) == ['BTC.BTC', 'ETH.ETH']
+    assert available.to_pools() == [ThorPool.from_json(p) for p in POOLS[:2]]
+
+
+def test_node_table():
+    table = NodeTable.from_json(NODES)
+    assert table.total_bond() == 550
+    assert table.total_bond('active') == 500
+    assert list(table.active.node_address) == ['thor1a', 'thor1b']
+    assert table.requested_to_leave.tolist() == [False, False, True]
+    assert len(NodeTable.from_json([])) == 0
+
+
+def test_tables_match_models():
+    payloads = synthetic_payloads()
+    pools = PoolTable.from_json(payloads['pools'] + POOLS)
+    assert pools.to_pools() == [ThorPool.from_json(j) for j in payloads['pools'] + POOLS]
+
+    nodes = NodeTable.from_json(payloads['nodes'] + NODES)
+    eager = [ThorNodeAccount.from_json(j) for j in payloads['nodes'] + NODES]
+    for name, *_ in NodeTable.COLUMNS:
+        assert getattr(nodes, name).tolist() == [getattr(node, name) for node in eager], name
+
+
+@pytest.mark.asyncio
+async def test_query_tables(fake_node, fake_connector: ThorConnector):
+    fake_node.responses['/thorchain/pools?height=5'] = POOLS
+    fake_node.responses['/thorchain/nodes'] = NODES
+    assert len(await fake_connector.query_pool_table(height=5)) == 3
+    assert (await fake_connector.query_node_table()).total_bond() == 550
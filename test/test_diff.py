@@ -0,0 +1,57 @@
+from aiothornode.diff import diff_mimir, diff_nodes, diff_pools, ThorSnapshotDiffer, fingerprint, ThorFieldChange
+from aiothornode.lazy import LazyThorNodeAccount
+from aiothornode.types import ThorMimir, ThorNodeAccount, ThorPool
+
+
+def test_diff_mimir():
+    old = ThorMimir.from_json({'A': 1, 'B': 2, 'C': 3})
+    new = ThorMimir.from_json({'A': 1, 'B': 20, 'D': 4})
+    d = diff_mimir(old, new)
+    assert d.added == {'D': 4}
+    assert d.removed == {'C': 3}
+    assert d.changed == {'B': [ThorFieldChange('B', 2, 20)]}
+    assert not diff_mimir(old, old)
+
+
+def test_diff_nodes():
+    a = ThorNodeAccount(node_address='thor1a', status='Active', bond=100)
+    b = ThorNodeAccount(node_address='thor1b', status='Standby', bond=50)
+    c = ThorNodeAccount(node_address='thor1c', status='Active', bond=70)
+    d = diff_nodes([a, b], [a._replace(bond=110), c])
+    assert list(d.added) == ['thor1c']
+    assert list(d.removed) == ['thor1b']
+    assert d.changed == {'thor1a': [ThorFieldChange('bond', 100, 110)]}
+
+
+def test_differ_skips_unchanged():
+    calls = []
+
+    def differ(old, new):
+        calls.append(1)
+        return diff_pools(old, new)
+
+    pools = [ThorPool(asset='BTC.BTC', balance_rune=1), ThorPool(asset='ETH.ETH', balance_rune=2)]
+    differ_obj = ThorSnapshotDiffer(differ)
+    first = differ_obj.update(pools)
+    assert set(first.added) == {'BTC.BTC', 'ETH.ETH'}
+    assert differ_obj.update(list(pools)) is None
+    assert len(calls) == 1
+
+    changed = differ_obj.update([pools[0]._replace(balance_rune=5), pools[1]])
+    assert list(changed.changed) == ['BTC.BTC']
+    assert fingerprint(ThorMimir.from_json({'A': 1, 'B': 2})) == fingerprint(ThorMimir.from_json({'B': 2, 'A': 1}))
+
+
+def test_differ_lazy_nodes():
+    raw = [{'node_address': 'thor1a', 'total_bond': '100'}, {'node_address': 'thor1b', 'total_bond': '50'}]
+    differ = ThorSnapshotDiffer(diff_nodes)
+    first = differ.update(LazyThorNodeAccount.from_json_array(raw))
+    assert set(first.added) == {'thor1a', 'thor1b'}
+    assert differ.update(LazyThorNodeAccount.from_json_array(raw)) is None
+
+    raw[0] = {'node_address': 'thor1a', 'total_bond': '110'}
+    changed = differ.update(LazyThorNodeAccount.from_json_array(raw))
+    assert changed.changed == {'thor1a': [ThorFieldChange('bond', 100, 110)]}
+
+    assert fingerprint(LazyThorNodeAccount.from_json_array(raw)) == fingerprint(raw)
+    assert fingerprint(b'[1,2]') != fingerprint(b'[1,3]')
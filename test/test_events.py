@@ -0,0 +1,54 @@
+import pytest
+
+from aiothornode.events import iter_block_events, ThorEventSwap, ThorEventGeneric, END_BLOCK, ThorBlockResults
+from .fixtures import *
+
+BLOCK_RESULTS = {
+    'result': {
+        'height': '7000000',
+        'txs_results': [
+            {'code': 0, 'events': [
+                make_event('message', action='deposit'),
+                make_event('add_liquidity', pool='BTC.BTC', liquidity_provider_units='500', rune_amount='0',
+                           asset_amount='1000', asset_address='bc1q', BTC_txid='AABB'),
+            ]},
+        ],
+        'end_block_events': [
+            make_event('swap', pool='BTC.BTC', swap_target='0', swap_slip='12', liquidity_fee='345',
+                       liquidity_fee_in_rune='6789', emit_asset='1000000 THOR.RUNE', id='TX1', chain='BTC',
+                       coin='5000 BTC.BTC', memo='=:r:thor1abc'),
+            make_event('outbound', in_tx_id='TX1', id='0000', chain='THOR', coin='1000000 THOR.RUNE',
+                       to='thor1abc'),
+            make_event('fee', tx_id='TX1', coins='2000000 THOR.RUNE', pool_deduct='0'),
+        ],
+    }
+}
+
+
+def test_iter_block_events():
+    events = list(iter_block_events(BLOCK_RESULTS))
+    assert [e.type for e in events] == ['message', 'add_liquidity', 'swap', 'outbound', 'fee']
+    assert isinstance(events[0], ThorEventGeneric)
+    assert events[1].asset_tx_id == 'AABB' and events[1].liquidity_provider_units == 500
+
+    swap: ThorEventSwap = events[2]
+    assert swap.tx_index == END_BLOCK and swap.height == 7000000
+    assert swap.coin.amount == 5000 and swap.coin.asset == 'BTC.BTC'
+    assert swap.emit_asset.asset == 'THOR.RUNE'
+    assert swap.liquidity_fee_in_rune == 6789
+    assert events[4].coins[0].amount == 2000000
+
+
+def test_skip_event_types():
+    events = list(iter_block_events(BLOCK_RESULTS, event_types=['swap', 'outbound']))
+    assert [e.type for e in events] == ['swap', 'outbound']
+    results = ThorBlockResults.from_json(BLOCK_RESULTS)
+    assert len(results.swaps) == 1 and len(results.outbounds) == 1
+
+
+@pytest.mark.asyncio
+async def test_query_block_results(fake_node, fake_connector: ThorConnector):
+    fake_node.responses['/rpc/block_results?height=7000000'] = BLOCK_RESULTS
+    results = await fake_connector.query_block_results(7000000, event_types={'swap'})
+    assert results.height == 7000000
+    assert [e.tx_id for e in results.swaps] == ['TX1']
@@ -0,0 +1,96 @@
+import pytest
+
+from aiothornode.health import ThorClientStats
+from .fixtures import *
+
+
+def test_circuit_breaker():
+    stats = ThorClientStats(failure_threshold=3, cooldown=10.0)
+    assert stats.state == stats.STATE_CLOSED
+    for _ in range(3):
+        stats.record_failure(TimeoutError())
+    assert stats.state == stats.STATE_OPEN
+    assert not stats.is_available
+    assert stats.last_error == 'TimeoutError'
+
+    stats.opened_at -= 10.0  # cooldown is over
+    assert stats.state == stats.STATE_HALF_OPEN and stats.is_available
+
+    stats.record_failure()  # probe failed
+    assert stats.state == stats.STATE_OPEN
+    assert stats.cooldown == 20.0
+
+    stats.opened_at -= 20.0
+    stats.record_success(0.1)  # probe succeeded
+    assert stats.state == stats.STATE_CLOSED
+    assert stats.cooldown == 10.0
+    assert stats.as_dict()['total_errors'] == 4
+
+
+def test_error_rate_opens_circuit():
+    stats = ThorClientStats(failure_threshold=100, max_error_rate=0.5)
+    for _ in range(6):
+        stats.record_success(0.1)
+        stats.record_failure()
+    stats.record_failure()
+    assert stats.error_rate > 0.5
+    assert stats.state == stats.STATE_OPEN
+
+
+@pytest.mark.asyncio
+async def test_smart_routing_skips_dead_primary(fake_node, session):
+    dead_env = ThorEnvironment(thornode_url='http://127.0.0.1:1', rpc_url='http://127.0.0.1:1', timeout=1.0)
+    connector = ThorConnector(dead_env, session, additional_envs=fake_node.make_env(), smart_routing=True)
+    fake_node.responses['/thorchain/queue'] = {'swap': 7}
+
+    for _ in range(5):
+        assert (await connector.query_queue()).swap == 7
+
+    stats = connector.client_stats()
+    assert stats['http://127.0.0.1:1']['state'] == ThorClientStats.STATE_OPEN
+    assert stats['http://127.0.0.1:1']['total_requests'] == 3  # skipped after the circuit opened
+    assert stats[fake_node.url]['total_requests'] == 5
+    assert stats[fake_node.url]['latency_ewma'] > 0
+
+
+@pytest.mark.asyncio
+async def test_smart_routing_prefers_fast_client(fake_node, session):
+    fast_node = await FakeThorNode().start()
+    try:
+        for node in (fake_node, fast_node):
+            node.responses['/thorchain/queue'] = {'swap': 1}
+        fake_node.delays['/thorchain/queue'] = 0.05
+        connector = ThorConnector(fake_node.make_env(), session, additional_envs=fast_node.make_env(),
+                                  smart_routing=True)
+        connector._clients[0].stats.record_success(0.05)
+        connector._clients[1].stats.record_success(0.001)
+
+        await connector.query_queue()
+        assert fast_node.hits['/thorchain/queue'] == 1
+        assert fake_node.hits['/thorchain/queue'] == 0
+    finally:
+        await fast_node.server.close()
+
+
+@pytest.mark.asyncio
+async def test_smart_routing_dead_rpc_keeps_thornode(fake_node, session):
+    backup_node = await FakeThorNode().start()
+    try:
+        primary_env = ThorEnvironment(thornode_url=fake_node.url, rpc_url='http://127.0.0.1:1', timeout=1.0)
+        connector = ThorConnector(primary_env, session, additional_envs=backup_node.make_env(), smart_routing=True)
+        backup_node.set_tip(10)
+        for node in (fake_node, backup_node):
+            node.responses['/thorchain/queue'] = {'swap': 3}
+
+        for _ in range(3):
+            assert await connector.query_latest_block_height() == 10
+
+        stats = connector.client_stats()
+        assert stats['http://127.0.0.1:1']['state'] == ThorClientStats.STATE_OPEN
+        assert stats[fake_node.url]['state'] == ThorClientStats.STATE_CLOSED
+
+        assert (await connector.query_queue()).swap == 3
+        assert fake_node.hits['/thorchain/queue'] == 1  # the primary THORNode is still used
+        assert backup_node.hits['/thorchain/queue'] == 0
+    finally:
+        await backup_node.server.close()
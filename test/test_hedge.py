@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from .fixtures import *
+
+
+@pytest.mark.asyncio
+async def test_hedged_request(fake_node, session):
+    backup_node = await FakeThorNode().start()
+    try:
+        for node, swap in ((fake_node, 1), (backup_node, 2)):
+            node.responses['/thorchain/queue'] = {'swap': swap}
+        fake_node.delays['/thorchain/queue'] = 2.0
+
+        connector = ThorConnector(fake_node.make_env(), session, additional_envs=backup_node.make_env(),
+                                  hedge_percentile=95, hedge_delay=0.05)
+
+        started_at = time.monotonic()
+        queue = await connector.query_queue()
+        assert time.monotonic() - started_at < 1.0
+        assert queue.swap == 2  # the backup answered first
+        assert fake_node.hits['/thorchain/queue'] == 1
+
+        # fast primary: no hedging
+        fake_node.delays.clear()
+        queue = await connector.query_queue()
+        assert queue.swap == 1
+        assert backup_node.hits['/thorchain/queue'] == 1
+    finally:
+        await backup_node.server.close()
+
+
+@pytest.mark.asyncio
+async def test_hedged_failover(fake_node, session):
+    backup_node = await FakeThorNode().start()
+    try:
+        backup_node.responses['/thorchain/queue'] = {'swap': 2}  # primary has 404
+        connector = ThorConnector(fake_node.make_env(), session, additional_envs=backup_node.make_env(),
+                                  hedge_percentile=95, hedge_delay=10.0)
+        queue = await connector.query_queue()
+        assert queue.swap == 2
+    finally:
+        await backup_node.server.close()
+
+
+def test_latency_percentile():
+    stats = ThorNodeClient(None, ThorEnvironment()).stats
+    assert stats.latency_percentile(95) is None
+    for i in range(1, 101):
+        stats.record_success(i / 100)
+    assert stats.latency_percentile(50) == pytest.approx(0.5, abs=0.02)
+    assert stats.latency_percentile(95) == pytest.approx(0.95, abs=0.02)
+
+
+def test_hedge_delay_per_url():
+    connector = ThorConnector(ThorEnvironment(thornode_url='http://thornode', rpc_url='http://rpc'), None,
+                              hedge_percentile=50, hedge_delay=1.0)
+    client = connector._clients[0]
+    for _ in range(20):
+        client.stats_of(True).record_success(0.01)
+    assert connector._hedge_delay(client, is_rpc=True) == pytest.approx(0.01)
+    assert connector._hedge_delay(client) == 1.0  # no THORNode samples yet
+    for _ in range(20):
+        client.stats.record_success(0.3)
+    assert connector._hedge_delay(client) == pytest.approx(0.3)
@@ -0,0 +1,24 @@
+import pytest
+
+from aiothornode.jsonlib import ujson_loads, json_loads
+from .fixtures import *
+
+
+def test_decode_bytes():
+    raw = '{"asset": "BTC.BTC", "memo": "é"}'.encode('utf-8')
+    assert ujson_loads(raw) == json_loads(raw) == {'asset': 'BTC.BTC', 'memo': 'é'}
+
+
+@pytest.mark.asyncio
+async def test_custom_json_loads(fake_node, session):
+    calls = []
+
+    def my_loads(raw):
+        assert isinstance(raw, bytes)
+        calls.append(len(raw))
+        return ujson_loads(raw)
+
+    connector = ThorConnector(fake_node.make_env(), session, json_loads=my_loads)
+    fake_node.responses['/thorchain/queue'] = {'swap': 3}
+    assert (await connector.query_queue()).swap == 3
+    assert len(calls) == 1
@@ -0,0 +1,63 @@
+import pytest
+
+from aiothornode.lazy import LazyThorNodeAccount, LazyThorVault
+from benchmarks.payloads import synthetic_payloads
+from aiothornode.types import ThorNodeAccount, ThorVault
+from .fixtures import *
+
+NODE = {
+    'node_address': 'thor1node', 'status': 'Active', 'total_bond': '500', 'ip_address': '1.2.3.4',
+    'node_operator_address': 'thor1op', 'preflight_status': {'status': 'Ready', 'reason': 'OK', 'code': 0},
+}
+
+VAULT = {
+    'block_height': '10', 'pub_key': 'thorpub1', 'status': 'ActiveVault', 'type': 'AsgardVault',
+    'coins': [{'asset': 'BTC.BTC', 'amount': '100', 'decimals': 8}],
+    'addresses': [{'chain': 'BTC', 'address': 'bc1q'}],
+}
+
+
+def test_lazy_node_account():
+    node = LazyThorNodeAccount(NODE)
+    assert 'bond' not in vars(node)
+    assert node.bond == 500
+    assert 'bond' in vars(node)  # cached
+    assert node.bond_address == 'thor1op'
+    assert node.is_good
+    assert node.preflight_status_reason_and_code == ('ready', 'OK', 0)
+    assert node == ThorNodeAccount.from_json(NODE)
+    assert node._asdict() == ThorNodeAccount.from_json(NODE)._asdict()
+    with pytest.raises(AttributeError):
+        _ = node.foo
+
+    assert list(LazyThorNodeAccount.CONVERTERS) == list(ThorNodeAccount._fields)
+
+
+def test_lazy_vault():
+    vault = LazyThorVault(VAULT)
+    assert vault.is_active
+    assert vault.coins[0].amount == 100
+    assert vault.addresses[0].address == 'bc1q'
+    assert vault.materialize() == ThorVault.from_json(VAULT)
+    assert list(LazyThorVault.CONVERTERS) == list(ThorVault._fields)
+
+
+@pytest.mark.parametrize('name, model, lazy_model', [
+    ('nodes', ThorNodeAccount, LazyThorNodeAccount),
+    ('vaults', ThorVault, LazyThorVault),
+])
+def test_lazy_values_match_eager(name, model, lazy_model):
+    for j in synthetic_payloads()[name]:
+        eager, lazy = model.from_json(j), lazy_model(j)
+        assert lazy._asdict() == eager._asdict()  # field by field, through the lazy converters
+        assert lazy.materialize() == eager
+
+
+@pytest.mark.asyncio
+async def test_query_lazy(fake_node, fake_connector: ThorConnector):
+    fake_node.responses['/thorchain/nodes'] = [NODE, NODE]
+    fake_node.responses['/thorchain/vaults/asgard'] = [VAULT]
+    nodes = await fake_connector.query_node_accounts(lazy=True)
+    assert [n.bond for n in nodes] == [500, 500]
+    vaults = await fake_connector.query_vault(lazy=True)
+    assert vaults[0].status == ThorVault.STATUS_ACTIVE_VAULT
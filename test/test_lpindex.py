@@ -0,0 +1,92 @@
+import pytest
+
+from aiothornode.lpindex import ThorLPIndex, lp_key
+from .fixtures import *
+
+PATH = '/thorchain/pool/BTC.BTC/liquidity_providers?height=0'
+
+
+def lp_json(rune_address, units, add_height, asset_address='', withdraw_height=0, rune_deposit=0, asset_deposit=0):
+    return {
+        'asset': 'BTC.BTC', 'rune_address': rune_address, 'asset_address': asset_address,
+        'last_add_height': add_height, 'last_withdraw_height': withdraw_height, 'units': str(units),
+        'pending_rune': '0', 'pending_asset': '0',
+        'rune_deposit_value': str(rune_deposit), 'asset_deposit_value': str(asset_deposit),
+    }
+
+
+@pytest.mark.asyncio
+async def test_lp_index_incremental(fake_node, fake_connector):
+    fake_node.responses[PATH] = [
+        lp_json('thor1a', 100, 10, asset_address='bc1a', rune_deposit=1000, asset_deposit=10),
+        lp_json('thor1b', 200, 20, rune_deposit=2000, asset_deposit=20),
+        lp_json('', 50, 30, asset_address='bc1c', asset_deposit=5),
+    ]
+    index = ThorLPIndex(fake_connector, ['BTC.BTC'])
+    delta, = await index.refresh_all()
+    assert len(delta.added) == 3 and not delta.updated and not delta.removed
+    assert len(index) == 3
+    assert index.total_units('BTC.BTC') == 350
+    assert index.get('BTC.BTC', 'bc1a') is index.get('BTC.BTC', 'thor1a')
+    assert index.deposit_values('thor1a') == (1000, {'BTC.BTC': 10})
+    unchanged = index.get('BTC.BTC', 'thor1b')
+
+    fake_node.responses[PATH] = [
+        lp_json('thor1a', 150, 40, asset_address='bc1a', rune_deposit=1500, asset_deposit=15),
+        lp_json('thor1b', 200, 20, rune_deposit=2000, asset_deposit=20),
+        lp_json('thor1d', 10, 41),
+    ]
+    delta = await index.refresh('BTC.BTC')
+    assert [lp.rune_address for lp in delta.added] == ['thor1d']
+    assert [(old.units, new.units) for old, new in delta.updated] == [(100, 150)]
+    assert [lp_key(lp) for lp in delta.removed] == ['bc1c']
+    assert index.get('BTC.BTC', 'thor1b') is unchanged  # not parsed again
+    assert index.get('BTC.BTC', 'bc1c') is None and index.positions('bc1c') == []
+    assert index.total_units('BTC.BTC') == 360
+    assert index.totals['BTC.BTC'].providers == 3
+
+    assert not await index.refresh('BTC.BTC')  # nothing has changed
+
+    del fake_node.responses[PATH]
+    assert await index.refresh('BTC.BTC') is None  # failed fetch keeps the index
+    assert len(index) == 3
+
+
+@pytest.mark.asyncio
+async def test_lp_index_refresh_address(fake_node, fake_connector):
+    fake_node.responses[PATH] = [lp_json('thor1a', 100, 10)]
+    index = ThorLPIndex(fake_connector)
+    await index.refresh('BTC.BTC')
+
+    fake_node.responses['/thorchain/pool/BTC.BTC/liquidity_provider/thor1a?height=0'] = lp_json('thor1a', 300, 50)
+    delta = await index.refresh_address('BTC.BTC', 'thor1a')
+    assert [(old.units, new.units) for old, new in delta.updated] == [(100, 300)]
+    assert index.total_units('BTC.BTC') == 300
+
+    fake_node.responses[PATH] = [lp_json('thor1a', 300, 50)]
+    refreshed = index.get('BTC.BTC', 'thor1a')
+    assert not await index.refresh('BTC.BTC')  # the same position as refresh_address has loaded
+    assert index.get('BTC.BTC', 'thor1a') is refreshed
+
+    pool = ThorPool(asset='BTC.BTC', balance_rune=6000, balance_asset=60, pool_units=600)
+    assert ThorLPIndex.redeemable(index.get('BTC.BTC', 'thor1a'), pool) == (3000, 30)
+
+
+@pytest.mark.asyncio
+async def test_lp_index_shared_asset_address(fake_node, fake_connector):
+    fake_node.responses[PATH] = [
+        lp_json('', 50, 10, asset_address='bc1a', asset_deposit=5),
+        lp_json('thor1a', 100, 20, asset_address='bc1a', rune_deposit=1000, asset_deposit=10),
+    ]
+    index = ThorLPIndex(fake_connector, ['BTC.BTC'])
+    await index.refresh('BTC.BTC')
+    assert index.get('BTC.BTC', 'bc1a').units == 50  # keyed by bc1a itself
+    assert index.get('BTC.BTC', 'thor1a').units == 100
+    assert sorted(lp.units for lp in index.positions('bc1a')) == [50, 100]
+    assert index.deposit_values('bc1a') == (1000, {'BTC.BTC': 15})
+
+    fake_node.responses[PATH] = [lp_json('thor1a', 100, 20, asset_address='bc1a', rune_deposit=1000, asset_deposit=10)]
+    delta = await index.refresh('BTC.BTC')
+    assert [lp.units for lp in delta.removed] == [50]
+    assert index.get('BTC.BTC', 'bc1a').units == 100  # the other LP is still found by the asset address
+    assert [lp.units for lp in index.positions('bc1a')] == [100]
@@ -0,0 +1,75 @@
+import pytest
+
+from aiothornode.cache import ThorMemoryCache
+from aiothornode.metrics import ThorMetricsAggregator, ThorPathTemplates, ThorHistogram, ThorObserver
+from .fixtures import *
+
+
+def test_path_templates():
+    templates = ThorPathTemplates(ThorEnvironment())
+    assert templates.template_of('/thorchain/pool/BTC.BTC?height=100') == '/thorchain/pool/{pool}?height={height}'
+    assert templates.template_of('/thorchain/pool/BTC.BTC') == '/thorchain/pool/{pool}'
+    assert templates.template_of('/thorchain/pools') == '/thorchain/pools'
+    assert templates.template_of('/block?height=5') == '/block?height={height}'
+    assert templates.template_of('/thorchain/pool/ETH.ETH/liquidity_provider/0xabc?height=0') == \
+           '/thorchain/pool/{asset}/liquidity_provider/{address}?height={height}'
+    assert templates.template_of('/unknown?x=1') == '/unknown'
+
+
+def test_histogram():
+    h = ThorHistogram()
+    for v in (0.005, 0.02, 0.02, 0.3, 20.0):
+        h.observe(v)
+    assert h.count == 5
+    assert h.quantile(0.5) == 0.025
+    assert h.quantile(1.0) == float('inf')
+
+
+@pytest.mark.asyncio
+async def test_metrics_aggregator(fake_node, session):
+    backup_node = await FakeThorNode().start()
+    try:
+        env = fake_node.make_env().set_retries(2)
+        connector = ThorConnector(env, session, additional_envs=backup_node.make_env(),
+                                  cache=ThorMemoryCache(), cache_latest_ttl=60.0)
+        metrics = ThorMetricsAggregator()
+        connector.add_observer(metrics)
+
+        for height in (1, 2):
+            fake_node.responses[f'/thorchain/pool/BTC.BTC?height={height}'] = {'asset': 'BTC.BTC'}
+        backup_node.responses['/thorchain/queue'] = {'swap': 1}  # the primary has 404
+
+        await connector.query_pool('BTC.BTC', 1)
+        await connector.query_pool('BTC.BTC', 2)
+        await connector.query_pool('BTC.BTC', 2)  # cached
+        await connector.query_queue()
+
+        summary = metrics.summary()
+        pool = summary['/thorchain/pool/{pool}?height={height}']
+        assert pool['requests'] == 2
+        assert pool['statuses'] == {200: 2}
+        assert pool['bytes'] > 0
+        assert pool['cache_hits'] == 1 and pool['cache_misses'] == 2
+
+        queue = summary['/thorchain/queue']
+        assert queue['requests'] == 3  # 2 attempts on the primary + backup
+        assert queue['errors'] == {'FileNotFoundError': 2}
+        assert queue['retries'] == 1
+        assert queue['failovers'] == 1
+
+        connector.remove_observer(metrics)
+        await connector.query_pool('BTC.BTC', 1)
+        assert metrics.summary()['/thorchain/pool/{pool}?height={height}']['cache_hits'] == 1
+    finally:
+        await backup_node.server.close()
+
+
+@pytest.mark.asyncio
+async def test_broken_observer(fake_node, fake_connector: ThorConnector):
+    class Broken(ThorObserver):
+        def on_request(self, record):
+            raise ValueError
+
+    fake_node.responses['/thorchain/queue'] = {'swap': 1}
+    fake_connector.add_observer(Broken())
+    assert (await fake_connector.query_queue()).swap == 1
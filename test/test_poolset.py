@@ -0,0 +1,61 @@
+import pytest
+
+from aiothornode.poolset import PoolSet, chain_of
+from .fixtures import *
+
+USDC = 'ETH.USDC-0XA0B86991C6218B36C1D19D4A2E9EB0CE3606EB48'
+USDT = 'ETH.USDT-0XDAC17F958D2EE523A2206206994597C13D831EC7'
+
+
+def pool_json(asset, balance_asset, balance_rune, status='Available'):
+    return {'asset': asset, 'balance_asset': str(balance_asset), 'balance_rune': str(balance_rune), 'status': status}
+
+
+POOLS = [
+    pool_json('BTC.BTC', 100, 3_000_000),
+    pool_json('ETH.ETH', 1000, 2_000_000),
+    pool_json(USDC, 5_000_000, 1_000_000),
+    pool_json(USDT, 1_000_000, 1_000_000),
+    pool_json('ETH.NEW-0X1', 10, 0, status='Staged'),
+]
+
+
+def test_pool_set():
+    pools = PoolSet.from_json(POOLS, height=100)
+    assert len(pools) == 5 and pools.height == 100
+    assert pools['BTC.BTC'].balance_rune == 3_000_000
+    assert 'ETH.ETH' in pools and pools.get('DOGE.DOGE') is None
+    assert [p.asset for p in pools.chain('ETH')] == ['ETH.ETH', USDC, USDT, 'ETH.NEW-0X1']
+    assert pools.chain('LTC') == []
+    assert sorted(pools.chains) == ['BTC', 'ETH']
+
+    assert pools.rune_price('BTC.BTC') == 30_000
+    assert pools.assets_per_rune['ETH.ETH'] == 0.0005
+    assert pools.rune_price('ETH.NEW-0X1') is None  # not priced
+    assert pools.rune_price('THOR.RUNE') == 1.0
+
+    assert pools.stable_coins == [USDC, USDT]
+    assert pools.usd_per_rune == pytest.approx(3.0)
+    assert pools.usd_price('BTC.BTC') == pytest.approx(90_000)
+    assert pools.usd_prices['ETH.ETH'] == pytest.approx(6000)
+
+
+def test_pool_set_custom_stable_coins():
+    pools = PoolSet.from_json(POOLS, stable_coins=[USDT])
+    assert pools.usd_per_rune == pytest.approx(1.0)
+
+    no_usd = PoolSet.from_json(POOLS, stable_coins=['BNB.BUSD-BD1'])
+    assert no_usd.usd_per_rune is None
+    assert no_usd.usd_price('BTC.BTC') is None
+    assert no_usd.usd_prices == {}
+
+    assert chain_of('BTC.BTC') == 'BTC'
+
+
+@pytest.mark.asyncio
+async def test_query_pools_as_pool_set(fake_node, fake_connector):
+    fake_node.responses['/thorchain/pools'] = POOLS
+    pools = await fake_connector.query_pools(as_pool_set=True)
+    assert isinstance(pools, PoolSet)
+    assert pools.usd_price('ETH.ETH') == pytest.approx(6000)
+    assert isinstance(await fake_connector.query_pools(), list)
@@ -0,0 +1,93 @@
+import pytest
+
+from aiothornode.quote import ThorQuoteEngine, swap_output, gas_asset_of
+from .fixtures import *
+
+USDT = 'ETH.USDT-0XDAC17F958D2EE523A2206206994597C13D831EC7'
+
+POOLS = [
+    ThorPool(asset='BTC.BTC', balance_asset=1000_0000_0000, balance_rune=3_000_000_0000_0000, status='Available'),
+    ThorPool(asset='ETH.ETH', balance_asset=10_000_0000_0000, balance_rune=2_000_000_0000_0000, status='Available'),
+    ThorPool(asset=USDT, balance_asset=1_000_000_0000_0000, balance_rune=500_000_0000_0000, status='Available'),
+    ThorPool(asset='ETH.NEW-0X1', balance_asset=10, balance_rune=0, status='Staged'),
+]
+
+CHAIN_INFO = {
+    'BTC': ThorChainInfo(chain='BTC', outbound_fee=30_000),
+    'ETH': ThorChainInfo(chain='ETH', outbound_fee=100_000),  # 0.001 ETH
+}
+
+
+def test_swap_output():
+    # x = 10% of the depth: output = x * X * Y / (x + X)^2
+    output, fee, slip = swap_output(100, 1000, 2000)
+    assert output == 100 * 1000 * 2000 // 1100 ** 2
+    assert fee == 100 * 100 * 2000 // 1100 ** 2
+    assert slip == 909
+    assert gas_asset_of('BSC') == 'BSC.BNB' and gas_asset_of('XRP') == 'XRP.XRP'
+
+
+def test_quotes():
+    engine = ThorQuoteEngine(POOLS, CHAIN_INFO)
+
+    # 0.001 ETH at 200 RUNE/ETH = 0.2 RUNE = 0.4 USDT
+    assert engine.outbound_fees['ETH.ETH'] == 100_000
+    assert engine.outbound_fees[USDT] == 40_000_000
+    assert engine.outbound_fees['BTC.BTC'] == 30_000
+
+    to_rune = engine.quote('BTC.BTC', 'THOR.RUNE', 1_0000_0000)
+    assert to_rune.swaps == 1
+    assert to_rune.emit_amount == swap_output(1_0000_0000, 1000_0000_0000, 3_000_000_0000_0000)[0]
+    assert to_rune.expected_amount_out == to_rune.emit_amount - 2_000_000
+
+    double = engine.quote('BTC.BTC', 'ETH.ETH', 1_0000_0000)
+    assert double.swaps == 2
+    assert double.emit_amount == swap_output(to_rune.emit_amount, 2_000_000_0000_0000, 10_000_0000_0000)[0]
+    assert double.expected_amount_out == double.emit_amount - 100_000
+    assert 14_0000_0000 < double.expected_amount_out < 15_0000_0000  # ~3000 RUNE at 200 RUNE/ETH, minus slip
+    assert double.slip_bps == 9 + 14  # ~0.1% of the BTC pool and ~0.15% of the ETH one, truncated
+    assert double.liquidity_fee_in_rune > to_rune.liquidity_fee_in_rune > 0
+
+    from_rune = engine.quote('THOR.RUNE', 'BTC.BTC', 3000_0000_0000)
+    assert from_rune.swaps == 1 and from_rune.outbound_fee == 30_000
+
+    with pytest.raises(ValueError):
+        engine.quote('ETH.NEW-0X1', 'BTC.BTC', 100)
+    with pytest.raises(ValueError):
+        engine.quote('BTC.BTC', 'BTC.BTC', 100)
+
+    assert engine.quote_many([('BTC.BTC', 'ETH.ETH', 1_0000_0000)]) == [double]
+
+
+def test_quote_batch():
+    np = pytest.importorskip('numpy')
+    engine = ThorQuoteEngine(POOLS, CHAIN_INFO)
+    requests = [('BTC.BTC', 'ETH.ETH', 1_0000_0000), ('ETH.ETH', USDT, 5_0000_0000),
+                ('THOR.RUNE', 'BTC.BTC', 100_0000_0000), (USDT, 'THOR.RUNE', 1000_0000_0000)]
+    from_assets, to_assets, amounts = zip(*requests)
+    batch = engine.quote_batch(from_assets, to_assets, amounts)
+    for i, quote in enumerate(engine.quote_many(requests)):
+        assert batch['emit_amount'][i] == pytest.approx(quote.emit_amount, abs=2)
+        assert batch['expected_amount_out'][i] == pytest.approx(quote.expected_amount_out, abs=2)
+        assert batch['liquidity_fee_in_rune'][i] == pytest.approx(quote.liquidity_fee_in_rune, abs=2)
+        assert batch['slip_bps'][i] == pytest.approx(quote.slip_bps, abs=2)  # truncated per swap
+
+    same_pair = engine.quote_batch('BTC.BTC', 'ETH.ETH', np.array([1e8, 2e8, 4e8]))
+    assert np.all(np.diff(same_pair['expected_amount_out']) > 0)
+
+    with pytest.raises(ValueError):
+        engine.quote_batch('DOGE.DOGE', 'ETH.ETH', [1])
+
+
+@pytest.mark.asyncio
+async def test_engine_from_connector(fake_node, fake_connector):
+    fake_node.responses['/thorchain/pools'] = [
+        {'asset': p.asset, 'balance_asset': str(p.balance_asset), 'balance_rune': str(p.balance_rune),
+         'status': p.status} for p in POOLS
+    ]
+    fake_node.responses['/thorchain/inbound_addresses'] = [
+        {'chain': 'ETH', 'outbound_fee': '100000', 'halted': False}
+    ]
+    engine = await ThorQuoteEngine.from_connector(fake_connector)
+    assert engine.outbound_fees['ETH.ETH'] == 100_000
+    assert engine.quote('BTC.BTC', 'ETH.ETH', 1_0000_0000).expected_amount_out > 0
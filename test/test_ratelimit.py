@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from aiothornode.ratelimit import ThorRateLimiter, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE, background_priority
+from .fixtures import *
+
+
+@pytest.mark.asyncio
+async def test_priority_order():
+    limiter = ThorRateLimiter(rate=50.0, burst=1)
+    await limiter.acquire()  # empty the bucket
+    order = []
+
+    async def worker(name, level):
+        await limiter.acquire(level)
+        order.append(name)
+
+    tasks = [asyncio.ensure_future(worker(f'bg{i}', PRIORITY_BACKGROUND)) for i in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.ensure_future(worker('ui', PRIORITY_INTERACTIVE)))
+    await asyncio.gather(*tasks)
+
+    assert order == ['ui', 'bg0', 'bg1', 'bg2']
+    assert limiter.acquired == 5
+    assert limiter.max_wait > 0.0
+    assert limiter.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter():
+    limiter = ThorRateLimiter(rate=20.0, burst=1)
+    await limiter.acquire()
+    first = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    first.cancel()
+    wait = await asyncio.wait_for(second, 1.0)
+    assert 0.0 < wait < 0.2
+    assert limiter.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_client_rate_limit(fake_node, session):
+    fake_node.responses['/thorchain/queue'] = {'swap': 1}
+    env = fake_node.make_env().set_rate_limit(rate=20.0, burst=2, rpc_rate=0.0)
+    connector = ThorConnector(env, session, coalesce_requests=False)
+
+    started_at = time.monotonic()
+    with background_priority():
+        await asyncio.gather(*[connector.query_queue() for _ in range(6)])
+    assert time.monotonic() - started_at >= 0.15  # 2 at once, then 4 at 20 per second
+
+    stats = connector.rate_limiter_stats()
+    assert list(stats) == [fake_node.url]
+    assert stats[fake_node.url]['acquired'] == 6
+    assert stats[fake_node.url]['max_wait'] > 0.1
@@ -0,0 +1,70 @@
+import time
+
+import pytest
+
+from aiothornode.retry import ThorRetryPolicy, ThorRetryBudget
+from .fixtures import *
+
+
+def test_backoff_delays():
+    policy = ThorRetryPolicy(max_attempts=5, base_delay=1.0, multiplier=2.0, max_delay=5.0, jitter=0.0)
+    assert [policy.delay(a) for a in range(1, 5)] == [1.0, 2.0, 4.0, 5.0]
+
+    throttled = ThorHTTPError(429)
+    assert policy.delay(1, throttled) == 2.0  # throttle_multiplier
+    assert policy.delay(1, ThorHTTPError(429, retry_after=7.0)) == 7.0
+    assert policy.delay(1, ThorHTTPError(429, retry_after=1000.0)) == 60.0  # max_retry_after
+
+    jittered = ThorRetryPolicy(base_delay=1.0, jitter=0.5)
+    for _ in range(100):
+        assert 0.5 <= jittered.delay(1) <= 1.0
+
+
+def test_should_retry_rules():
+    policy = ThorRetryPolicy(max_attempts=3, retry_on_timeout=False)
+    assert policy.should_retry(1, ThorHTTPError(503))
+    assert not policy.should_retry(1, ThorHTTPError(500))
+    assert not policy.should_retry(1, asyncio.TimeoutError())
+    assert not policy.should_retry(1, FileNotFoundError())
+    assert policy.should_retry(2, ConnectionError())
+    assert not policy.should_retry(3, ConnectionError())  # the last attempt
+
+    assert ThorRetryPolicy.fixed(2).should_retry(1, FileNotFoundError())
+
+
+def test_retry_budget():
+    budget = ThorRetryBudget(ratio=0.5, min_per_sec=0.0, max_tokens=1.0)
+    policy = ThorRetryPolicy(max_attempts=10, budget=budget)
+    assert policy.should_retry(1, ConnectionError())
+    assert not policy.should_retry(1, ConnectionError())
+    assert budget.denied == 1
+    policy.on_first_attempt()
+    policy.on_first_attempt()
+    assert policy.should_retry(1, ConnectionError())
+
+
+def test_parse_retry_after():
+    assert ThorNodeClient.parse_retry_after('3') == 3.0
+    assert ThorNodeClient.parse_retry_after(None) is None
+    assert ThorNodeClient.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert ThorNodeClient.parse_retry_after('soon') is None
+
+
+@pytest.mark.asyncio
+async def test_retry_after_and_no_final_sleep(fake_node, session):
+    backup_node = await FakeThorNode().start()
+    try:
+        fake_node.responses['/thorchain/queue'] = (429, {}, {'Retry-After': '0.2'})
+        backup_node.responses['/thorchain/queue'] = {'swap': 2}
+        policy = ThorRetryPolicy(max_attempts=2, base_delay=0.01, jitter=0.0)
+        connector = ThorConnector(fake_node.make_env(retry_policy=policy), session,
+                                  additional_envs=backup_node.make_env())
+
+        started_at = time.monotonic()
+        queue = await connector.query_queue()
+        elapsed = time.monotonic() - started_at
+        assert queue.swap == 2
+        assert fake_node.hits['/thorchain/queue'] == 2
+        assert 0.2 <= elapsed < 0.4  # one Retry-After sleep, none before the failover
+    finally:
+        await backup_node.server.close()
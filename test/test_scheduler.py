@@ -0,0 +1,56 @@
+import pytest
+
+from aiothornode.scheduler import ThorBlockScheduler
+from .fixtures import *
+
+
+def set_height(node: FakeThorNode, height):
+    node.responses['/thorchain/lastblock'] = [{'chain': 'BTC', 'last_observed_in': 1, 'thorchain': height}]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_notifies_on_change(fake_node, fake_connector: ThorConnector):
+    fake_node.responses['/thorchain/mimir'] = {'HALTBTCCHAIN': 0}
+    fake_node.responses['/thorchain/queue'] = {'swap': 1}
+    set_height(fake_node, 100)
+
+    events = []
+
+    async def on_change(name, new, old, height):
+        events.append((name, height, old is None))
+
+    scheduler = ThorBlockScheduler(fake_connector)
+    scheduler.subscribe('mimir', fake_connector.query_mimir, on_change)
+    scheduler.subscribe('queue', fake_connector.query_queue, lambda *args: events.append(('queue-sync', args[3])))
+
+    assert await scheduler.tick()
+    assert sorted(events) == [('mimir', 100, True), ('queue-sync', 100)]
+
+    # same block => no requests
+    assert not await scheduler.tick()
+    assert fake_node.hits['/thorchain/mimir'] == 1
+
+    # new block, but nothing has changed
+    set_height(fake_node, 101)
+    events.clear()
+    assert await scheduler.tick()
+    assert events == []
+
+    set_height(fake_node, 102)
+    fake_node.responses['/thorchain/mimir'] = {'HALTBTCCHAIN': 1}
+    assert await scheduler.tick()
+    assert events == [('mimir', 102, False)]
+    assert scheduler.value('mimir')['HALTBTCCHAIN'] == 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_run(fake_node, fake_connector: ThorConnector):
+    set_height(fake_node, 5)
+    fake_node.responses['/thorchain/queue'] = {'swap': 1}
+    got = asyncio.Event()
+    scheduler = ThorBlockScheduler(fake_connector, poll_interval=0.01)
+    scheduler.subscribe('queue', fake_connector.query_queue, lambda *_: got.set())
+    scheduler.start()
+    await asyncio.wait_for(got.wait(), 2.0)
+    await scheduler.stop()
+    assert scheduler.last_height == 5
@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from aiothornode.transport import ReplayServer, ThorResponse, path_of
+from .fixtures import *
+
+
+@pytest.mark.asyncio
+async def test_record_and_replay(fake_node, session, tmp_path):
+    fake_node.responses['/thorchain/queue'] = {'swap': 3, 'outbound': 1}
+    store = ThorRecordStore(str(tmp_path))
+
+    transport = RecordingTransport(AiohttpTransport(session), store)
+    recorder = ThorConnector(fake_node.make_env(), session, transport=transport)
+    queue = await recorder.query_queue()
+    assert queue.swap == 3
+    assert list(store.paths()) == ['/thorchain/queue']
+
+    # no network at all: the host does not exist
+    env = ThorEnvironment(thornode_url='http://nowhere.invalid', rpc_url='http://nowhere.invalid/rpc')
+    replay = ReplayTransport(store)
+    connector = ThorConnector(env, session, transport=replay)
+    assert await connector.query_queue() == queue
+    with pytest.raises(FileNotFoundError):  # not recorded
+        await ThorNodeClient(session, env, transport=replay).request('/thorchain/mimir')
+    assert replay.requests == 2
+
+
+@pytest.mark.asyncio
+async def test_replay_faults():
+    replay = ReplayTransport(latency=0.02, jitter=0.01, error_rate=0.3, timeout_rate=0.2, seed=1)
+    replay.add('/thorchain/queue', {'swap': 1})
+
+    statuses, timeouts = [], 0
+    started_at = time.monotonic()
+    for _ in range(20):
+        try:
+            statuses.append((await replay.get('http://x/thorchain/queue')).status)
+        except asyncio.TimeoutError:
+            timeouts += 1
+    assert time.monotonic() - started_at >= 20 * 0.02
+    assert 0 < timeouts < 20
+    assert 503 in statuses and 200 in statuses
+
+    # the same seed gives the same sequence
+    again = ReplayTransport(jitter=0.01, error_rate=0.3, timeout_rate=0.2, seed=1)
+    again.add('/thorchain/queue', {'swap': 1})
+    statuses_again = []
+    for _ in range(20):
+        try:
+            statuses_again.append((await again.get('http://x/thorchain/queue')).status)
+        except asyncio.TimeoutError:
+            pass
+    assert statuses_again == statuses
+
+
+@pytest.mark.asyncio
+async def test_replay_server(session):
+    replay = ReplayTransport()
+    replay.add('/thorchain/queue', {'swap': 5})
+    replay.add(path_of("http://x/block?height=1"), {'result': {}}, status=429, headers={'Retry-After': '1'})
+
+    async with ReplayServer(replay) as server:
+        env = ThorEnvironment(thornode_url=server.url, rpc_url=server.url)
+        connector = ThorConnector(env, session)
+        queue = await connector.query_queue()
+        assert queue.swap == 5
+
+        client = ThorNodeClient(session, env)
+        with pytest.raises(ThorHTTPError) as e:
+            await client.request('/block?height=1', is_rpc=True)
+        assert e.value.status == 429 and e.value.retry_after == 1.0
+
+
+def test_store_binary_body(tmp_path):
+    store = ThorRecordStore(str(tmp_path))
+    store.save('/x', ThorResponse(200, b'\xff\x00', {'Content-Type': 'application/octet-stream', 'Other': '1'}))
+    response = store.load('/x')
+    assert response.body == b'\xff\x00'
+    assert response.headers == {'Content-Type': 'application/octet-stream'}
+    assert store.load('/y') is None
@@ -0,0 +1,66 @@
+import pytest
+import ujson
+
+from aiothornode.types import ThorNativeTX, ThorTxEvent, ThorTxAttribute, parse_amounts
+from .fixtures import b64, make_event
+
+
+TX = {
+    'hash': 'E8510F9636377D66BEC8E263FBFE0B86C92CD3E801794BFFA553C5A9CA42CF09',
+    'height': '1568824',
+    'index': 0,
+    'tx_result': {
+        'code': 0,
+        'data': b64('\n\x06\n\x04send'),
+        'log': ujson.dumps([{'events': []}]),
+        'gas_wanted': '200000',
+        'gas_used': '90000',
+        'events': [
+            make_event('message', action='send', sender='thor1from'),
+            make_event('transfer', recipient='thor1fee', sender='thor1from', amount='2000000rune'),
+            make_event('transfer', recipient='thor1to', sender='thor1from', amount='4700000000rune,15btc/btc'),
+        ]
+    }
+}
+
+
+def test_event_lazy_index():
+    event = ThorTxEvent.from_json(TX['tx_result']['events'][2])
+    same_event = ThorTxEvent.from_json(TX['tx_result']['events'][2])
+    assert event.recipient == 'thor1to'
+    assert event.attributes._decoded is None  # only "recipient" has been decoded
+    assert event == same_event  # equality does not depend on what has been decoded
+    assert event.sender == 'thor1from'
+    assert event.amount == (4700000000, 'rune')
+    assert event.amounts == [(4700000000, 'rune'), (15, 'btc/btc')]
+    assert event.attributes[0] == ThorTxAttribute('recipient', 'thor1to', True)
+    assert len(event.attributes) == 3
+    assert event._asdict()['type'] == 'transfer'
+    assert ThorNativeTX.from_json(TX) == ThorNativeTX.from_json(TX)
+
+    with pytest.raises(KeyError):
+        event.value_of('memo')
+
+
+def test_event_positional():
+    event = ThorTxEvent('transfer', [ThorTxAttribute('sender', 'thor1a', True),
+                                     ThorTxAttribute('amount', '5rune', True)])
+    assert event.sender == 'thor1a'
+    assert event.amount == (5, 'rune')
+    assert ThorTxEvent.from_json(make_event('transfer', sender='thor1a', amount='5rune')).attributes == \
+        [ThorTxAttribute('sender', 'thor1a', True), ThorTxAttribute('amount', '5rune', True)]
+
+
+def test_native_tx_event_types():
+    tx = ThorNativeTX.from_json(TX)
+    assert tx.type == 'send'
+    assert len(tx.events) == 3
+    assert tx.transfers[0].amount == (2000000, 'rune')
+
+    tx = ThorNativeTX.from_json(TX, event_types=['transfer'])
+    assert [e.type for e in tx.events] == ['transfer', 'transfer']
+
+
+def test_parse_amounts():
+    assert parse_amounts('100rune') == [(100, 'rune')]
+    assert parse_amounts('') == []
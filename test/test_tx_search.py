@@ -0,0 +1,45 @@
+from urllib.parse import quote
+
+import pytest
+
+from .fixtures import *
+
+
+def make_tx(i):
+    return {
+        'hash': f'HASH{i}',
+        'height': str(1000 + i),
+        'index': 0,
+        'tx_result': {
+            'code': 0, 'data': b64('send'), 'log': '[]', 'gas_wanted': '1', 'gas_used': '1',
+            'events': [make_event('transfer', sender='thor1me', recipient='thor1you', amount=f'{i}rune')],
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_search_txs(fake_node, fake_connector: ThorConnector):
+    query = "message.sender='thor1me'"
+    txs = [make_tx(i) for i in range(23)]
+    txs[11]['tx_result'].update(code=5, log='failed to execute message; message index: 0: insufficient funds')
+    per_page = 5
+    for page in range(1, 6):
+        path = fake_connector.env.path_tx_search.format(
+            query=quote(f'"{query}"', safe=''), prove='false', page=page, per_page=per_page,
+            order_by=quote('"asc"', safe=''))
+        fake_node.responses[f'/rpc{path}'] = {
+            'result': {'txs': txs[(page - 1) * per_page:page * per_page], 'total_count': str(len(txs))}
+        }
+        fake_node.delays[f'/rpc{path}'] = 0.01 * (6 - page)  # later pages are faster
+
+    found = [tx async for tx in fake_connector.search_txs(query, per_page=per_page, concurrency=3)]
+    assert [tx.hash for tx in found] == [f'HASH{i}' for i in range(23)]
+    assert found[7].transfers[0].amount == (7, 'rune')
+    assert found[11].code == 5 and found[11].log.startswith('failed to execute message')
+    assert sum(fake_node.hits.values()) == 5
+
+
+@pytest.mark.asyncio
+async def test_search_txs_nothing(fake_node, fake_connector: ThorConnector):
+    with pytest.raises(ConnectionError):
+        _ = [tx async for tx in fake_connector.search_txs("tx.height=1")]
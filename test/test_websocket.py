@@ -0,0 +1,111 @@
+import pytest
+import ujson
+
+from aiothornode.websocket import ThorWebSocketClient
+from .fixtures import *
+
+TX_B64 = b64('some tx bytes')
+
+
+def new_block_message(height):
+    return {'jsonrpc': '2.0', 'id': 1, 'result': {
+        'query': ThorWebSocketClient.QUERY_NEW_BLOCK,
+        'data': {'type': ThorWebSocketClient.EVENT_NEW_BLOCK, 'value': {
+            'block': {
+                'header': {'height': str(height), 'chain_id': 'thorchain', 'time': '2022-01-01T00:00:00.5Z'},
+                'data': {'txs': [TX_B64]},
+            },
+        }},
+    }}
+
+
+def tx_message(height):
+    return {'jsonrpc': '2.0', 'id': 2, 'result': {
+        'query': ThorWebSocketClient.QUERY_TX,
+        'data': {'type': ThorWebSocketClient.EVENT_TX, 'value': {'TxResult': {
+            'height': str(height), 'tx': TX_B64,
+            'result': {'gas_used': '100', 'events': [make_event('transfer', amount='5rune')]},
+        }}},
+    }}
+
+
+class FakeWebSocketRPC:
+    """
+    Answers subscriptions and sends one block and one tx, then closes the connection.
+    """
+
+    def __init__(self):
+        self.height = 100
+        self.subscriptions = []
+        self.server = None
+
+    async def handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        async for msg in ws:
+            j = ujson.loads(msg.data)
+            self.subscriptions.append(j['params']['query'])
+            await ws.send_str(ujson.dumps({'jsonrpc': '2.0', 'id': j['id'], 'result': {}}))
+            if len(self.subscriptions) % 2 == 0:
+                await ws.send_str(ujson.dumps(new_block_message(self.height)))
+                await ws.send_str(ujson.dumps(tx_message(self.height)))
+                self.height += 1
+                await ws.close()
+        return ws
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/rpc/websocket', self.handler)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        return self
+
+
+@pytest.mark.asyncio
+async def test_websocket_reconnect_and_failover(session):
+    rpc = await FakeWebSocketRPC().start()
+    try:
+        url = str(rpc.server.make_url('/rpc'))
+        dead_env = ThorEnvironment(rpc_url='http://127.0.0.1:1')
+        good_env = ThorEnvironment(rpc_url=url)
+        ws = ThorWebSocketClient([dead_env, good_env], session, reconnect_delay=0.01)
+
+        items = []
+        async for item in ws:
+            items.append(item)
+            if len(items) == 4:
+                break
+
+        blocks = [i for i in items if isinstance(i, ThorBlock)]
+        txs = [i for i in items if isinstance(i, ThorNativeTX)]
+        assert [b.height for b in blocks] == [100, 101]
+        assert blocks[0].txs_hashes == ['0x' + ThorBlock.decode_tx_hash(TX_B64)]
+        assert blocks[0].hash is None  # no block_id in the event
+        assert txs[0].hash == ThorBlock.decode_tx_hash(TX_B64)
+        assert txs[0].gas_used == 100 and txs[0].code == 0
+        assert txs[0].transfers[0].amount == (5, 'rune')
+        assert ws.reconnects == 2  # dead -> good (failover), good -> good (clean close)
+        assert rpc.subscriptions == [ThorWebSocketClient.QUERY_NEW_BLOCK, ThorWebSocketClient.QUERY_TX] * 2
+    finally:
+        await rpc.server.close()
+
+
+def test_new_block_hash():
+    message = new_block_message(100)
+    message['result']['data']['value']['block_id'] = {'hash': 'ABCD'}
+    block = ThorWebSocketClient(ThorEnvironment(), None).parse_message(ujson.dumps(message))
+    assert block.height == 100 and block.hash == 'ABCD'
+
+
+def test_failed_tx_message():
+    message = tx_message(100)
+    message['result']['data']['value']['TxResult']['result'].update(code=5, log='insufficient funds')
+    tx = ThorWebSocketClient(ThorEnvironment(), None).parse_message(ujson.dumps(message))
+    assert isinstance(tx, ThorNativeTX)
+    assert tx.code == 5 and tx.log == 'insufficient funds'
+    assert tx.height == 100
+
+
+def test_ws_url():
+    assert ThorWebSocketClient.ws_url(ThorEnvironment(rpc_url='https://rpc.ninerealms.com/')) == \
+           'wss://rpc.ninerealms.com/websocket'